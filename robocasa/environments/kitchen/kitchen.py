@@ -13,6 +13,7 @@ from robosuite.utils.mjcf_utils import (
     find_elements,
     xml_path_completion,
 )
+from robosuite.utils.binding_utils import MjSim
 from robosuite.utils.observables import Observable, sensor
 from robosuite.environments.base import EnvMeta
 from scipy.spatial.transform import Rotation
@@ -30,12 +31,16 @@ from robocasa.utils.placement_samplers import (
     SequentialCompositeSampler,
     UniformRandomSampler,
 )
+from robocasa.utils.model_cache import compile_model
+from robocasa.utils.model_xml_utils import relocate_asset_paths
+from robocasa.utils.texture_cache import restore_texture_paths, use_cached_textures
 from robocasa.utils.texture_swap import (
+    TextureSlotSwapper,
+    add_texture_slots,
     get_random_textures,
-    replace_cab_textures,
-    replace_counter_top_texture,
-    replace_floor_texture,
-    replace_wall_texture,
+    get_texture_candidates,
+    remove_texture_slots,
+    set_generative_textures,
 )
 
 
@@ -182,6 +187,17 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
         randomize_cameras (bool): if True, will add gaussian noise to the position and rotation of the
             wrist and agentview cameras
+
+        num_object_slots (int): number of candidate objects compiled into the model for each object config.
+            Requires hard_reset to be False. On every (soft) reset, one candidate per config is activated and
+            placed while the others are parked outside of the workspace, so that objects are re-sampled without
+            recompiling the model. Note that distractors keep the unique attributes of the target object that
+            was sampled when the model was loaded, so the target object itself always uses a single slot
+
+        num_texture_slots (int): number of generative texture sets compiled into the model. Requires
+            generative_textures and hard_reset to be False. On every (soft) reset, one set is activated by
+            re-pointing the materials of the compiled model to it, so that textures are re-sampled without
+            recompiling the model
     """
 
     EXCLUDE_LAYOUTS = []
@@ -227,9 +243,20 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         use_distractors=False,
         translucent_robot=False,
         randomize_cameras=False,
+        num_object_slots=1,
+        num_texture_slots=1,
     ):
         self.init_robot_base_pos = init_robot_base_pos
 
+        assert (
+            num_object_slots == 1 or not hard_reset
+        ), "num_object_slots > 1 is only supported with hard_reset=False"
+        self.num_object_slots = num_object_slots
+        # whether placements sampled in _load_model are yet to be applied in _reset_internal
+        self._fresh_object_placements = False
+        # lookup tables for get_fixture, rebuilt whenever fixtures are placed
+        self._fixture_index = None
+
         # object placement initializer
         self.placement_initializer = placement_initializer
         self.obj_registries = obj_registries
@@ -255,6 +282,16 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         assert generative_textures in [None, False, "100p"]
         self.generative_textures = generative_textures
 
+        assert num_texture_slots == 1 or (
+            generative_textures == "100p" and not hard_reset
+        ), "num_texture_slots > 1 requires generative_textures and hard_reset=False"
+        self.num_texture_slots = num_texture_slots
+        # texture sets compiled into the current model and the swapper switching between them
+        self._texture_candidates = None
+        self._texture_swapper = None
+        # hash of the xml the current sim was compiled from (only for models loaded from xml strings)
+        self._model_xml_hash = None
+
         self.use_distractors = use_distractors
         self.translucent_robot = translucent_robot
         self.randomize_cameras = randomize_cameras
@@ -352,6 +389,7 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
         # to be set later inside edit_model_xml function
         self._curr_gen_fixtures = None
+        self._texture_candidates = None
 
         # setup scene
         self.mujoco_arena = KitchenArena(
@@ -373,6 +411,7 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         # setup fixtures
         self.fixture_cfgs = self.mujoco_arena.get_fixture_cfgs()
         self.fixtures = {cfg["name"]: cfg["model"] for cfg in self.fixture_cfgs}
+        self._fixture_index = None
         
         # setup scene, robots, objects
         self.model = ManipulationTask(
@@ -407,6 +446,8 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
             # hacky code to set orientation
             obj.set_euler(T.mat2euler(T.quat2mat(T.convert_quat(obj_quat, "xyzw"))))
+        # fixture types and bounding boxes depend on the placement, so index fixtures from here on
+        self._fixture_index = None
 
         # setup internal references related to fixtures
         self._setup_kitchen_references()
@@ -465,7 +506,11 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             # if "name" not in cfg:
             #     cfg["name"] = "obj_{}".format(obj_num + 1)
             info = object_info
-            object = MJCFObject(name=cfg["name"], **object_kwargs)
+            # objects swapped in by soft resets keep the name of their candidate slot, since the model xml
+            # of the episode holds the bodies of all candidates
+            object = MJCFObject(
+                name=cfg.get("model_name", cfg["name"]), **object_kwargs
+            )
 
             return object, info
 
@@ -484,7 +529,7 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
                     cfg['unique_attr'] = unique_attr
                 model, info = _create_obj(cfg)
                 cfg["info"] = info
-                self.objects[model.name] = model
+                self.objects[cfg["name"]] = model
                 self.model.merge_objects([model], extend=True)
         else:
             self.object_cfgs = self._get_obj_cfgs() + self._get_more_obj_cfgs()
@@ -542,8 +587,24 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
             # # remove objects that didn't get created
             # self.object_cfgs = [cfg for cfg in self.object_cfgs if "model" in cfg]
-            
-        
+
+        # each object config maps to a list of (model, info) candidates. the first candidate is
+        # the object created above, the others are only swapped in by soft resets
+        self.object_slots = {
+            cfg["name"]: [(self.objects[cfg["name"]], cfg["info"])]
+            for cfg in self.object_cfgs
+        }
+        if self.num_object_slots > 1 and "object_cfgs" not in self._ep_meta:
+            for cfg in self.object_cfgs:
+                if not self._can_pool_object_cfg(cfg):
+                    continue
+                for slot_i in range(1, self.num_object_slots):
+                    slot_cfg = {k: v for (k, v) in cfg.items() if k != "info"}
+                    slot_cfg["name"] = "{}_slot{}".format(cfg["name"], slot_i)
+                    model, info = _create_obj(slot_cfg)
+                    self.model.merge_objects([model], extend=True)
+                    self.object_slots[cfg["name"]].append((model, info))
+
         self.placement_initializer = self._get_placement_initializer(self.object_cfgs)
 
         if not self.no_placement:
@@ -565,6 +626,93 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
                 self._load_model(retry_time+1)
                 return
             self.object_placements = object_placements
+            self._fresh_object_placements = True
+            if macros.VERBOSE:
+                print("Object placement stats:", self.placement_initializer.get_stats())
+
+    def _can_pool_object_cfg(self, cfg):
+        """
+        Checks whether additional candidate objects can be created for an object config. Objects that are
+        placed relative to other objects (or that other objects are placed relative to) are excluded, since
+        the placement references are resolved by object name. The target object is excluded if distractors
+        were sampled based on its attributes.
+
+        Args:
+            cfg (dict): object configuration
+
+        Returns:
+            bool: True if candidate objects can be created for the config
+        """
+        if (cfg.get("placement", None) or {}).get("sample_args", None) is not None:
+            return False
+        for other_cfg in self.object_cfgs:
+            sample_args = (other_cfg.get("placement", None) or {}).get(
+                "sample_args", None
+            )
+            if sample_args is not None and sample_args.get("reference") == cfg["name"]:
+                return False
+            if (
+                other_cfg.get("target_obj_name", None) is not None
+                and cfg["name"] == self.target_obj_str
+            ):
+                return False
+        return True
+
+    def _soft_reset_objects(self):
+        """
+        Re-samples the objects in the scene without recompiling the model: activates one candidate object
+        per object config, samples new placements for the active objects and parks all other candidates
+        outside of the workspace.
+        """
+        object_placements = None
+        for i in range(10):
+            # pick one candidate per config and point all name-based references to it
+            for cfg in self.object_cfgs:
+                slots = self.object_slots[cfg["name"]]
+                model, info = slots[self.rng.integers(len(slots))]
+                self.objects[cfg["name"]] = model
+                self.obj_body_id[cfg["name"]] = self._slot_body_id[model.root_body]
+                cfg["info"] = info
+                cfg["model_name"] = model.name
+
+            self.placement_initializer = self._get_placement_initializer(
+                self.object_cfgs
+            )
+            try:
+                object_placements = self.placement_initializer.sample(
+                    placed_objects=self.fxtr_placements
+                )
+            except RandomizationError as e:
+                if macros.VERBOSE:
+                    print("Randomization error in soft reset. Try #{}".format(i))
+                continue
+            break
+        if object_placements is None:
+            raise RandomizationError("Cannot place objects during soft reset")
+        self.object_placements = object_placements
+
+    def _park_inactive_objects(self):
+        """
+        Parks the candidate objects that are not active far away from the scene, and turns gravity
+        compensation on for them (off for the active ones) so that they stay in place.
+        """
+        if all([len(slots) == 1 for slots in self.object_slots.values()]):
+            return
+        active_models = set(self.objects.values())
+        num_parked = 0
+        for slots in self.object_slots.values():
+            for model, _ in slots:
+                gravcomp = 0.0 if model in active_models else 1.0
+                for body_name in model.bodies:
+                    body_id = self.sim.model.body_name2id(body_name)
+                    self.sim.model.body_gravcomp[body_id] = gravcomp
+                if model in active_models:
+                    continue
+                self.sim.data.set_joint_qpos(
+                    model.joints[0],
+                    np.array([-10.0 - num_parked, -10.0, 10.0, 1.0, 0.0, 0.0, 0.0]),
+                )
+                num_parked += 1
 
     def _setup_kitchen_references(self):
         """
@@ -848,6 +996,24 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         """
         super()._reset_internal()
 
+        # soft resets keep the compiled model, so objects need to be re-sampled here
+        if (
+            not self.hard_reset
+            and not self.deterministic_reset
+            and not self._fresh_object_placements
+        ):
+            self._soft_reset_objects()
+            if self._texture_swapper is not None:
+                slot = self.rng.integers(self._texture_swapper.num_slots)
+                self._texture_swapper.set_slot(slot)
+                self._curr_gen_fixtures = self._texture_candidates[slot]
+        self._fresh_object_placements = False
+
+        # also needed for fresh placements: the candidates merged into a newly compiled model start at their
+        # default pose inside the scene, with gravity on
+        if not self.deterministic_reset:
+            self._park_inactive_objects()
+
         # Reset all object positions using initializer sampler if we're not directly loading from an xml
         if not self.deterministic_reset and self.placement_initializer is not None and self.object_placements is not None:
             # use pre-computed object placements
@@ -999,51 +1165,19 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         Returns:
             str: Post-processed xml file as string
         """
-        xml_str = super().edit_model_xml(xml_str)
-
-        tree = ET.fromstring(xml_str)
-        root = tree
+        # parse once and apply all edits to the same tree. This also covers the robosuite asset path
+        # relocation of the parent class, so the parent is not called
+        root = ET.fromstring(xml_str)
         worldbody = root.find("worldbody")
         asset = root.find("asset")
-        meshes = asset.findall("mesh")
-        textures = asset.findall("texture")
-        all_elements = meshes + textures
-
-        robocasa_path_split = os.path.split(robocasa.__file__)[0].split("/")
-
-        # replace robocasa-specific asset paths
-        for elem in all_elements:
-            old_path = elem.get("file")
-            if old_path is None:
-                continue
-
-            old_path_split = old_path.split("/")
-            # maybe replace all paths to robosuite assets
-            if (
-                ("models/assets/fixtures" in old_path)
-                or ("models/assets/textures" in old_path)
-                or ("models/assets/objects/objaverse" in old_path)
-            ):
-                if "/robosuite/" in old_path:
-                    check_lst = [
-                        loc
-                        for loc, val in enumerate(old_path_split)
-                        if val == "robosuite"
-                    ]
-                elif "/robocasa/" in old_path:
-                    check_lst = [
-                        loc
-                        for loc, val in enumerate(old_path_split)
-                        if val == "robocasa"
-                    ]
-                else:
-                    raise ValueError
 
-                ind = max(check_lst)  # last occurrence index
-                new_path_split = robocasa_path_split + old_path_split[ind + 1 :]
+        # replace robosuite and robocasa asset paths. textures loaded from the decoded-texture cache are
+        # first pointed back to their pngs
+        restore_texture_paths(root)
+        relocate_asset_paths(root)
 
-                new_path = "/".join(new_path_split)
-                elem.set("file", new_path)
+        # models saved with texture slots only keep the textures that were active
+        remove_texture_slots(asset, active_textures=self._ep_meta.get("gen_textures"))
 
         # set cameras
         for cam_name, cam_config in self._cam_configs.items():
@@ -1070,36 +1204,53 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             for (k, v) in cam_config.get("camera_attribs", {}).items():
                 cam.set(k, v)
 
-        # result = ET.tostring(root, encoding="utf8").decode("utf8")
-        result = ET.tostring(root).decode("utf8")
-
         # replace with generative textures
         if (self.generative_textures is not None) and (
             self.generative_textures is not False
         ):
             # sample textures
             assert self.generative_textures == "100p"
-            self._curr_gen_fixtures = get_random_textures(self.rng)
+            if self.num_texture_slots > 1:
+                self._texture_candidates = get_texture_candidates(
+                    self.rng, self.num_texture_slots
+                )
+                self._curr_gen_fixtures = self._texture_candidates[0]
+                add_texture_slots(asset, self._texture_candidates)
+            else:
+                self._curr_gen_fixtures = get_random_textures(self.rng)
+                set_generative_textures(asset, self._curr_gen_fixtures)
 
-            cab_tex = self._curr_gen_fixtures["cab_tex"]
-            counter_tex = self._curr_gen_fixtures["counter_tex"]
-            wall_tex = self._curr_gen_fixtures["wall_tex"]
-            floor_tex = self._curr_gen_fixtures["floor_tex"]
+        if macros.USE_TEXTURE_CACHE:
+            use_cached_textures(root)
 
-            result = replace_cab_textures(
-                self.rng, result, new_cab_texture_file=cab_tex
-            )
-            result = replace_counter_top_texture(
-                self.rng, result, new_counter_top_texture_file=counter_tex
-            )
-            result = replace_wall_texture(
-                self.rng, result, new_wall_texture_file=wall_tex
-            )
-            result = replace_floor_texture(
-                self.rng, result, new_floor_texture_file=floor_tex
-            )
+        return ET.tostring(root).decode("utf8")
 
-        return result
+    def _initialize_sim(self, xml_string=None):
+        """
+        Creates a MjSim object and stores it in self.sim. Models loaded from xml strings (e.g. when replaying
+        demonstrations) reuse the compiled model of an identical xml if it is cached
+
+        Args:
+            xml_string (str): If specified, creates MjSim object from this xml string
+        """
+        if not xml_string:
+            self._model_xml_hash = None
+            super()._initialize_sim(xml_string=xml_string)
+            return
+
+        xml = xml_string
+        # process the xml before initializing sim
+        for processor in getattr(self, "_xml_processors", []):
+            xml = processor(xml)
+
+        model, self._model_xml_hash = compile_model(xml)
+        self.sim = MjSim(model)
+
+        # run a single step to make sure changes have propagated through sim state
+        self.sim.forward()
+
+        # Setup sim time based on control frequency
+        self.initialize_time(self.control_freq)
 
     def _setup_references(self):
         """
@@ -1112,6 +1263,23 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         self.obj_body_id = {}
         for (name, model) in self.objects.items():
             self.obj_body_id[name] = self.sim.model.body_name2id(model.root_body)
+        # candidate objects for soft resets are also accessible by their own name. The first candidate
+        # shares its name with the config, which refers to the active candidate
+        self._slot_body_id = {}
+        for slots in self.object_slots.values():
+            for (model, _) in slots:
+                body_id = self.sim.model.body_name2id(model.root_body)
+                self._slot_body_id[model.root_body] = body_id
+                if model.name not in self.obj_body_id:
+                    self.obj_body_id[model.name] = body_id
+
+        if self._texture_candidates is not None and (
+            self._texture_swapper is None
+            or self._texture_swapper.model is not self.sim.model._model
+        ):
+            self._texture_swapper = TextureSlotSwapper(
+                self.sim.model._model, num_slots=len(self._texture_candidates)
+            )
             
         
     def _setup_observables(self):
@@ -1144,8 +1312,23 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         names = ["world_pose_in_gripper"]
         actives = [False]
 
+        # ground-truth poses of all objects, gathered with one read from sim.data and transformed to the
+        # eef frame in one batch. the per-object observables below slice their rows
+        self._obs_obj_rows = {obj_name: i for (i, obj_name) in enumerate(self.objects)}
+        obj_names = list(self._obs_obj_rows.keys())
+
+        @sensor(modality=modality)
+        def object_poses(obs_cache):
+            return self._get_obj_poses(
+                obj_names, obs_cache.get("world_pose_in_gripper", None)
+            )
+
+        sensors.append(object_poses)
+        names.append("object_poses")
+        actives.append(False)
+
         # add ground-truth poses (absolute and relative to eef) for all objects
-        for obj_name in self.obj_body_id:
+        for obj_name in self.objects:
             obj_sensors, obj_sensor_names = self._create_obj_sensors(
                 obj_name=obj_name, modality=modality
             )
@@ -1180,50 +1363,32 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
                 names (list): array of corresponding observable names
         """
 
-        ### TODO: this was stolen from pick-place - do we want to move this into utils to share it? ###
         pf = self.robots[0].robot_model.naming_prefix
 
+        def get_obj_pose(obs_cache):
+            # row of this object in the batched object poses, computed on its own if they are unavailable
+            if "object_poses" in obs_cache and obj_name in self._obs_obj_rows:
+                return obs_cache["object_poses"][self._obs_obj_rows[obj_name]]
+            return self._get_obj_poses(
+                [obj_name], obs_cache.get("world_pose_in_gripper", None)
+            )[0]
+
         @sensor(modality=modality)
         def obj_pos(obs_cache):
-            return np.array(self.sim.data.body_xpos[self.obj_body_id[obj_name]])
+            return np.array(get_obj_pose(obs_cache)[:3])
 
         @sensor(modality=modality)
         def obj_quat(obs_cache):
-            return T.convert_quat(
-                self.sim.data.body_xquat[self.obj_body_id[obj_name]], to="xyzw"
-            )
+            return np.array(get_obj_pose(obs_cache)[3:7])
 
         @sensor(modality=modality)
         def obj_to_eef_pos(obs_cache):
-            # Immediately return default value if cache is empty
-            if any(
-                [
-                    name not in obs_cache
-                    for name in [
-                        f"{obj_name}_pos",
-                        f"{obj_name}_quat",
-                        "world_pose_in_gripper",
-                    ]
-                ]
-            ):
-                return np.zeros(3)
-            obj_pose = T.pose2mat(
-                (obs_cache[f"{obj_name}_pos"], obs_cache[f"{obj_name}_quat"])
-            )
-            rel_pose = T.pose_in_A_to_pose_in_B(
-                obj_pose, obs_cache["world_pose_in_gripper"]
-            )
-            rel_pos, rel_quat = T.mat2pose(rel_pose)
-            obs_cache[f"{obj_name}_to_{pf}eef_quat"] = rel_quat
-            return rel_pos
+            return np.array(get_obj_pose(obs_cache)[7:10])
 
         @sensor(modality=modality)
         def obj_to_eef_quat(obs_cache):
-            return (
-                obs_cache[f"{obj_name}_to_{pf}eef_quat"]
-                if f"{obj_name}_to_{pf}eef_quat" in obs_cache
-                else np.zeros(4)
-            )
+            # T.mat2quat returns single precision quaternions
+            return get_obj_pose(obs_cache)[10:14].astype(np.float32)
 
         sensors = [obj_pos, obj_quat, obj_to_eef_pos, obj_to_eef_quat]
         names = [
@@ -1235,6 +1400,36 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
         return sensors, names
 
+    def _get_obj_poses(self, obj_names, world_pose_in_gripper=None):
+        """
+        Computes the ground-truth poses of objects, absolute and relative to the eef, in one batch
+
+        Args:
+            obj_names (list): names of the objects
+
+            world_pose_in_gripper (np.array): 4x4 pose of the world frame in the eef frame.
+                If None, relative poses are zero
+
+        Returns:
+            np.array: (N, 14) array with, per object, the position (3), xyzw quaternion (4), position
+                relative to the eef (3) and xyzw quaternion relative to the eef (4)
+        """
+        poses = np.zeros((len(obj_names), 14))
+        if len(obj_names) == 0:
+            return poses
+        body_ids = [self.obj_body_id[obj_name] for obj_name in obj_names]
+        poses[:, :3] = self.sim.data.body_xpos[body_ids]
+        poses[:, 3:7] = self.sim.data.body_xquat[body_ids][:, [1, 2, 3, 0]]
+        if world_pose_in_gripper is None:
+            return poses
+
+        # same as T.pose_in_A_to_pose_in_B for each object pose, followed by T.mat2pose
+        rot_in_gripper = world_pose_in_gripper[:3, :3]
+        poses[:, 7:10] = poses[:, :3] @ rot_in_gripper.T + world_pose_in_gripper[:3, 3]
+        rel_mats = rot_in_gripper @ OU.quat2mat_batch(poses[:, 3:7])
+        poses[:, 10:14] = OU.mat2quat_batch(rel_mats)
+        return poses
+
     def _post_action(self, action):
         """
         Do any housekeeping after taking an action.
@@ -1369,8 +1564,8 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
 
             obj_registries (tuple): registries to sample from
 
-            max_size (tuple): max size of the object. If the sampled object is not within bounds of max size,
-                            function will resample
+            max_size (tuple): max size of the object. Only objects within bounds of max size are sampled.
+                            Raises a ValueError if no object fits
 
             object_scale (float): scale of the object. If set will multiply the scale of the sampled object by this value
 
@@ -1408,11 +1603,28 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         Returns:
             bool: True if fixture is valid, False otherwise
         """
+        index = self._get_fixture_index()
+        if index.fixtures.get(fxtr.name, None) is fxtr:
+            return index.has_region_of_size(fxtr.name, size)
         for region in fxtr.get_reset_regions(self).values():
             if region["size"][0] >= size[0] and region["size"][1] >= size[1]:
                 return True
         return False
 
+    def _get_fixture_index(self):
+        """
+        Returns the lookup tables used by get_fixture, building them on first use after fixtures are placed
+
+        Returns:
+            FixtureIndex: fixture index of the current scene
+        """
+        if (
+            self._fixture_index is None
+            or self._fixture_index.fixtures is not self.fixtures
+        ):
+            self._fixture_index = FixtureIndex(self.fixtures, env=self)
+        return self._fixture_index
+
     def get_fixture(self, id, ref=None, size=(0.2, 0.2)):
         """
         search fixture by id (name, object, or type)
@@ -1434,21 +1646,16 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
         elif id in self.fixtures.keys():
             return self.fixtures[id]
 
+        index = self._get_fixture_index()
         if ref is None:
             # find all fixtures with names containing given name
             if isinstance(id, FixtureType) or isinstance(id, int):
-                matches = [
-                    name
-                    for (name, fxtr) in self.fixtures.items()
-                    if fixture_is_type(fxtr, id)
-                ]
+                matches = index.get_type_matches(id)
             else:
                 matches = [name for name in self.fixtures.keys() if id in name]
             if id == FixtureType.COUNTER or id == FixtureType.COUNTER_NON_CORNER:
                 matches = [
-                    name
-                    for name in matches
-                    if self._is_fxtr_valid(self.fixtures[name], size)
+                    name for name in matches if index.has_region_of_size(name, size)
                 ]
             assert len(matches) > 0
             # sample random key
@@ -1458,26 +1665,22 @@ class Kitchen(ManipulationEnv, metaclass=KitchenEnvMeta):
             ref_fixture = self.get_fixture(ref)
 
             assert isinstance(id, FixtureType)
-            cand_fixtures = []
-            for fxtr in self.fixtures.values():
-                if not fixture_is_type(fxtr, id):
-                    continue
-                if fxtr is ref_fixture:
+            cand_names = []
+            for name in index.get_type_matches(id):
+                if self.fixtures[name] is ref_fixture:
                     continue
                 if id == FixtureType.COUNTER:
-                    fxtr_is_valid = self._is_fxtr_valid(fxtr, size)
-                    if not fxtr_is_valid:
+                    if not index.has_region_of_size(name, size):
                         continue
-                cand_fixtures.append(fxtr)
+                cand_names.append(name)
+            cand_fixtures = [self.fixtures[name] for name in cand_names]
 
             # first, try to find fixture "containing" the reference fixture
             for fxtr in cand_fixtures:
                 if OU.point_in_fixture(ref_fixture.pos, fxtr, only_2d=True):
                     return fxtr
             # if no fixture contains reference fixture, sample all close fixtures
-            dists = [
-                OU.fixture_pairwise_dist(ref_fixture, fxtr) for fxtr in cand_fixtures
-            ]
+            dists = index.get_dists(ref_fixture, cand_names)
             min_dist = np.min(dists)
             close_fixtures = [
                 fxtr for (fxtr, d) in zip(cand_fixtures, dists) if d - min_dist < 0.10
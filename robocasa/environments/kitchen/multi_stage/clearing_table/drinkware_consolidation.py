@@ -64,13 +64,7 @@ class DrinkwareConsolidation(Kitchen):
         return cfgs
 
     def _check_success(self):
-        objs_in_cab = all(
-            [
-                OU.obj_inside_of(self, f"obj_{i}", self.cab)
-                for i in range(self.num_drinkware)
-            ]
-        )
-        gripper_obj_far = all(
-            [OU.gripper_obj_far(self, f"obj_{i}") for i in range(self.num_drinkware)]
-        )
+        obj_names = [f"obj_{i}" for i in range(self.num_drinkware)]
+        objs_in_cab = all(OU.objs_inside_of(self, obj_names, self.cab))
+        gripper_obj_far = all(OU.gripper_objs_far(self, obj_names))
         return objs_in_cab and gripper_obj_far
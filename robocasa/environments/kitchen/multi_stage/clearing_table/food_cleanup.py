@@ -71,7 +71,9 @@ class FoodCleanup(Kitchen):
 
     def _check_success(self):
         food_inside_cab = all(
-            [OU.obj_inside_of(self, f"food{i}", self.cab) for i in range(self.num_food)]
+            OU.objs_inside_of(
+                self, [f"food{i}" for i in range(self.num_food)], self.cab
+            )
         )
         cab_closed = True
         door_state = self.cab.get_door_state(env=self)
@@ -82,8 +82,9 @@ class YogurtDelightPrep(Kitchen):
         )
 
         objs_far = all(
-            [OU.gripper_obj_far(self, f"fruit_{i}") for i in range(self.num_fruits)]
+            OU.gripper_objs_far(
+                self, [f"fruit_{i}" for i in range(self.num_fruits)] + ["yogurt"]
+            )
         )
-        objs_far = objs_far and OU.gripper_obj_far(self, "yogurt")
 
         return items_on_counter and objs_far
@@ -18,6 +18,48 @@ SPACEMOUSE_PRODUCT_ID = 50741
 
 DATASET_BASE_PATH = None
 
+# whether to reuse fully built fixture trees across resets with the same layout and style
+CACHE_FIXTURES = True
+# maximum number of (layout, style) fixture trees kept in memory per process. None for unbounded
+FIXTURE_CACHE_SIZE = 32
+# if set, fixture trees are also pickled to this directory and shared across processes
+FIXTURE_CACHE_DIR = None
+# if set and the file exists, parsed layout/style/fixture yamls are loaded from this snapshot at import
+# (create it with robocasa/scripts/bench_scene_yaml.py --save_snapshot)
+YAML_SNAPSHOT_PATH = None
+
+# whether placement samplers score batches of candidate placements at once instead of one at a time.
+# the accepted placements and the random number generator state are identical either way
+VECTORIZE_PLACEMENT_SAMPLING = True
+# number of candidate placements generated and scored per batch
+PLACEMENT_BATCH_SIZE = 64
+# cell size (in meters) of the grid used to look up placed objects near a sampling region. None to disable
+PLACEMENT_INDEX_CELL_SIZE = 0.5
+
+# precomputed object geometry table. None for assets/objects/geometry_table.npz
+# (create it with robocasa/scripts/build_object_geometry.py)
+OBJECT_GEOMETRY_TABLE_PATH = None
+
+# whether to build objects by cloning cached, fully processed templates of the same model and parameters
+CACHE_OBJECT_TEMPLATES = True
+# maximum number of object templates kept per process. None for unbounded
+OBJECT_TEMPLATE_CACHE_SIZE = 512
+
+# folder with the object attribute data used for distractor sampling (all_infos.json, obj_name_list.json,
+# ori_rank.npy). None for the repository root. The ROBOCASA_OBJ_ATTRIBUTES_DIR env var takes precedence
+OBJ_ATTRIBUTES_DIR = None
+
+# whether compiled models load textures from the decoded-texture cache instead of decoding pngs
+# (warm it with robocasa/scripts/warm_texture_cache.py)
+USE_TEXTURE_CACHE = False
+# folder of the decoded-texture cache. None for ~/.cache/robocasa/textures
+TEXTURE_CACHE_DIR = None
+
+# whether models loaded from xml strings (e.g. dataset playback) reuse compiled models of identical xmls
+CACHE_COMPILED_MODELS = True
+# maximum number of compiled models kept per process
+COMPILED_MODEL_CACHE_SIZE = 4
+
 try:
     from robocasa.macros_private import *
 except ImportError:
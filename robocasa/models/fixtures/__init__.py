@@ -16,4 +16,4 @@ from robocasa.models.fixtures.dishwasher import Dishwasher
 from robocasa.models.fixtures.fixture_stack import FixtureStack
 from robocasa.models.fixtures.windows import Window, FramedWindow
 
-from robocasa.models.fixtures.fixture_utils import fixture_is_type
+from robocasa.models.fixtures.fixture_utils import FixtureIndex, fixture_is_type
@@ -335,6 +335,59 @@ class Fixture(MujocoXMLObject):
         for (name, pos) in pos_dict.items():
             self._bounds_sites[name].set("pos", array_to_string(pos))
 
+    def _get_bounds(self, kind):
+        """
+        Get the bounding box points of the object, relative to the object and in the world frame. These are
+        cached and only recomputed after the object was moved, rotated or its bounding box sites changed
+
+        Args:
+            kind (str): "ext" for the exterior or "int" for the interior bounding box
+
+        Returns:
+            dict: with keys
+                - rel_points: (8, 3) points relative to the object's position
+                - points: (8, 3) points in the world frame
+                - axes: (3, 3) bounding box edge vectors (px - p0, py - p0, pz - p0) in the world frame
+                - lower, upper: (3,) bounds of the bounding box projected on the axes
+        """
+        key = (
+            self._obj.get("pos"),
+            self._obj.get("euler"),
+            self._obj.get("quat"),
+            tuple([site.get("pos") for site in self._bounds_sites.values()]),
+        )
+        cache = self.__dict__.get("_bounds_cache", None)
+        if cache is None or cache["key"] != key:
+            cache = self._bounds_cache = dict(key=key)
+        if kind not in cache:
+            p0, px, py, pz = [
+                site_pos(self._bounds_sites["{}_{}".format(kind, postfix)])
+                for postfix in ("p0", "px", "py", "pz")
+            ]
+            rel_points = np.array(
+                [
+                    p0,
+                    px,
+                    py,
+                    pz,
+                    [p0[0], py[1], pz[2]],
+                    [px[0], py[1], pz[2]],
+                    [px[0], py[1], p0[2]],
+                    [px[0], p0[1], pz[2]],
+                ]
+            )
+            mat = T.euler2mat(np.array([0, 0, self.rot]))
+            points = self.pos + np.dot(rel_points, mat.T)
+            axes = points[1:4] - points[0]
+            cache[kind] = dict(
+                rel_points=rel_points,
+                points=points,
+                axes=axes,
+                lower=np.dot(axes, points[0]),
+                upper=np.einsum("ij,ij->i", axes, points[1:4]),
+            )
+        return cache[kind]
+
     def get_ext_sites(self, all_points=False, relative=True):
         """
         Get the exterior bounding box points of the object
@@ -347,26 +400,9 @@ class Fixture(MujocoXMLObject):
         Returns:
             list: 4 or 8 points
         """
-        sites = [
-            site_pos(self._bounds_sites["ext_p0"]),
-            site_pos(self._bounds_sites["ext_px"]),
-            site_pos(self._bounds_sites["ext_py"]),
-            site_pos(self._bounds_sites["ext_pz"]),
-        ]
-
-        if all_points:
-            p0, px, py, pz = sites
-            sites += [
-                np.array([p0[0], py[1], pz[2]]),
-                np.array([px[0], py[1], pz[2]]),
-                np.array([px[0], py[1], p0[2]]),
-                np.array([px[0], p0[1], pz[2]]),
-            ]
-
-        if relative is False:
-            sites = [get_pos_after_rel_offset(self, offset) for offset in sites]
-
-        return sites
+        bounds = self._get_bounds("ext")
+        points = bounds["rel_points"] if relative else bounds["points"]
+        return list(points[: 8 if all_points else 4].copy())
 
     def get_int_sites(self, all_points=False, relative=True):
         """
@@ -380,26 +416,32 @@ class Fixture(MujocoXMLObject):
         Returns:
             list: 4 or 8 points
         """
-        sites = [
-            site_pos(self._bounds_sites["int_p0"]),
-            site_pos(self._bounds_sites["int_px"]),
-            site_pos(self._bounds_sites["int_py"]),
-            site_pos(self._bounds_sites["int_pz"]),
-        ]
-
-        if all_points:
-            p0, px, py, pz = sites
-            sites += [
-                np.array([p0[0], py[1], pz[2]]),
-                np.array([px[0], py[1], pz[2]]),
-                np.array([px[0], py[1], p0[2]]),
-                np.array([px[0], p0[1], pz[2]]),
-            ]
+        bounds = self._get_bounds("int")
+        points = bounds["rel_points"] if relative else bounds["points"]
+        return list(points[: 8 if all_points else 4].copy())
 
-        if relative is False:
-            sites = [get_pos_after_rel_offset(self, offset) for offset in sites]
+    def points_in_bounds(self, points, kind="ext", th=0.0, only_2d=False):
+        """
+        Check which points are inside of a bounding box of the object
+
+        Args:
+            points (np.array): (N, 3) points in the world frame
 
-        return sites
+            kind (str): "ext" for the exterior or "int" for the interior bounding box
+
+            th (float): tolerance by which points may lie outside of the bounding box
+
+            only_2d (bool): whether to only check the first two bounding box axes
+
+        Returns:
+            np.array: (N,) booleans
+        """
+        bounds = self._get_bounds(kind)
+        proj = np.dot(np.asarray(points).reshape(-1, 3), bounds["axes"].T)
+        inside = (bounds["lower"] - th <= proj) & (proj <= bounds["upper"] + th)
+        if only_2d:
+            inside = inside[:, :2]
+        return np.all(inside, axis=1)
 
     def get_bbox_points(self, trans=None, rot=None):
         """
@@ -1,3 +1,5 @@
+import numpy as np
+
 from robocasa.models.fixtures import *
 
 
@@ -104,3 +106,108 @@ def fixture_is_type(fixture, fixture_type):
         return isinstance(fixture, Counter) and "corner" not in fixture.name
     else:
         raise ValueError
+
+
+class FixtureIndex:
+    """
+    Lookup tables for fixture queries in a placed scene (see Kitchen.get_fixture). Fixture types, counter
+    reset region sizes and exterior bounding box points are computed once per fixture and reused across
+    queries. Since types and bounding boxes depend on the fixture positions, the index must be rebuilt
+    whenever fixtures are placed again.
+
+    Args:
+        fixtures (dict): maps fixture names to fixtures, in scene order
+
+        env (Kitchen): environment the fixtures belong to
+    """
+
+    def __init__(self, fixtures, env):
+        self.fixtures = fixtures
+        self.env = env
+        self.names = list(fixtures.keys())
+        self.name_to_row = {name: i for (i, name) in enumerate(self.names)}
+        self.fixture_to_row = {
+            id(fxtr): i for (i, fxtr) in enumerate(fixtures.values())
+        }
+
+        # maps fixture types to the names of matching fixtures, in scene order
+        self._type_matches = dict()
+        # maps fixture names to the (x, y) sizes of their reset regions
+        self._region_sizes = dict()
+        # (num_fixtures, 8, 3) world frame exterior bounding box points, computed on first use
+        self._ext_points = None
+
+    def get_type_matches(self, fixture_type):
+        """
+        Returns:
+            list: names of the fixtures of type @fixture_type, in scene order
+        """
+        if fixture_type not in self._type_matches:
+            self._type_matches[fixture_type] = [
+                name
+                for (name, fxtr) in self.fixtures.items()
+                if fixture_is_type(fxtr, fixture_type)
+            ]
+        return self._type_matches[fixture_type]
+
+    def get_region_sizes(self, name):
+        """
+        Returns:
+            np.array: (N, 2) sizes of the reset regions of fixture @name
+        """
+        if name not in self._region_sizes:
+            regions = self.fixtures[name].get_reset_regions(self.env).values()
+            self._region_sizes[name] = np.array(
+                [region["size"][:2] for region in regions], dtype=float
+            ).reshape(-1, 2)
+        return self._region_sizes[name]
+
+    def has_region_of_size(self, name, size):
+        """
+        Returns:
+            bool: True if fixture @name has a reset region of at least @size (x, y)
+        """
+        sizes = self.get_region_sizes(name)
+        return bool(np.any((sizes[:, 0] >= size[0]) & (sizes[:, 1] >= size[1])))
+
+    def get_ext_points(self, names=None):
+        """
+        Returns:
+            np.array: (N, 8, 3) world frame exterior bounding box points of fixtures @names (all if None)
+        """
+        if self._ext_points is None:
+            self._ext_points = np.array(
+                [
+                    fxtr.get_ext_sites(all_points=True, relative=False)
+                    for fxtr in self.fixtures.values()
+                ]
+            ).reshape(-1, 8, 3)
+        if names is None:
+            return self._ext_points
+        return self._ext_points[[self.name_to_row[name] for name in names]]
+
+    def get_dists(self, ref_fixture, names):
+        """
+        Computes the distances of fixtures to a reference fixture, as the minimum distance between their
+        exterior bounding box points (same as fixture_pairwise_dist)
+
+        Args:
+            ref_fixture (Fixture): reference fixture
+
+            names (list): names of fixtures to compute distances for
+
+        Returns:
+            np.array: (N,) distances
+        """
+        ref_row = self.fixture_to_row.get(id(ref_fixture), None)
+        if ref_row is not None:
+            ref_points = self.get_ext_points()[ref_row]
+        else:
+            ref_points = np.array(
+                ref_fixture.get_ext_sites(all_points=True, relative=False)
+            )
+        points = self.get_ext_points(names)
+        dists = np.linalg.norm(
+            points[:, :, None, :] - ref_points[None, None, :, :], axis=-1
+        )
+        return dists.reshape(len(names), -1).min(axis=1)
@@ -1,30 +1,30 @@
-import torch
 from copy import deepcopy
+import hashlib
 import pathlib
 import os
 import math
 import random
-import xml.etree.ElementTree as ET
 import json
 from collections import defaultdict
+from functools import lru_cache
 
 import numpy as np
-from robosuite.utils.mjcf_utils import find_elements, string_to_array
 
 import robocasa
+from robocasa.models.objects.object_attributes import (
+    get_distractor_table,
+    get_obj_infos,
+    get_rank_data,
+)
+from robocasa.models.objects.object_geometry import get_object_geometry_table
 
-ALL_OBJ_INFOS = json.load(open('/ailab/group/pjlab-smartbot/chenxinyi/haifeng/robocasa_exps/robocasa/all_infos.json', 'r'))
-rank_info = torch.load('/ailab/group/pjlab-smartbot/chenxinyi/haifeng/robocasa_exps/robocasa/rank_info.pt', map_location='cpu')
-OBJ_NAME_LIST = rank_info['obj_name_list']
-ORI_RANK = rank_info['ori_rank']
-OBJ_SIM_MATRIX = rank_info['obj_sim_matrix']
+# attribute infos and rank matrix used for distractor sampling are loaded lazily, see object_attributes.py
 ATTR2IDX = {
     'color': 0,
     'shape': 1,
     'material': 2,
     'class': 3
 }
-CLASSNAME2IDX = {OBJ_NAME_LIST[idx]: idx for idx in range(len(OBJ_NAME_LIST))}
 
 
 BASE_ASSET_ZOO_PATH = os.path.join(robocasa.models.assets_root, "objects")
@@ -2927,6 +2927,62 @@ for (name, kwargs) in OBJ_CATEGORIES.items():
         OBJ_CATEGORIES[name]["objaverse_extra"] = ObjCat(name=name, source="objaverse_extra", **objaverse_extra_kwargs)
 
 
+### index categories and groups once, so that sampling queries don't need to walk OBJ_GROUPS ###
+CATEGORY_NAMES = list(OBJ_CATEGORIES.keys())
+CATEGORY_IDS = {cat: i for (i, cat) in enumerate(CATEGORY_NAMES)}
+OBJ_REGISTRIES = sorted(
+    set([reg for cat_regs in OBJ_CATEGORIES.values() for reg in cat_regs])
+)
+
+# bit of each affordance in the category flag bitmasks
+AFFORDANCE_BITS = dict(
+    graspable=1 << 0,
+    washable=1 << 1,
+    microwavable=1 << 2,
+    cookable=1 << 3,
+    freezable=1 << 4,
+)
+
+# maps registry to a bool array, True for the categories represented in the registry
+CATEGORY_IN_REGISTRY = {
+    reg: np.array([reg in OBJ_CATEGORIES[cat] for cat in CATEGORY_NAMES], dtype=bool)
+    for reg in OBJ_REGISTRIES
+}
+
+# maps registry to an array of affordance bitmasks of each category (0 if not in the registry)
+CATEGORY_FLAGS = {
+    reg: np.array(
+        [
+            sum(
+                [
+                    bit
+                    for (flag, bit) in AFFORDANCE_BITS.items()
+                    if getattr(OBJ_CATEGORIES[cat][reg], flag) is True
+                ]
+            )
+            if reg in OBJ_CATEGORIES[cat]
+            else 0
+            for cat in CATEGORY_NAMES
+        ],
+        dtype=np.int64,
+    )
+    for reg in OBJ_REGISTRIES
+}
+
+# maps group to the ids of its categories, in OBJ_GROUPS order
+GROUP_CATEGORY_IDS = {
+    group: np.array([CATEGORY_IDS[cat] for cat in group_cats], dtype=np.int64)
+    for (group, group_cats) in OBJ_GROUPS.items()
+}
+
+# maps category to the groups containing it, in OBJ_GROUPS order
+CATEGORY_GROUPS = {cat: [] for cat in CATEGORY_NAMES}
+for (group, group_cats) in OBJ_GROUPS.items():
+    for cat in group_cats:
+        if group not in CATEGORY_GROUPS[cat]:
+            CATEGORY_GROUPS[cat].append(group)
+
+
 
 def sample_kitchen_object(
     groups,
@@ -2968,7 +3024,9 @@ def sample_kitchen_object(
         split (str): split to sample from. Split "A" specifies all but the last 3 object instances
                     (or the first half - whichever is larger), "B" specifies the  rest, and None specifies all.
 
-        max_size (tuple): max size of the object. If the sampled object is not within bounds of max size, function will resample
+        max_size (tuple): max size of the object. Objects that are not within bounds of max size are filtered out
+            before sampling, so that the object is drawn with the same distribution as if it were resampled until
+            it fits
 
         object_scale (float): scale of the object. If set will multiply the scale of the sampled object by this value
 
@@ -2978,58 +3036,437 @@ def sample_kitchen_object(
 
         dict: info about the sampled object - the path of the mjcf, groups which the object's category belongs to, the category of the object
               the sampling split the object came from, and the groups the object was sampled from
+
+    Raises:
+        ValueError: [No object satisfies the constraints]
     """
-    # breakpoint()
-    valid_object_sampled = False
-    while valid_object_sampled is False:
-        mjcf_kwargs, info = sample_kitchen_object_helper(
-            groups=groups,
-            exclude_groups=exclude_groups,
-            graspable=graspable,
-            washable=washable,
-            microwavable=microwavable,
-            cookable=cookable,
-            freezable=freezable,
-            rng=rng,
-            obj_registries=obj_registries,
-            split=split,
-            object_scale=object_scale,
-            cfg=cfg
-        )
-
-        # check if object size is within bounds
-        mjcf_path = info["mjcf_path"]
-        tree = ET.parse(mjcf_path)
-        root = tree.getroot()
-        # todo: bottom/top/horizaontal_radius
-        bottom = string_to_array(
-            find_elements(root=root, tags="site", attribs={"name": "bottom_site"}).get(
-                "pos"
+    sample_kwargs = dict(
+        groups=groups,
+        exclude_groups=exclude_groups,
+        graspable=graspable,
+        washable=washable,
+        microwavable=microwavable,
+        cookable=cookable,
+        freezable=freezable,
+        obj_registries=obj_registries,
+        split=split,
+        object_scale=object_scale,
+        cfg=cfg,
+    )
+
+    fixed_object = (cfg and cfg.get("info", None)) or (
+        isinstance(groups, str) and groups.endswith(".xml")
+    )
+    if fixed_object or all([s is None for s in max_size]):
+        mjcf_kwargs, info = sample_kitchen_object_helper(rng=rng, **sample_kwargs)
+        if not _fits_max_size(info["mjcf_path"], mjcf_kwargs["scale"], max_size):
+            raise ValueError(
+                "Object {} does not fit within max_size {}".format(
+                    info["mjcf_path"], max_size
+                )
             )
+        return mjcf_kwargs, info
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # enumerate every (category, registry, model) the helper could draw along with its probability, and
+    # drop the models that are too large. Drawing from the rest in one go has the same distribution as
+    # redrawing until an object fits
+    candidates = _get_object_candidates(**sample_kwargs)
+    fits = np.zeros(len(candidates), dtype=bool)
+    if len(candidates) > 0:
+        geometry_table = get_object_geometry_table()
+        scales = np.array(
+            [
+                np.broadcast_to(
+                    np.asarray(
+                        _get_scaled(OBJ_CATEGORIES[cat][reg].scale, object_scale),
+                        dtype=np.float64,
+                    ),
+                    (3,),
+                )
+                for (cat, reg, _, _) in candidates
+            ]
+        )
+        sizes = geometry_table.get_sizes(
+            geometry_table.get_ids([mjcf_path for (_, _, mjcf_path, _) in candidates]),
+            scale=scales,
         )
-        top = string_to_array(
-            find_elements(root=root, tags="site", attribs={"name": "top_site"}).get(
-                "pos"
+        fits[:] = True
+        for i in range(3):
+            if max_size[i] is not None:
+                fits &= sizes[:, i] <= max_size[i]
+
+    if not np.any(fits):
+        raise ValueError(
+            "No object in groups {} (registries {}, split {}) fits within max_size {}".format(
+                groups, obj_registries, split, max_size
             )
         )
-        horizontal_radius = string_to_array(
-            find_elements(
-                root=root, tags="site", attribs={"name": "horizontal_radius_site"}
-            ).get("pos")
+
+    valid_idx = np.flatnonzero(fits)
+    probs = np.array([candidates[i][3] for i in valid_idx])
+    cat, chosen_reg, mjcf_path, _ = candidates[
+        valid_idx[rng.choice(len(valid_idx), p=probs / np.sum(probs))]
+    ]
+    return _get_sampled_object(
+        cat=cat,
+        chosen_reg=chosen_reg,
+        mjcf_path=mjcf_path,
+        groups=_as_list(groups),
+        split=split,
+        object_scale=object_scale,
+    )
+
+
+def _as_list(groups):
+    if not isinstance(groups, tuple) and not isinstance(groups, list):
+        groups = [groups]
+    return groups
+
+
+def _get_scaled(scale, object_scale):
+    if object_scale is None:
+        return scale
+    return np.multiply(scale, object_scale)
+
+
+def _fits_max_size(mjcf_path, scale, max_size):
+    """
+    Checks whether an object model with a given scale fits within max_size bounds
+    """
+    if all([s is None for s in max_size]):
+        return True
+    geometry_table = get_object_geometry_table()
+    obj_size = geometry_table.get_sizes(geometry_table.get_ids(mjcf_path), scale=scale)
+    for i in range(3):
+        if max_size[i] is not None and obj_size[i] > max_size[i]:
+            return False
+    return True
+
+
+def _get_valid_categories(
+    groups,
+    exclude_groups,
+    graspable,
+    washable,
+    microwavable,
+    cookable,
+    freezable,
+    obj_registries,
+):
+    """
+    Returns the categories in @groups and not in @exclude_groups that are represented in at least one of
+    @obj_registries and satisfy the requested affordances
+    """
+    if exclude_groups is None:
+        exclude_groups = []
+    required_flags = 0
+    for (flag, value) in zip(
+        ("graspable", "washable", "microwavable", "cookable", "freezable"),
+        (graspable, washable, microwavable, cookable, freezable),
+    ):
+        if value is True:
+            required_flags |= AFFORDANCE_BITS[flag]
+
+    return list(
+        _query_valid_categories(
+            groups=tuple(_as_list(groups)),
+            exclude_groups=tuple(_as_list(exclude_groups)),
+            required_flags=required_flags,
+            obj_registries=tuple(obj_registries),
         )
-        scale = mjcf_kwargs["scale"]
-        obj_size = (
-            np.array(
-                [horizontal_radius[0] * 2, horizontal_radius[1] * 2, top[2] - bottom[2]]
+    )
+
+
+@lru_cache(maxsize=None)
+def _query_valid_categories(groups, exclude_groups, required_flags, obj_registries):
+    """
+    Memoized category query on the category index. Categories are returned in the order they first appear
+    in @groups
+
+    Args:
+        groups (tuple): groups to sample from
+
+        exclude_groups (tuple): groups to exclude
+
+        required_flags (int): bitmask of the affordances the categories must have (see AFFORDANCE_BITS)
+
+        obj_registries (tuple): registries to sample from
+
+    Returns:
+        tuple: names of the valid categories
+    """
+    no_ids = np.zeros(0, dtype=np.int64)
+    cat_ids = np.concatenate([no_ids] + [GROUP_CATEGORY_IDS[g] for g in groups])
+    # don't repeat categories, keeping the first occurrence
+    _, first_idx = np.unique(cat_ids, return_index=True)
+    cat_ids = cat_ids[np.sort(first_idx)]
+
+    invalid_ids = np.concatenate(
+        [no_ids] + [GROUP_CATEGORY_IDS[g] for g in exclude_groups]
+    )
+    cat_ids = cat_ids[~np.isin(cat_ids, invalid_ids)]
+
+    # don't include if category not represented in any registry
+    valid = np.zeros(len(cat_ids), dtype=bool)
+    for reg in obj_registries:
+        if reg in CATEGORY_IN_REGISTRY:
+            valid |= CATEGORY_IN_REGISTRY[reg][cat_ids]
+
+    # every registry containing the category must have the requested affordances
+    for reg in obj_registries:
+        if reg not in CATEGORY_IN_REGISTRY:
+            continue
+        has_flags = (CATEGORY_FLAGS[reg][cat_ids] & required_flags) == required_flags
+        valid &= ~CATEGORY_IN_REGISTRY[reg][cat_ids] | has_flags
+
+    return tuple(CATEGORY_NAMES[i] for i in cat_ids[valid])
+
+
+def _split_mjcf_paths(reg_choices, split, num_registries):
+    """
+    Returns the models of a registry that belong to @split
+    """
+    if split is None:
+        return reg_choices
+    split_th = max(num_registries - 3, int(math.ceil(len(reg_choices) / 4 * 3)))
+    if split == "A":
+        return reg_choices[:split_th]
+    elif split == "B":
+        return reg_choices[split_th:]
+    else:
+        raise ValueError
+
+
+# number of top ranked objects distractors are drawn from
+DISTRACTOR_TOP_K = 30
+
+
+def _get_distractor_choices(valid_categories, obj_registries, split, cfg, registries):
+    """
+    Returns, for each registry in @registries, the models of @valid_categories that are most similar to
+    the target object cfg["target_obj_name"] without sharing its cfg["unique_attr"] attribute. Rankings
+    are looked up in the distractor table and only computed on a miss
+    """
+    distractor_table = get_distractor_table(
+        root=BASE_ASSET_ZOO_PATH, registry_hash=get_registry_hash()
+    )
+    distractor_choices = dict()
+    for reg in registries:
+        key = get_distractor_key(
+            cfg["target_obj_name"],
+            cfg["unique_attr"],
+            reg,
+            split,
+            obj_registries,
+            valid_categories,
+        )
+        choices = distractor_table.get(key)
+        if choices is None:
+            choices = rank_distractors(
+                cfg["target_obj_name"],
+                cfg["unique_attr"],
+                reg,
+                split,
+                obj_registries,
+                valid_categories,
+            )
+            distractor_table.set(key, choices)
+        distractor_choices[reg] = choices
+    return distractor_choices
+
+
+@lru_cache(maxsize=None)
+def get_registry_hash():
+    """
+    Returns a hash of the model paths of all object categories and registries. Distractor rankings are
+    drawn from these paths, which depend on the assets on disk and the exclude lists
+
+    Returns:
+        str: hash of the registry model paths
+    """
+    sha = hashlib.sha1()
+    for cat in sorted(OBJ_CATEGORIES.keys()):
+        for reg in sorted(OBJ_CATEGORIES[cat].keys()):
+            sha.update("{}/{}\n".format(cat, reg).encode("utf8"))
+            for path in OBJ_CATEGORIES[cat][reg].mjcf_paths:
+                sha.update(
+                    "{}\n".format(os.path.relpath(path, BASE_ASSET_ZOO_PATH)).encode(
+                        "utf8"
+                    )
+                )
+    return sha.hexdigest()
+
+
+def get_distractor_key(
+    target_obj_name, unique_attr, reg, split, obj_registries, valid_categories
+):
+    """
+    Returns the distractor table key of a distractor query. The number of registries is part of the key
+    since it enters the split threshold
+    """
+    return (
+        target_obj_name,
+        unique_attr,
+        reg,
+        split,
+        len(obj_registries),
+        tuple(valid_categories),
+    )
+
+
+def rank_distractors(
+    target_obj_name, unique_attr, reg, split, obj_registries, valid_categories
+):
+    """
+    Ranks the models of registry @reg in @valid_categories by similarity to @target_obj_name, excluding
+    the ones sharing its @unique_attr attribute
+
+    Returns:
+        list: paths of the DISTRACTOR_TOP_K top ranked models
+    """
+    all_obj_infos = get_obj_infos()
+    obj_name_list, classname2idx, ori_rank = get_rank_data()
+
+    tmp_choices = []
+    for cate in valid_categories:
+        if reg not in OBJ_CATEGORIES[cate]:
+            continue
+        tmp_choices.extend(
+            _split_mjcf_paths(
+                OBJ_CATEGORIES[cate][reg].mjcf_paths, split, len(obj_registries)
             )
-            * scale
         )
-        valid_object_sampled = True
-        for i in range(3):
-            if max_size[i] is not None and obj_size[i] > max_size[i]:
-                valid_object_sampled = False    
+    choice_map = {}
+    for path in tmp_choices:
+        source = path.split("/")[-4]
+        id = path.split("/")[-2]
+        obj_name = f"{source}_{id}"
+        choice_map[obj_name] = path
+    target_obj_info = all_obj_infos["obj_infos"][target_obj_name]
+    unique_attr2objs = all_obj_infos[f"{unique_attr}2objs"]
+    unique_attrs = target_obj_info[unique_attr]
+    if type(unique_attrs) != list:
+        unique_attrs = [unique_attrs]
+    for tmp_attr in unique_attrs:
+        for obj_name in unique_attr2objs[tmp_attr]:
+            if obj_name in choice_map:
+                del choice_map[obj_name]
+
+    # ori_rank (n_objs, n_objs, 5)
+    target_obj_ori_rank = ori_rank[classname2idx[target_obj_name]]
+    valid_obj_idx_list = []
+    for obj_name in choice_map.keys():
+        valid_obj_idx_list.append(classname2idx[obj_name])
+
+    tmp_rank = np.array(target_obj_ori_rank[valid_obj_idx_list], dtype=np.float32)
+    tmp_rank[:, ATTR2IDX[unique_attr]] *= -5
+
+    tmp_sum_rank = tmp_rank.sum(axis=-1)
+    tmp_rank_idx = tmp_sum_rank.argsort(axis=-1, kind="stable")
+    tmp_choices = [
+        obj_name_list[valid_obj_idx_list[x]] for x in tmp_rank_idx[:DISTRACTOR_TOP_K]
+    ]
+    return list(map(lambda x: choice_map[x], tmp_choices))
+
+
+def _get_registry_choices(cat, obj_registries, split, distractor_choices=None):
+    """
+    Returns the models that can be drawn from each registry once category @cat is chosen
+    """
+    choices = {reg: [] for reg in obj_registries}
+    for reg in obj_registries:
+        if reg not in OBJ_CATEGORIES[cat]:
+            continue
+        if distractor_choices is not None:
+            choices[reg] = distractor_choices[reg]
+        else:
+            choices[reg] = _split_mjcf_paths(
+                OBJ_CATEGORIES[cat][reg].mjcf_paths, split, len(choices)
+            )
+    return choices
+
+
+def _is_distractor_cfg(cfg):
+    return bool(cfg and cfg.get("target_obj_name", None) and "distr" in cfg["name"])
+
 
-    # print(info)
+def _get_object_candidates(
+    groups,
+    exclude_groups=None,
+    graspable=None,
+    washable=None,
+    microwavable=None,
+    cookable=None,
+    freezable=None,
+    obj_registries=("objaverse", "objaverse_extra", "aigen"),
+    split=None,
+    object_scale=None,
+    cfg=None,
+):
+    """
+    Enumerates all objects sample_kitchen_object_helper can draw for the given arguments
+
+    Returns:
+        list: (category, registry, mjcf path, probability) tuples
+    """
+    valid_categories = _get_valid_categories(
+        groups=groups,
+        exclude_groups=exclude_groups,
+        graspable=graspable,
+        washable=washable,
+        microwavable=microwavable,
+        cookable=cookable,
+        freezable=freezable,
+        obj_registries=obj_registries,
+    )
+    distractor_choices = None
+    if _is_distractor_cfg(cfg):
+        registries = [
+            reg
+            for reg in obj_registries
+            if any([reg in OBJ_CATEGORIES[cat] for cat in valid_categories])
+        ]
+        distractor_choices = _get_distractor_choices(
+            valid_categories, obj_registries, split, cfg, registries
+        )
+
+    candidates = []
+    for cat in valid_categories:
+        choices = _get_registry_choices(cat, obj_registries, split, distractor_choices)
+        num_choices = sum(len(choices[reg]) for reg in obj_registries)
+        if num_choices == 0:
+            continue
+        # category is drawn uniformly, then the registry proportionally to its number of models,
+        # then the model uniformly within the registry
+        prob = 1.0 / (len(valid_categories) * num_choices)
+        for reg in obj_registries:
+            for mjcf_path in choices[reg]:
+                candidates.append((cat, reg, mjcf_path, prob))
+    return candidates
+
+
+def _get_sampled_object(cat, chosen_reg, mjcf_path, groups, split, object_scale):
+    """
+    Builds the mjcf kwargs and info of a sampled object
+    """
+    mjcf_kwargs = OBJ_CATEGORIES[cat][chosen_reg].get_mjcf_kwargs()
+    mjcf_kwargs["mjcf_path"] = mjcf_path
+
+    if object_scale is not None:
+        mjcf_kwargs["scale"] *= object_scale
+
+    groups_containing_sampled_obj = list(CATEGORY_GROUPS[cat])
+
+    info = {
+        "groups_containing_sampled_obj": groups_containing_sampled_obj,
+        "groups": groups,
+        "cat": cat,
+        "split": split,
+        "mjcf_path": mjcf_path,
+    }
     return mjcf_kwargs, info
 
 
@@ -3082,7 +3519,6 @@ def sample_kitchen_object_helper(
         dict: info about the sampled object - the path of the mjcf, groups which the object's category belongs to, the category of the object
               the sampling split the object came from, and the groups the object was sampled from
     """
-    # obj_registries=("objaverse",)   # !!!!
     if cfg and cfg.get('info', None):
         ori_info = cfg['info']
         cat = ori_info['cat']
@@ -3105,203 +3541,57 @@ def sample_kitchen_object_helper(
     if isinstance(groups, str) and groups.endswith(".xml"):
         mjcf_path = groups
         # reverse look up mjcf_path to category
-        mjcf_kwargs = dict()
         cat = None
-        obj_found = False
+        chosen_reg = None
         for cand_cat in OBJ_CATEGORIES:
             for reg in obj_registries:
                 if (
                     reg in OBJ_CATEGORIES[cand_cat]
                     and mjcf_path in OBJ_CATEGORIES[cand_cat][reg].mjcf_paths
                 ):
-                    mjcf_kwargs = OBJ_CATEGORIES[cand_cat][reg].get_mjcf_kwargs()
                     cat = cand_cat
-                    obj_found = True
+                    chosen_reg = reg
                     break
-            if obj_found:
+            if cat is not None:
                 break
-        if obj_found is False:
+        if cat is None:
             raise ValueError
-        mjcf_kwargs["mjcf_path"] = mjcf_path
     else:
-        if not isinstance(groups, tuple) and not isinstance(groups, list):
-            groups = [groups]
-
-        if exclude_groups is None:
-            exclude_groups = []
-        if not isinstance(exclude_groups, tuple) and not isinstance(
-            exclude_groups, list
-        ):
-            exclude_groups = [exclude_groups]
-
-        invalid_categories = []
-        for g in exclude_groups:
-            for cat in OBJ_GROUPS[g]:
-                invalid_categories.append(cat)
-
-        valid_categories = []
-        for g in groups:
-            for cat in OBJ_GROUPS[g]:
-                # don't repeat if already added
-                if cat in valid_categories:
-                    continue
-                if cat in invalid_categories:
-                    continue
-
-                # don't include if category not represented in any registry
-                cat_in_any_reg = np.any(
-                    [reg in OBJ_CATEGORIES[cat] for reg in obj_registries]
-                )
-                if not cat_in_any_reg:
-                    continue
-
-                invalid = False
-                for reg in obj_registries:
-                    if reg not in OBJ_CATEGORIES[cat]:
-                        continue
-                    cat_meta = OBJ_CATEGORIES[cat][reg]
-                    if graspable is True and cat_meta.graspable is not True:
-                        invalid = True
-                    if washable is True and cat_meta.washable is not True:
-                        invalid = True
-                    if microwavable is True and cat_meta.microwavable is not True:
-                        invalid = True
-                    if cookable is True and cat_meta.cookable is not True:
-                        invalid = True
-                    if freezable is True and cat_meta.freezable is not True:
-                        invalid = True
-
-                if invalid:
-                    continue
-
-                valid_categories.append(cat)
+        groups = _as_list(groups)
+        valid_categories = _get_valid_categories(
+            groups=groups,
+            exclude_groups=exclude_groups,
+            graspable=graspable,
+            washable=washable,
+            microwavable=microwavable,
+            cookable=cookable,
+            freezable=freezable,
+            obj_registries=obj_registries,
+        )
 
         cat = rng.choice(valid_categories)
-                
-        
-        choices = {reg: [] for reg in obj_registries}
-        
-        # !!!
-        if cfg and cfg.get('target_obj_name', None) and "distr" in cfg["name"]:
-            target_obj_name = cfg['target_obj_name']
-            unique_attr = cfg['unique_attr']
-            for reg in obj_registries:
-                # breakpoint()
-                if reg not in OBJ_CATEGORIES[cat]:
-                    choices[reg] = []
-                    continue
-                tmp_choices = []
-                for cate in valid_categories:
-                    if reg not in OBJ_CATEGORIES[cate]:
-                        continue
-                    reg_choices = deepcopy(OBJ_CATEGORIES[cate][reg].mjcf_paths)
-                    if split is not None:
-                        split_th = max(len(choices) - 3, int(math.ceil(len(reg_choices) / 4 * 3)))
-                        if split == "A":
-                            reg_choices = reg_choices[:split_th]
-                        elif split == "B":
-                            reg_choices = reg_choices[split_th:]
-                        else:
-                            raise ValueError
-                    tmp_choices.extend(reg_choices)
-                    # breakpoint()
-                choice_map = {}
-                for path in tmp_choices:
-                    source = path.split('/')[-4]
-                    id = path.split('/')[-2]
-                    obj_name = f"{source}_{id}"
-                    # choice_map[path.split('/')[-2]] = path
-                    choice_map[obj_name] = path
-                # breakpoint()
-                target_obj_info = ALL_OBJ_INFOS['obj_infos'][target_obj_name]
-                unique_attr2objs = ALL_OBJ_INFOS[f"{unique_attr}2objs"]
-                unique_attrs = target_obj_info[unique_attr]
-                if type(unique_attrs) != list:
-                    unique_attrs = [unique_attrs]
-                for tmp_attr in unique_attrs:
-                    for obj_name in unique_attr2objs[tmp_attr]:
-                        if obj_name in choice_map:
-                            del choice_map[obj_name]
-                
-                # ORI_RANK (n_objs, n_objs, 5)
-                target_obj_ori_rank = ORI_RANK[CLASSNAME2IDX[target_obj_name]]
-                valid_obj_idx_list = []
-                for obj_name in choice_map.keys():
-                    valid_obj_idx_list.append(CLASSNAME2IDX[obj_name])
-                # breakpoint()
-                
-                # target_obj_sim = OBJ_SIM_MATRIX[CLASSNAME2IDX[target_obj_name]]
-                # target_obj_sim[:, ATTR2IDX[unique_attr]] = 1 - target_obj_sim[:, ATTR2IDX[unique_attr]]
-                # OBJ_SIM_MATRIX
-                
-                # attr_list = ['class', 'color', 'shape', 'material']
-                # attr_list.remove(unique_attr)
-                # remained_attr_idx_list = [ATTR2IDX[attr] for attr in attr_list]
-                # tmp_rank = target_obj_ori_rank[valid_obj_idx_list][:, remained_attr_idx_list]
-                
-                tmp_rank = target_obj_ori_rank[valid_obj_idx_list].to(torch.float32)
-                tmp_rank[:, ATTR2IDX[unique_attr]] *= -5
-                # tmp_rank[:, ATTR2IDX[unique_attr]].clamp_min(-50)
-                
-                tmp_sum_rank = tmp_rank.sum(dim=-1)
-                tmp_rank_idx = tmp_sum_rank.argsort(dim=-1)
-                tmp_choices = [OBJ_NAME_LIST[valid_obj_idx_list[x]] for x in tmp_rank_idx[:30]]
-                # print(f"{reg}: {len(valid_obj_idx_list)}")
-                choices[reg] = list(map(lambda x: choice_map[x], tmp_choices))
-                # ct = defaultdict(int)
-                # for attr in attr_list:
-                #     tmp_attrs = target_obj_info[attr]
-                #     if type(tmp_attrs) != list:
-                #         tmp_attrs = [tmp_attrs]
-                #     attr2objs = ALL_OBJ_INFOS[f"{attr}2objs"]
-                #     for tmp_attr in tmp_attrs:
-                #         for obj_name in attr2objs[tmp_attr]:
-                #             if obj_name in choice_map:
-                #                 ct[obj_name] += 1
-                # tmp_choices = sorted(ct.items(), key = lambda item: item[1])[-10:]
-                # choices[reg] = list(map(lambda x: choice_map[x[0]], tmp_choices))
-        else:
-            for reg in obj_registries:
-                if reg not in OBJ_CATEGORIES[cat]:
-                    choices[reg] = []
-                    continue
-                reg_choices = deepcopy(OBJ_CATEGORIES[cat][reg].mjcf_paths)
-                if split is not None:
-                    split_th = max(len(choices) - 3, int(math.ceil(len(reg_choices) / 4 * 3)))
-                    if split == "A":
-                        reg_choices = reg_choices[:split_th]
-                    elif split == "B":
-                        reg_choices = reg_choices[split_th:]
-                    else:
-                        raise ValueError
-                choices[reg] = reg_choices
-        
+
+        distractor_choices = None
+        if _is_distractor_cfg(cfg):
+            registries = [reg for reg in obj_registries if reg in OBJ_CATEGORIES[cat]]
+            distractor_choices = _get_distractor_choices(
+                valid_categories, obj_registries, split, cfg, registries
+            )
+        choices = _get_registry_choices(cat, obj_registries, split, distractor_choices)
+
         chosen_reg = rng.choice(
             obj_registries,
             p=np.array([len(choices[reg]) for reg in obj_registries])
             / sum(len(choices[reg]) for reg in obj_registries),
         )
-            
-        mjcf_path = rng.choice(choices[chosen_reg])
-        mjcf_kwargs = OBJ_CATEGORIES[cat][chosen_reg].get_mjcf_kwargs()
-        mjcf_kwargs["mjcf_path"] = mjcf_path
-
-    if object_scale is not None:
-        mjcf_kwargs["scale"] *= object_scale
-        
-    groups_containing_sampled_obj = []
-    for group, group_cats in OBJ_GROUPS.items():
-        if cat in group_cats:
-            groups_containing_sampled_obj.append(group)
 
-    info = {
-        "groups_containing_sampled_obj": groups_containing_sampled_obj,
-        "groups": groups,
-        "cat": cat,
-        "split": split,
-        "mjcf_path": mjcf_path,
-    }
-
-    # print(mjcf_path)
+        mjcf_path = rng.choice(choices[chosen_reg])
 
-    return mjcf_kwargs, info
+    return _get_sampled_object(
+        cat=cat,
+        chosen_reg=chosen_reg,
+        mjcf_path=mjcf_path,
+        groups=groups,
+        split=split,
+        object_scale=object_scale,
+    )
@@ -0,0 +1,211 @@
+"""
+Lazily loaded object attribute data used to sample attribute-based distractors: per-object attribute
+infos (all_infos.json) and the pairwise attribute rank matrix. Nothing is read until a distractor is
+sampled, so workers that never sample distractors do not pay for it.
+
+The data folder is looked up in the ROBOCASA_OBJ_ATTRIBUTES_DIR environment variable, then in
+macros.OBJ_ATTRIBUTES_DIR, and defaults to the repository root (where all_infos.json ships). It should
+contain:
+
+    all_infos.json      per-object attribute infos and <attr>2objs maps
+    obj_name_list.json  object names, in rank matrix order
+    ori_rank.npy        (n_objs, n_objs, n_attrs) rank matrix, memory-mapped so that forked workers share it
+
+obj_name_list.json and ori_rank.npy can be created from a torch rank_info.pt file with
+robocasa/scripts/convert_rank_info.py. Ranked distractor candidates can be precomputed into
+distractor_tables.pkl in the same folder with robocasa/scripts/build_distractor_tables.py.
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+import robocasa.macros as macros
+
+DEFAULT_ATTRIBUTES_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..")
+)
+
+_OBJ_INFOS = None
+_RANK_DATA = None
+
+
+def get_attributes_dir():
+    """
+    Returns:
+        str: folder containing the object attribute data
+    """
+    return (
+        os.environ.get("ROBOCASA_OBJ_ATTRIBUTES_DIR", None)
+        or macros.OBJ_ATTRIBUTES_DIR
+        or DEFAULT_ATTRIBUTES_DIR
+    )
+
+
+def _get_path(fname):
+    path = os.path.join(get_attributes_dir(), fname)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            "Object attribute data {} not found. Set macros.OBJ_ATTRIBUTES_DIR or the "
+            "ROBOCASA_OBJ_ATTRIBUTES_DIR environment variable to the folder containing it".format(
+                path
+            )
+        )
+    return path
+
+
+def get_obj_infos():
+    """
+    Returns:
+        dict: contents of all_infos.json, loaded on first call
+    """
+    global _OBJ_INFOS
+    if _OBJ_INFOS is None:
+        with open(_get_path("all_infos.json"), "r") as f:
+            _OBJ_INFOS = json.load(f)
+    return _OBJ_INFOS
+
+
+def get_rank_data():
+    """
+    Returns:
+        3-tuple:
+            - (list) object names, in rank matrix order
+            - (dict) maps object names to their row in the rank matrix
+            - (np.memmap) read-only (n_objs, n_objs, n_attrs) rank matrix
+    """
+    global _RANK_DATA
+    if _RANK_DATA is None:
+        with open(_get_path("obj_name_list.json"), "r") as f:
+            obj_name_list = json.load(f)
+        ori_rank = np.load(_get_path("ori_rank.npy"), mmap_mode="r")
+        classname2idx = {name: idx for (idx, name) in enumerate(obj_name_list)}
+        _RANK_DATA = (obj_name_list, classname2idx, ori_rank)
+    return _RANK_DATA
+
+
+# files the distractor tables are derived from. A saved table is ignored if any of them changed
+DISTRACTOR_TABLE_SOURCES = ("all_infos.json", "obj_name_list.json", "ori_rank.npy")
+
+
+class DistractorTable:
+    """
+    Cache of ranked distractor candidates. Maps a (target_obj_name, unique_attr, registry, split,
+    num_registries, categories) key to the model paths of the top ranked distractors, so that the ranking
+    is done once per distinct query instead of for every sampled distractor. Paths under @root are stored
+    relative to it.
+
+    Args:
+        root (str): folder model paths are made relative to
+
+        registry_hash (str): hash of the model paths of the object registries distractors are drawn from.
+            A saved table is ignored if it was built for different model paths
+    """
+
+    def __init__(self, root, registry_hash=None):
+        self.root = root
+        self.registry_hash = registry_hash
+        self.tables = dict()
+
+    def get(self, key):
+        """
+        Returns:
+            list or None: model paths for @key, or None if not cached
+        """
+        rel_paths = self.tables.get(key, None)
+        if rel_paths is None:
+            return None
+        return [os.path.join(self.root, p) for p in rel_paths]
+
+    def set(self, key, mjcf_paths):
+        """
+        Caches the model paths for @key
+        """
+        self.tables[key] = [
+            os.path.relpath(p, self.root) if p.startswith(self.root + os.sep) else p
+            for p in mjcf_paths
+        ]
+
+    def __len__(self):
+        return len(self.tables)
+
+    def save(self, path):
+        """
+        Pickles the table together with the modification times of its source files and the registry hash
+        """
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                dict(
+                    source_mtimes=get_source_mtimes(),
+                    registry_hash=self.registry_hash,
+                    tables=self.tables,
+                ),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Loads cached entries saved with save(), unless the attribute files or the model paths of the
+        object registries changed since
+
+        Returns:
+            bool: True if entries were loaded
+        """
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data["source_mtimes"] != get_source_mtimes():
+            return False
+        if data.get("registry_hash", None) != self.registry_hash:
+            return False
+        self.tables.update(data["tables"])
+        return True
+
+
+def get_source_mtimes():
+    """
+    Returns:
+        dict: modification times of the attribute files, None for missing files
+    """
+    mtimes = dict()
+    for fname in DISTRACTOR_TABLE_SOURCES:
+        path = os.path.join(get_attributes_dir(), fname)
+        mtimes[fname] = os.path.getmtime(path) if os.path.exists(path) else None
+    return mtimes
+
+
+def get_distractor_table_path():
+    """
+    Returns:
+        str: path of the precomputed distractor table
+    """
+    return os.path.join(get_attributes_dir(), "distractor_tables.pkl")
+
+
+_DISTRACTOR_TABLE = None
+
+
+def get_distractor_table(root, registry_hash=None):
+    """
+    Returns the process-wide distractor table, loading precomputed entries (written by
+    robocasa/scripts/build_distractor_tables.py) on first call if they are up to date
+
+    Args:
+        root (str): folder model paths are made relative to
+
+        registry_hash (str): hash of the model paths of the object registries, see DistractorTable
+
+    Returns:
+        DistractorTable: distractor table
+    """
+    global _DISTRACTOR_TABLE
+    if _DISTRACTOR_TABLE is None:
+        _DISTRACTOR_TABLE = DistractorTable(root=root, registry_hash=registry_hash)
+        path = get_distractor_table_path()
+        if os.path.exists(path):
+            _DISTRACTOR_TABLE.load(path)
+    return _DISTRACTOR_TABLE
@@ -0,0 +1,322 @@
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from robosuite.utils.mjcf_utils import find_elements, string_to_array
+
+import robocasa.macros as macros
+from robocasa.models import assets_root
+
+OBJECTS_ROOT = os.path.join(assets_root, "objects")
+
+DEFAULT_TABLE_PATH = os.path.join(OBJECTS_ROOT, "geometry_table.npz")
+
+# sites read from every object model, in table column order
+GEOMETRY_SITES = ("bottom_site", "top_site", "horizontal_radius_site")
+
+
+def read_object_sites(mjcf_path):
+    """
+    Parses an object model and reads the positions of its bottom, top and horizontal radius sites
+
+    Args:
+        mjcf_path (str): path to the model.xml of the object
+
+    Returns:
+        np.array: (3, 3) array with the (unscaled) bottom, top and horizontal radius site positions
+    """
+    root = ET.parse(mjcf_path).getroot()
+    return np.array(
+        [
+            string_to_array(
+                find_elements(root=root, tags="site", attribs={"name": site}).get("pos")
+            )
+            for site in GEOMETRY_SITES
+        ]
+    )
+
+
+class ObjectGeometryTable:
+    """
+    Compact table of the geometry of the object models under assets/objects, so that size checks and
+    bounding box math do not need to parse model XMLs. Rows are indexed by a path id. Paths under the
+    objects root are stored relative to it, so the table stays valid if the assets are moved. The
+    modification time of each model is stored too, so that models edited after the table was saved are
+    read again when it is loaded.
+
+    Attributes:
+        paths (list): model paths, one per row
+
+        sites (np.array): (N, 3, 3) array of bottom, top and horizontal radius site positions
+
+        registry_ids (np.array): (N,) index into registry_names of the registry folder of each row
+            (e.g. objaverse, aigen_objs)
+
+        category_ids (np.array): (N,) index into category_names of the category folder of each row
+
+        mtimes (np.array): (N,) modification time of the model of each row when it was read
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.path_to_id = dict()
+        self.registry_names = []
+        self.category_names = []
+        # rows are stored in arrays with spare capacity, which is doubled when full
+        self._sites = np.zeros((0, 3, 3))
+        self._registry_ids = np.zeros(0, dtype=np.int32)
+        self._category_ids = np.zeros(0, dtype=np.int32)
+        self._mtimes = np.zeros(0)
+
+    @property
+    def sites(self):
+        return self._sites[: len(self.paths)]
+
+    @property
+    def registry_ids(self):
+        return self._registry_ids[: len(self.paths)]
+
+    @property
+    def category_ids(self):
+        return self._category_ids[: len(self.paths)]
+
+    @property
+    def mtimes(self):
+        return self._mtimes[: len(self.paths)]
+
+    @staticmethod
+    def _get_key(mjcf_path):
+        mjcf_path = os.path.abspath(mjcf_path)
+        if mjcf_path.startswith(OBJECTS_ROOT + os.sep):
+            return os.path.relpath(mjcf_path, OBJECTS_ROOT)
+        return mjcf_path
+
+    @staticmethod
+    def _get_path(key):
+        return os.path.join(OBJECTS_ROOT, key)
+
+    @staticmethod
+    def _get_registry_and_category(key):
+        # models are laid out as <registry>/<category>/<model>/model.xml
+        parts = key.split(os.sep)
+        if len(parts) < 4:
+            return "", ""
+        return parts[-4], parts[-3]
+
+    @classmethod
+    def build(cls, root=OBJECTS_ROOT):
+        """
+        Scans all model.xml files under @root and reads their geometry
+
+        Args:
+            root (str): folder to scan
+
+        Returns:
+            ObjectGeometryTable: table with one row per model
+        """
+        paths = []
+        for folder, _, files in os.walk(root):
+            if "model.xml" in files:
+                paths.append(os.path.join(folder, "model.xml"))
+        paths = sorted(paths)
+
+        table = cls()
+        for path in paths:
+            table.add(path)
+        return table
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a table saved with save(). Models that were modified since they were read (or all models,
+        for tables saved without modification times) are read again
+
+        Args:
+            path (str): path to the .npz file
+
+        Returns:
+            ObjectGeometryTable: loaded table
+        """
+        data = np.load(path, allow_pickle=False)
+        table = cls()
+        table.paths = [str(p) for p in data["paths"]]
+        table.path_to_id = {p: i for (i, p) in enumerate(table.paths)}
+        table._sites = np.array(data["sites"], dtype=np.float64).reshape(-1, 3, 3)
+        table.registry_names = [str(n) for n in data["registry_names"]]
+        table._registry_ids = np.array(data["registry_ids"], dtype=np.int32)
+        table.category_names = [str(n) for n in data["category_names"]]
+        table._category_ids = np.array(data["category_ids"], dtype=np.int32)
+        if "mtimes" in data.files:
+            table._mtimes = np.array(data["mtimes"], dtype=np.float64)
+        else:
+            table._mtimes = np.full(len(table.paths), np.nan)
+
+        for (i, key) in enumerate(table.paths):
+            mjcf_path = table._get_path(key)
+            if not os.path.exists(mjcf_path):
+                continue
+            if os.path.getmtime(mjcf_path) != table._mtimes[i]:
+                table._read_row(i, mjcf_path)
+        return table
+
+    def save(self, path):
+        """
+        Saves the table as a .npz file
+
+        Args:
+            path (str): path to write to
+        """
+        tmp_path = "{}.{}.tmp.npz".format(os.path.splitext(path)[0], os.getpid())
+        np.savez(
+            tmp_path,
+            paths=np.array(self.paths),
+            sites=self.sites,
+            registry_names=np.array(self.registry_names),
+            registry_ids=self.registry_ids,
+            category_names=np.array(self.category_names),
+            category_ids=self.category_ids,
+            mtimes=self.mtimes,
+        )
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _reserve(self, num_rows):
+        capacity = len(self._sites)
+        if num_rows <= capacity:
+            return
+        capacity = max(num_rows, 2 * capacity, 64)
+        for attr in ("_sites", "_registry_ids", "_category_ids", "_mtimes"):
+            old = getattr(self, attr)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, attr, new)
+
+    def _read_row(self, i, mjcf_path):
+        self._mtimes[i] = os.path.getmtime(mjcf_path)
+        self._sites[i] = read_object_sites(mjcf_path)
+
+    def add(self, mjcf_path):
+        """
+        Reads the geometry of a model and adds it to the table, if it is not already present
+
+        Args:
+            mjcf_path (str): path to the model.xml of the object
+
+        Returns:
+            int: path id of the model
+        """
+        key = self._get_key(mjcf_path)
+        if key in self.path_to_id:
+            return self.path_to_id[key]
+
+        registry, category = self._get_registry_and_category(key)
+        if registry not in self.registry_names:
+            self.registry_names.append(registry)
+        if category not in self.category_names:
+            self.category_names.append(category)
+
+        i = len(self.paths)
+        self._reserve(i + 1)
+        self._read_row(i, mjcf_path)
+        self._registry_ids[i] = self.registry_names.index(registry)
+        self._category_ids[i] = self.category_names.index(category)
+        self.path_to_id[key] = i
+        self.paths.append(key)
+        return i
+
+    def get_ids(self, mjcf_paths):
+        """
+        Looks up the path ids of models, reading the models missing from the table
+
+        Args:
+            mjcf_paths (str or list): path(s) to model.xml files
+
+        Returns:
+            int or np.array: path id(s)
+        """
+        if isinstance(mjcf_paths, str):
+            key = self._get_key(mjcf_paths)
+            if key in self.path_to_id:
+                return self.path_to_id[key]
+            return self.add(mjcf_paths)
+        return np.array([self.get_ids(p) for p in mjcf_paths], dtype=np.int64)
+
+    def get_sizes(self, ids, scale=1.0):
+        """
+        Computes the (x, y, z) extents of models, as used for max_size checks
+
+        Args:
+            ids (int or np.array): path id(s)
+
+            scale (float or 3-array or np.array): model scale(s), broadcast against the ids
+
+        Returns:
+            np.array: (3,) or (N, 3) array of sizes
+        """
+        sites = self.sites[ids]
+        bottom, top, radius = sites[..., 0, :], sites[..., 1, :], sites[..., 2, :]
+        sizes = np.stack(
+            [radius[..., 0] * 2, radius[..., 1] * 2, top[..., 2] - bottom[..., 2]],
+            axis=-1,
+        )
+        return sizes * scale
+
+    def get_bbox_offsets(self, ids, scale=1.0):
+        """
+        Computes the 8 bounding box points of models relative to their frame, in the same order as
+        MJCFObject.get_bbox_points
+
+        Args:
+            ids (int or np.array): path id(s)
+
+            scale (float or 3-array): model scale
+
+        Returns:
+            np.array: (8, 3) or (N, 8, 3) array of points
+        """
+        scale = np.asarray(scale, dtype=np.float64)
+        if scale.ndim == 0:
+            scale = np.full(3, scale)
+        sites = self.sites[ids] * scale[..., None, :]
+        bottom, top, radius = sites[..., 0, :], sites[..., 1, :], sites[..., 2, :]
+        center = (bottom + top) / 2
+        half_size = np.stack(
+            [radius[..., 0], radius[..., 1], top[..., 2] - center[..., 2]], axis=-1
+        )
+        signs = np.array(
+            [
+                [-1, -1, -1],
+                [1, -1, -1],
+                [-1, 1, -1],
+                [-1, -1, 1],
+                [1, 1, 1],
+                [-1, 1, 1],
+                [1, -1, 1],
+                [1, 1, -1],
+            ]
+        )
+        return center[..., None, :] + half_size[..., None, :] * signs
+
+
+_GEOMETRY_TABLE = None
+
+
+def get_object_geometry_table():
+    """
+    Returns the process-wide object geometry table. It is loaded from macros.OBJECT_GEOMETRY_TABLE_PATH
+    (or assets/objects/geometry_table.npz) if present, otherwise it starts empty and each model is read
+    the first time it is looked up. Build the file with robocasa/scripts/build_object_geometry.py.
+
+    Returns:
+        ObjectGeometryTable: geometry table
+    """
+    global _GEOMETRY_TABLE
+    if _GEOMETRY_TABLE is None:
+        path = macros.OBJECT_GEOMETRY_TABLE_PATH or DEFAULT_TABLE_PATH
+        if os.path.exists(path):
+            _GEOMETRY_TABLE = ObjectGeometryTable.load(path)
+        else:
+            _GEOMETRY_TABLE = ObjectGeometryTable()
+    return _GEOMETRY_TABLE
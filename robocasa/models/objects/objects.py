@@ -1,12 +1,183 @@
 import os
-import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from copy import deepcopy
 
 import numpy as np
 import robosuite
 import robosuite.utils.transform_utils as T
 from robosuite.models.objects import MujocoXMLObject
-from robosuite.utils.mjcf_utils import array_to_string, string_to_array
+from robosuite.utils.mjcf_utils import array_to_string
+
+import robocasa.macros as macros
+from robocasa.models.objects.object_geometry import get_object_geometry_table
+
+
+class InMemoryXMLFile(str):
+    """
+    Path of an xml file whose (possibly modified) contents are held in memory. robosuite's MujocoXML only
+    accepts a file name: it uses the path to resolve relative asset paths and hands it to ET.parse. Since
+    ET.parse reads from any object with a read() method, passing this instead makes robosuite parse the
+    in-memory contents without anything being written to disk.
+
+    Args:
+        path (str): path of the file the contents belong to
+
+        xml_str (str): xml contents
+    """
+
+    def __new__(cls, path, xml_str):
+        obj = super().__new__(cls, path)
+        obj._data = xml_str.encode("utf8")
+        obj._offset = 0
+        return obj
+
+    def __getnewargs__(self):
+        # keep the in-memory contents when copied or pickled
+        return (str(self), self._data.decode("utf8"))
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self._data) - self._offset
+        chunk = self._data[self._offset : self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+
+def _replace_name_prefix(value, old_prefix, new_prefix, visited):
+    """
+    Recursively replaces @old_prefix by @new_prefix at the start of every string held in @value, including
+    the attributes of xml elements. Containers and elements are modified in place where possible
+
+    Returns:
+        object: @value with the prefix replaced
+    """
+    if type(value) is str:
+        if value.startswith(old_prefix):
+            return new_prefix + value[len(old_prefix) :]
+        return value
+    if isinstance(value, (str, bytes, int, float, np.ndarray)) or value is None:
+        return value
+    if id(value) in visited:
+        return value
+    visited.add(id(value))
+
+    if isinstance(value, ET.ElementTree):
+        _replace_name_prefix(value.getroot(), old_prefix, new_prefix, visited)
+    elif isinstance(value, ET.Element):
+        for elem in value.iter():
+            for (k, v) in list(elem.attrib.items()):
+                if v.startswith(old_prefix):
+                    elem.set(k, new_prefix + v[len(old_prefix) :])
+    elif isinstance(value, list):
+        value[:] = [
+            _replace_name_prefix(v, old_prefix, new_prefix, visited) for v in value
+        ]
+    elif isinstance(value, tuple):
+        return type(value)(
+            [_replace_name_prefix(v, old_prefix, new_prefix, visited) for v in value]
+        )
+    elif isinstance(value, dict):
+        items = [
+            (
+                _replace_name_prefix(k, old_prefix, new_prefix, visited),
+                _replace_name_prefix(v, old_prefix, new_prefix, visited),
+            )
+            for (k, v) in value.items()
+        ]
+        value.clear()
+        value.update(items)
+    elif isinstance(value, set):
+        items = [
+            _replace_name_prefix(v, old_prefix, new_prefix, visited) for v in value
+        ]
+        value.clear()
+        value.update(items)
+    return value
+
+
+class ObjectTemplateCache:
+    """
+    LRU cache of fully processed (parsed, post-processed, scaled, geom attributes applied and name
+    prefixed) MJCFObject states. Templates are built under a placeholder name. A new object with the
+    same model and physical parameters is a deep copy of the template with the placeholder prefix
+    replaced by the object's prefix, skipping parsing and scaling.
+
+    Args:
+        max_entries (int): maximum number of templates to keep. None keeps every template
+    """
+
+    # name the templates are built with. Its prefix is replaced by the name of each object cloned from them
+    TEMPLATE_NAME = "_mjcf_template"
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self._templates = OrderedDict()
+        self._nbytes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns:
+            MJCFObject or None: template for @key, or None if not cached
+        """
+        template = self._templates.get(key, None)
+        if template is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._templates.move_to_end(key)
+        return template
+
+    def add(self, key, template):
+        """
+        Caches @template under @key, evicting the least recently used templates if needed
+        """
+        self._templates[key] = template
+        # estimate memory use by the size of the serialized model
+        self._nbytes[key] = len(ET.tostring(template.root)) + len(
+            ET.tostring(template.get_obj())
+        )
+        if self.max_entries is not None:
+            while len(self._templates) > self.max_entries:
+                old_key, _ = self._templates.popitem(last=False)
+                self._nbytes.pop(old_key)
+
+    def clear(self):
+        """
+        Removes all templates and resets the counters
+        """
+        self._templates.clear()
+        self._nbytes.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict: number of templates, hits, misses, hit rate and approximate memory use in bytes
+        """
+        num_queries = self.hits + self.misses
+        return dict(
+            entries=len(self._templates),
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / num_queries if num_queries > 0 else 0.0,
+            nbytes=sum(self._nbytes.values()),
+        )
+
+
+OBJECT_TEMPLATE_CACHE = ObjectTemplateCache(
+    max_entries=macros.OBJECT_TEMPLATE_CACHE_SIZE
+)
+
+
+def _to_key(value):
+    if value is None:
+        return None
+    return tuple(np.ravel(value).tolist())
 
 
 class MJCFObject(MujocoXMLObject):
@@ -14,6 +185,9 @@ class MJCFObject(MujocoXMLObject):
     Blender object with support for changing the scaling
     """
 
+    # maps (class, mjcf path) to the post-processed model xml, so that each asset is read at most once per process
+    _XML_CACHE = dict()
+
     def __init__(
         self,
         name,
@@ -37,6 +211,69 @@ class MJCFObject(MujocoXMLObject):
             raise Exception("got invalid scale: {}".format(scale))
         scale = np.array(scale)
 
+        build_kwargs = dict(
+            mjcf_path=mjcf_path,
+            scale=scale,
+            solimp=solimp,
+            solref=solref,
+            density=density,
+            friction=friction,
+            margin=margin,
+            rgba=rgba,
+            priority=priority,
+        )
+        if not macros.CACHE_OBJECT_TEMPLATES:
+            self._build(name=name, **build_kwargs)
+            return
+
+        key = (
+            type(self),
+            mjcf_path,
+            _to_key(scale),
+            _to_key(solimp),
+            _to_key(solref),
+            density,
+            _to_key(friction),
+            margin,
+            _to_key(rgba),
+            priority,
+        )
+        template = OBJECT_TEMPLATE_CACHE.get(key)
+        if template is None:
+            template = type(self).__new__(type(self))
+            template._build(name=ObjectTemplateCache.TEMPLATE_NAME, **build_kwargs)
+            OBJECT_TEMPLATE_CACHE.add(key, template)
+
+        # clone the template, sharing the read-only geometry table and in-memory xml, and rename it
+        memo = {id(template._geometry_table): template._geometry_table}
+        if hasattr(template, "file"):
+            memo[id(template.file)] = template.file
+        state = deepcopy(template.__dict__, memo)
+        state = _replace_name_prefix(
+            state,
+            old_prefix=ObjectTemplateCache.TEMPLATE_NAME + "_",
+            new_prefix="{}_".format(name),
+            visited=set(),
+        )
+        self.__dict__.update(state)
+        self._name = name
+
+    def _build(
+        self,
+        name,
+        mjcf_path,
+        scale,
+        solimp,
+        solref,
+        density,
+        friction,
+        margin,
+        rgba,
+        priority,
+    ):
+        """
+        Builds the object from its model xml. See __init__ for the arguments
+        """
         self.solimp = solimp
         self.solref = solref
         self.density = density
@@ -47,24 +284,19 @@ class MJCFObject(MujocoXMLObject):
 
         self.rgba = rgba
 
-        # read default xml
-        xml_path = mjcf_path
-        folder = os.path.dirname(xml_path)
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-
-        # write modified xml (and make sure to postprocess any paths just in case)
-        xml_str = ET.tostring(root, encoding="utf8").decode("utf8")
-        xml_str = self.postprocess_model_xml(xml_str)
-        time_str = str(time.time()).replace(".", "_")
-        new_xml_path = os.path.join(folder, "{}_{}.xml".format(time_str, os.getpid()))
-        f = open(new_xml_path, "w")
-        f.write(xml_str)
-        f.close()
-
-        # initialize object with new xml we wrote
+        # geometry (bottom, top and horizontal radius sites) is looked up in the geometry table instead of
+        # the xml. robosuite scales site positions elementwise, so scaled values are exact
+        self._geometry_table = get_object_geometry_table()
+        self._geometry_id = self._geometry_table.get_ids(mjcf_path)
+        self._geometry_scale = scale
+        self._bbox_offsets = self._geometry_table.get_bbox_offsets(
+            self._geometry_id, scale=scale
+        )
+
+        # initialize object from the post-processed xml, kept in memory. The path is still the asset's so
+        # that relative mesh and texture paths resolve against its folder
         super().__init__(
-            fname=new_xml_path,
+            fname=InMemoryXMLFile(mjcf_path, self._get_model_xml(mjcf_path)),
             name=name,
             joints=[dict(type="free", damping="0.0005")],
             obj_type="all",
@@ -72,9 +304,29 @@ class MJCFObject(MujocoXMLObject):
             scale=scale,
         )
 
-        # clean up xml - we don't need it anymore
-        if os.path.exists(new_xml_path):
-            os.remove(new_xml_path)
+    def _get_model_xml(self, mjcf_path):
+        """
+        Reads the model xml at @mjcf_path and post-processes its paths, going through the per-process cache
+
+        Args:
+            mjcf_path (str): path to the model xml
+
+        Returns:
+            str: post-processed xml
+        """
+        key = (type(self), mjcf_path)
+        if key not in MJCFObject._XML_CACHE:
+            root = ET.parse(mjcf_path).getroot()
+            xml_str = ET.tostring(root, encoding="utf8").decode("utf8")
+            MJCFObject._XML_CACHE[key] = self.postprocess_model_xml(xml_str)
+        return MJCFObject._XML_CACHE[key]
+
+    @classmethod
+    def clear_xml_cache(cls):
+        """
+        Clears the per-process cache of post-processed model xmls
+        """
+        MJCFObject._XML_CACHE.clear()
 
     def postprocess_model_xml(self, xml_str):
         """
@@ -145,12 +397,19 @@ class MJCFObject(MujocoXMLObject):
 
         return geom_pairs
 
+    @property
+    def bottom_offset(self):
+        return self._geometry_table.sites[self._geometry_id, 0] * self._geometry_scale
+
+    @property
+    def top_offset(self):
+        return self._geometry_table.sites[self._geometry_id, 1] * self._geometry_scale
+
     @property
     def horizontal_radius(self):
-        horizontal_radius_site = self.worldbody.find(
-            "./body/site[@name='{}horizontal_radius_site']".format(self.naming_prefix)
+        site_values = (
+            self._geometry_table.sites[self._geometry_id, 2] * self._geometry_scale
         )
-        site_values = string_to_array(horizontal_radius_site.get("pos"))
         return np.linalg.norm(site_values[0:2])
 
     def get_bbox_points(self, trans=None, rot=None):
@@ -158,29 +417,6 @@ class MJCFObject(MujocoXMLObject):
         Get the full 8 bounding box points of the object
         rot: a rotation matrix
         """
-        bbox_offsets = []
-
-        bottom_offset = self.bottom_offset
-        top_offset = self.top_offset
-        horizontal_radius_site = self.worldbody.find(
-            "./body/site[@name='{}horizontal_radius_site']".format(self.naming_prefix)
-        )
-        horiz_radius = string_to_array(horizontal_radius_site.get("pos"))[:2]
-
-        center = np.mean([bottom_offset, top_offset], axis=0)
-        half_size = [horiz_radius[0], horiz_radius[1], top_offset[2] - center[2]]
-
-        bbox_offsets = [
-            center + half_size * np.array([-1, -1, -1]),  # p0
-            center + half_size * np.array([1, -1, -1]),  # px
-            center + half_size * np.array([-1, 1, -1]),  # py
-            center + half_size * np.array([-1, -1, 1]),  # pz
-            center + half_size * np.array([1, 1, 1]),
-            center + half_size * np.array([-1, 1, 1]),
-            center + half_size * np.array([1, -1, 1]),
-            center + half_size * np.array([1, 1, -1]),
-        ]
-
         if trans is None:
             trans = np.array([0, 0, 0])
         if rot is not None:
@@ -188,5 +424,5 @@ class MJCFObject(MujocoXMLObject):
         else:
             rot = np.eye(3)
 
-        points = [(np.matmul(rot, p) + trans) for p in bbox_offsets]
+        points = [(np.matmul(rot, p) + trans) for p in self._bbox_offsets]
         return points
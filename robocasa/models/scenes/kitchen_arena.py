@@ -2,7 +2,7 @@ from robosuite.models.arenas import Arena
 from robosuite.utils.mjcf_utils import xml_path_completion
 
 import robocasa
-from robocasa.models.scenes.scene_builder import create_fixtures
+from robocasa.models.scenes.scene_cache import get_fixtures
 
 
 # base class for kitchens
@@ -25,7 +25,7 @@ class KitchenArena(Arena):
                 "arenas/empty_kitchen_arena.xml", root=robocasa.models.assets_root
             )
         )
-        self.fixtures = create_fixtures(
+        self.fixtures = get_fixtures(
             layout_id=layout_id,
             style_id=style_id,
             rng=rng,
@@ -1,5 +1,4 @@
 import numpy as np
-import yaml
 from robosuite.utils.mjcf_utils import array_to_string as a2s
 from robosuite.utils.mjcf_utils import string_to_array as s2a
 
@@ -113,12 +112,10 @@ def create_fixtures(layout_id, style_id, rng=None):
     style_path = get_style_path(style_id=style_id)
 
     # load style
-    with open(style_path, "r") as f:
-        style = yaml.safe_load(f)
+    style = load_yaml(style_path)
 
     # load arena
-    with open(layout_path, "r") as f:
-        arena_config = yaml.safe_load(f)
+    arena_config = load_yaml(layout_path)
 
     # contains all fixtures with updated configs
     arena = list()
@@ -0,0 +1,192 @@
+import os
+import pickle
+from collections import OrderedDict
+from copy import deepcopy
+
+import numpy as np
+
+import robocasa.macros as macros
+from robocasa.models.scenes.scene_builder import create_fixtures
+from robocasa.models.scenes.scene_registry import get_layout_path, get_style_path
+
+
+class _RngPlaceholder:
+    """
+    Stand-in for the random number generator inside cached fixture trees. Fixtures keep a
+    reference to the generator they were built with, so it is swapped for this placeholder
+    when a tree is cached and swapped back for the caller's generator when the tree is reused.
+    """
+
+    def __reduce__(self):
+        # pickle by reference so that the placeholder identity survives the on-disk cache
+        return "_RNG_PLACEHOLDER"
+
+
+_RNG_PLACEHOLDER = _RngPlaceholder()
+
+
+class FixtureCache:
+    """
+    Process-local cache of fully built, position-resolved fixture trees. Building a kitchen
+    re-reads the layout and style yamls, instantiates every fixture (each parsing its own MJCF)
+    and re-applies group rotations, which dominates hard reset time. Since fixture construction
+    does not consume randomness, the result only depends on the (layout, style) pair and can be
+    reused across resets by deep copying a cached template.
+
+    Args:
+        max_entries (int): maximum number of (layout, style) trees to keep in memory. Least recently
+            used entries are evicted first. None keeps every entry
+
+        cache_dir (str): if specified, templates are additionally pickled to this directory so that
+            new processes can skip fixture construction as well
+    """
+
+    def __init__(self, max_entries=None, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._templates = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_fixtures(self, layout_id, style_id, rng=None):
+        """
+        Returns a fresh copy of the fixtures for a given layout and style, building them if necessary
+
+        Args:
+            layout_id (int or LayoutType): layout of the kitchen to load
+
+            style_id (int or StyleType): style of the kitchen to load
+
+            rng (np.random.Generator): random number generator attached to the returned fixtures
+
+        Returns:
+            dict: maps fixture names to fixture objects, as returned by create_fixtures
+        """
+        key = (int(layout_id), int(style_id))
+        if rng is None:
+            rng = np.random.default_rng()
+
+        template = self._templates.get(key, None)
+        if template is not None:
+            self.hits += 1
+            self._templates.move_to_end(key)
+        else:
+            template = self._load_from_disk(key)
+            if template is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                fixtures = create_fixtures(
+                    layout_id=layout_id, style_id=style_id, rng=rng
+                )
+                template = self._make_template(fixtures, rng)
+                self._save_to_disk(key, template)
+                self._add_template(key, template)
+                return fixtures
+            self._add_template(key, template)
+
+        return deepcopy(template, memo={id(_RNG_PLACEHOLDER): rng})
+
+    def clear(self):
+        """
+        Removes all in-memory templates and resets the counters
+        """
+        self._templates.clear()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict: number of cached entries, in-memory hits, on-disk hits and misses
+        """
+        return dict(
+            entries=len(self._templates),
+            hits=self.hits,
+            disk_hits=self.disk_hits,
+            misses=self.misses,
+        )
+
+    def _make_template(self, fixtures, rng):
+        return deepcopy(fixtures, memo={id(rng): _RNG_PLACEHOLDER})
+
+    def _add_template(self, key, template):
+        self._templates[key] = template
+        if self.max_entries is not None:
+            while len(self._templates) > self.max_entries:
+                self._templates.popitem(last=False)
+
+    def _get_disk_path(self, key):
+        return os.path.join(
+            self.cache_dir, "fixtures_layout{}_style{}.pkl".format(*key)
+        )
+
+    def _get_source_mtimes(self, key):
+        layout_id, style_id = key
+        return (
+            os.path.getmtime(get_layout_path(layout_id=layout_id)),
+            os.path.getmtime(get_style_path(style_id=style_id)),
+        )
+
+    def _load_from_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self._get_disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            # stale or partially written entry, rebuild it
+            return None
+        if data.get("mtimes") != self._get_source_mtimes(key):
+            return None
+        return data["fixtures"]
+
+    def _save_to_disk(self, key, template):
+        if self.cache_dir is None:
+            return
+        path = self._get_disk_path(key)
+        # write to a temporary file first so concurrent readers never see a partial entry
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    dict(mtimes=self._get_source_mtimes(key), fixtures=template),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            # the disk cache is only an optimization: failing to write an entry (e.g. unpicklable
+            # fixtures, full disk) must not fail loading the model
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+FIXTURE_CACHE = FixtureCache(
+    max_entries=macros.FIXTURE_CACHE_SIZE,
+    cache_dir=macros.FIXTURE_CACHE_DIR,
+)
+
+
+def get_fixtures(layout_id, style_id, rng=None):
+    """
+    Creates the fixtures for a kitchen, going through the process-wide fixture cache if
+    macros.CACHE_FIXTURES is set
+
+    Args:
+        layout_id (int or LayoutType): layout of the kitchen to load
+
+        style_id (int or StyleType): style of the kitchen to load
+
+        rng (np.random.Generator): random number generator used for initializing fixture state
+    """
+    if not macros.CACHE_FIXTURES:
+        return create_fixtures(layout_id=layout_id, style_id=style_id, rng=rng)
+    return FIXTURE_CACHE.get_fixtures(layout_id=layout_id, style_id=style_id, rng=rng)
@@ -1,9 +1,12 @@
+import os
+import pickle
 from collections import OrderedDict
 from copy import deepcopy
 import yaml
 from robosuite.utils.mjcf_utils import xml_path_completion
 
 import robocasa
+import robocasa.macros as macros
 
 # second keyword corresponds to positive end of axis
 AXES_KEYWORDS = {0: ["left", "right"], 1: ["front", "back"], 2: ["bottom", "top"]}
@@ -27,6 +30,93 @@ IGNORE_ARGS = [
 # arguments used to point to other fixtures
 ATTACH_ARGS = ["interior_obj", "stack_on", "attach_to"]
 
+# folders (relative to the assets root) holding the layout, style and fixture registry yamls
+YAML_REGISTRY_FOLDERS = [
+    "scenes/kitchen_layouts",
+    "scenes/kitchen_styles",
+    "fixtures/fixture_registry",
+]
+
+# parsed yaml files. maps path relative to the assets root to (mtime, parsed data)
+_YAML_CACHE = {}
+
+
+def _get_yaml_key(path):
+    return os.path.relpath(os.path.abspath(path), robocasa.models.assets_root)
+
+
+def load_yaml(path):
+    """
+    Loads a yaml file, parsing it at most once per process (or until the file changes on disk).
+    Callers receive their own copy of the data and are free to modify it.
+
+    Args:
+        path (str): path to the yaml file
+
+    Returns:
+        dict: parsed contents of the yaml file
+    """
+    key = _get_yaml_key(path)
+    mtime = os.path.getmtime(path)
+    entry = _YAML_CACHE.get(key, None)
+    if entry is None or entry[0] != mtime:
+        with open(path, "r") as f:
+            entry = (mtime, yaml.safe_load(f))
+        _YAML_CACHE[key] = entry
+    return deepcopy(entry[1])
+
+
+def save_yaml_snapshot(snapshot_path):
+    """
+    Parses every layout, style and fixture registry yaml and pickles the results, so that
+    new processes can skip yaml parsing entirely (see load_yaml_snapshot)
+
+    Args:
+        snapshot_path (str): path of the snapshot file to write
+
+    Returns:
+        int: number of yaml files in the snapshot
+    """
+    snapshot = {}
+    for folder in YAML_REGISTRY_FOLDERS:
+        folder_path = os.path.join(robocasa.models.assets_root, folder)
+        for fname in sorted(os.listdir(folder_path)):
+            if not fname.endswith(".yaml"):
+                continue
+            path = os.path.join(folder_path, fname)
+            with open(path, "r") as f:
+                snapshot[_get_yaml_key(path)] = (
+                    os.path.getmtime(path),
+                    yaml.safe_load(f),
+                )
+
+    with open(snapshot_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return len(snapshot)
+
+
+def load_yaml_snapshot(snapshot_path):
+    """
+    Populates the yaml cache from a snapshot written by save_yaml_snapshot. Entries whose
+    source file changed since the snapshot was taken are re-parsed on first use
+
+    Args:
+        snapshot_path (str): path of the snapshot file to read
+    """
+    with open(snapshot_path, "rb") as f:
+        _YAML_CACHE.update(pickle.load(f))
+
+
+def clear_yaml_cache():
+    """
+    Removes all parsed yaml files from the cache
+    """
+    _YAML_CACHE.clear()
+
+
+if macros.YAML_SNAPSHOT_PATH is not None and os.path.exists(macros.YAML_SNAPSHOT_PATH):
+    load_yaml_snapshot(macros.YAML_SNAPSHOT_PATH)
+
 
 def initialize_fixture(config, cur_fixtures, rng=None):
     """
@@ -98,8 +188,7 @@ def load_style_config(style, fixture_config):
         f"fixtures/fixture_registry/{fixture_type}.yaml",
         root=robocasa.models.assets_root,
     )
-    with open(yaml_path, "r") as f:
-        default_configs = yaml.safe_load(f)
+    default_configs = load_yaml(yaml_path)
 
     # find which configuration to use
     if type(fixture_style) == dict and "config_name" not in fixture_config:
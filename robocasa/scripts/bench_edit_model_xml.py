@@ -0,0 +1,180 @@
+"""
+A script to benchmark the single-pass model xml postprocessing used by Kitchen.edit_model_xml on
+the model xmls stored in demonstration datasets. Compares the previous multi-pass pipeline (robosuite
+path relocation, robocasa path relocation and four string-based texture swaps, each parsing and
+serializing the whole xml) against the single-pass rewrite with memoized path relocation, and checks
+that both produce the same asset paths.
+
+Example usage:
+
+    # benchmark on the first 10 demos of a dataset, with generative textures
+    python bench_edit_model_xml.py --dataset /path/to/demo.hdf5 --n 10
+
+    # benchmark without generative textures
+    python bench_edit_model_xml.py --dataset /path/to/demo.hdf5 --no_textures
+"""
+
+import argparse
+import os
+import time
+import xml.etree.ElementTree as ET
+
+import h5py
+import numpy as np
+import robosuite
+from termcolor import colored
+
+import robocasa
+from robocasa.utils.hdf5_utils import get_model_file
+from robocasa.utils.model_xml_utils import (
+    clear_relocation_cache,
+    relocate_asset_paths,
+)
+from robocasa.utils.texture_swap import (
+    get_random_textures,
+    replace_cab_textures,
+    replace_counter_top_texture,
+    replace_floor_texture,
+    replace_wall_texture,
+    set_generative_textures,
+)
+
+
+def edit_model_xml_multi_pass(xml_str, textures):
+    """
+    Previous implementation: one parse / serialize per edit and a path split per asset element
+    """
+    # robosuite asset paths
+    path_split = os.path.split(robosuite.__file__)[0].split("/")
+    root = ET.fromstring(xml_str)
+    for elem in root.find("asset").findall("mesh") + root.find("asset").findall(
+        "texture"
+    ):
+        old_path = elem.get("file")
+        if old_path is None:
+            continue
+        old_path_split = old_path.split("/")
+        check_lst = [
+            loc for loc, val in enumerate(old_path_split) if val == "robosuite"
+        ]
+        if len(check_lst) > 0:
+            elem.set(
+                "file", "/".join(path_split + old_path_split[max(check_lst) + 1 :])
+            )
+    xml_str = ET.tostring(root, encoding="utf8").decode("utf8")
+
+    # robocasa asset paths
+    robocasa_path_split = os.path.split(robocasa.__file__)[0].split("/")
+    root = ET.fromstring(xml_str)
+    for elem in root.find("asset").findall("mesh") + root.find("asset").findall(
+        "texture"
+    ):
+        old_path = elem.get("file")
+        if old_path is None:
+            continue
+        old_path_split = old_path.split("/")
+        if (
+            ("models/assets/fixtures" in old_path)
+            or ("models/assets/textures" in old_path)
+            or ("models/assets/objects/objaverse" in old_path)
+        ):
+            if "/robosuite/" in old_path:
+                check_lst = [
+                    loc for loc, val in enumerate(old_path_split) if val == "robosuite"
+                ]
+            else:
+                check_lst = [
+                    loc for loc, val in enumerate(old_path_split) if val == "robocasa"
+                ]
+            elem.set(
+                "file",
+                "/".join(robocasa_path_split + old_path_split[max(check_lst) + 1 :]),
+            )
+    result = ET.tostring(root).decode("utf8")
+
+    if textures is not None:
+        result = replace_cab_textures(None, result, textures["cab_tex"])
+        result = replace_counter_top_texture(None, result, textures["counter_tex"])
+        result = replace_wall_texture(None, result, textures["wall_tex"])
+        result = replace_floor_texture(None, result, textures["floor_tex"])
+    return result
+
+
+def edit_model_xml_single_pass(xml_str, textures):
+    """
+    Current implementation (as in Kitchen.edit_model_xml, without the camera edits)
+    """
+    root = ET.fromstring(xml_str)
+    relocate_asset_paths(root)
+    if textures is not None:
+        set_generative_textures(root.find("asset"), textures)
+    return ET.tostring(root).decode("utf8")
+
+
+def get_asset_files(xml_str):
+    asset = ET.fromstring(xml_str).find("asset")
+    return sorted(
+        [
+            (elem.tag, elem.get("name"), elem.get("file"))
+            for elem in asset
+            if elem.get("file") is not None
+        ],
+        key=lambda x: (x[0], x[1] or "", x[2]),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dataset", type=str, required=True, help="path to hdf5 dataset"
+    )
+    parser.add_argument(
+        "--n", type=int, default=None, help="(optional) number of demos to benchmark"
+    )
+    parser.add_argument(
+        "--no_textures",
+        action="store_true",
+        help="benchmark without generative texture replacement",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with h5py.File(args.dataset, "r") as f:
+        demos = sorted(list(f["data"].keys()), key=lambda x: int(x[5:]))
+        if args.n is not None:
+            demos = demos[: args.n]
+        xml_strs = [get_model_file(f, f["data/{}".format(ep)]) for ep in demos]
+
+    rng = np.random.default_rng(args.seed)
+    clear_relocation_cache()
+    multi_times, single_times = [], []
+    for (ep, xml_str) in zip(demos, xml_strs):
+        textures = None if args.no_textures else get_random_textures(rng)
+
+        t_start = time.time()
+        multi_result = edit_model_xml_multi_pass(xml_str, textures)
+        multi_times.append(time.time() - t_start)
+
+        t_start = time.time()
+        single_result = edit_model_xml_single_pass(xml_str, textures)
+        single_times.append(time.time() - t_start)
+
+        if get_asset_files(multi_result) != get_asset_files(single_result):
+            print(colored("{}: asset paths differ".format(ep), "red"))
+        print(
+            "{}: {:.1f} KB, {:.3f}s multi-pass, {:.3f}s single-pass".format(
+                ep, len(xml_str) / 1e3, multi_times[-1], single_times[-1]
+            )
+        )
+
+    print(
+        colored(
+            "mean over {} demos: {:.3f}s -> {:.3f}s ({:.1f}x)".format(
+                len(demos),
+                np.mean(multi_times),
+                np.mean(single_times),
+                np.mean(multi_times) / np.mean(single_times),
+            ),
+            "yellow",
+        )
+    )
@@ -0,0 +1,130 @@
+"""
+A script to benchmark the parsed-yaml cache used when building kitchen scenes.
+For each layout/style pair, builds the fixtures without the cache (the layout, style and a
+fixture registry yaml are parsed for every fixture) and with a warm cache, and reports the
+per-reset savings.
+Can also write a pre-parsed snapshot of all scene yamls for macros.YAML_SNAPSHOT_PATH.
+
+Example usage:
+
+    # benchmark a few layouts and styles
+    python bench_scene_yaml.py --layouts 0 1 2 --styles 0 1
+
+    # write snapshot to load at import time
+    python bench_scene_yaml.py --save_snapshot /tmp/scene_yamls.pkl
+"""
+
+import argparse
+import time
+
+import numpy as np
+import yaml
+from termcolor import colored
+
+import robocasa.models.scenes.scene_builder as SceneBuilder
+import robocasa.models.scenes.scene_utils as SceneUtils
+
+load_yaml_cached = SceneUtils.load_yaml
+
+
+def load_yaml_uncached(path):
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def set_yaml_loader(loader):
+    # scene_builder imports load_yaml by name, so both modules need to be patched
+    SceneUtils.load_yaml = loader
+    SceneBuilder.load_yaml = loader
+
+
+def time_create_fixtures(layout_id, style_id, cached, num_trials):
+    """
+    Times building the fixtures of a kitchen.
+
+    Args:
+        layout_id (int): layout of the kitchen to build
+
+        style_id (int): style of the kitchen to build
+
+        cached (bool): if True, reads yamls through the (warmed up) yaml cache
+
+        num_trials (int): number of trials to average over
+
+    Returns:
+        2-tuple:
+            - (float) mean build time in seconds
+            - (int) number of yaml loads per build
+    """
+    num_loads = [0]
+    loader = load_yaml_cached if cached else load_yaml_uncached
+
+    def counting_loader(path):
+        num_loads[0] += 1
+        return loader(path)
+
+    set_yaml_loader(counting_loader)
+    if cached:
+        # warm up the cache
+        SceneBuilder.create_fixtures(layout_id=layout_id, style_id=style_id)
+
+    times = []
+    for _ in range(num_trials):
+        num_loads[0] = 0
+        t_start = time.time()
+        SceneBuilder.create_fixtures(layout_id=layout_id, style_id=style_id)
+        times.append(time.time() - t_start)
+
+    set_yaml_loader(load_yaml_cached)
+    return np.mean(times), num_loads[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--layouts", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--styles", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--num_trials", type=int, default=5)
+    parser.add_argument(
+        "--save_snapshot",
+        type=str,
+        default=None,
+        help="(optional) path to write a pre-parsed snapshot of all scene yamls",
+    )
+    args = parser.parse_args()
+
+    if args.save_snapshot is not None:
+        num_files = SceneUtils.save_yaml_snapshot(args.save_snapshot)
+        print(
+            colored(
+                "Saved {} parsed yamls to {}".format(num_files, args.save_snapshot),
+                "green",
+            )
+        )
+        exit()
+
+    cold_times, warm_times = [], []
+    for layout_id in args.layouts:
+        for style_id in args.styles:
+            cold_time, num_loads = time_create_fixtures(
+                layout_id, style_id, cached=False, num_trials=args.num_trials
+            )
+            warm_time, _ = time_create_fixtures(
+                layout_id, style_id, cached=True, num_trials=args.num_trials
+            )
+            cold_times.append(cold_time)
+            warm_times.append(warm_time)
+            print("layout: {}, style: {}".format(layout_id, style_id))
+            print("   {} yaml loads per reset".format(num_loads))
+            print("   {:.3f}s uncached".format(cold_time))
+            print("   {:.3f}s cached".format(warm_time))
+
+    print(
+        colored(
+            "mean savings per reset: {:.3f}s ({:.3f}s -> {:.3f}s)".format(
+                np.mean(cold_times) - np.mean(warm_times),
+                np.mean(cold_times),
+                np.mean(warm_times),
+            ),
+            "yellow",
+        )
+    )
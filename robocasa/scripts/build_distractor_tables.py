@@ -0,0 +1,136 @@
+"""
+A script to precompute the ranked distractor candidates used for attribute-based distractor sampling.
+For every target object, unique attribute, registry and split, ranks the candidate models once and saves
+the top ranked ones to distractor_tables.pkl in the object attributes folder, where they are picked up
+at runtime. Queries that are not precomputed (e.g. other groups) are still ranked and cached on the fly.
+Re-run it whenever all_infos.json or the rank data change; stale tables are ignored.
+
+Example usage:
+
+    # precompute for distractors sampled from all categories
+    python build_distractor_tables.py
+
+    # precompute for several distractor groups, split A only
+    python build_distractor_tables.py --groups all food --splits A
+"""
+
+import argparse
+import time
+
+from termcolor import colored
+
+from robocasa.models.objects.kitchen_objects import (
+    ATTR2IDX,
+    BASE_ASSET_ZOO_PATH,
+    OBJ_CATEGORIES,
+    _get_valid_categories,
+    get_distractor_key,
+    get_registry_hash,
+    rank_distractors,
+)
+from robocasa.models.objects.object_attributes import (
+    DistractorTable,
+    get_distractor_table_path,
+    get_obj_infos,
+    get_rank_data,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--groups",
+        type=str,
+        nargs="+",
+        default=["all"],
+        help="object groups distractors are sampled from. Each group is precomputed separately",
+    )
+    parser.add_argument(
+        "--registries",
+        type=str,
+        nargs="+",
+        default=["objaverse", "objaverse_extra", "aigen"],
+        help="registries to sample from, as passed to sample_kitchen_object",
+    )
+    parser.add_argument(
+        "--splits",
+        type=str,
+        nargs="+",
+        default=["None", "A", "B"],
+        help="object splits to precompute (None for no split)",
+    )
+    parser.add_argument(
+        "--attrs",
+        type=str,
+        nargs="+",
+        default=list(ATTR2IDX.keys()),
+        help="unique attributes to precompute",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="(optional) path to write to. Defaults to distractor_tables.pkl in the attributes folder",
+    )
+    args = parser.parse_args()
+
+    obj_registries = tuple(args.registries)
+    splits = [None if split == "None" else split for split in args.splits]
+    obj_infos = get_obj_infos()["obj_infos"]
+    obj_name_list, _, _ = get_rank_data()
+    target_obj_names = [name for name in obj_name_list if name in obj_infos]
+
+    t_start = time.time()
+    table = DistractorTable(root=BASE_ASSET_ZOO_PATH, registry_hash=get_registry_hash())
+    for group in args.groups:
+        valid_categories = _get_valid_categories(
+            groups=group,
+            exclude_groups=None,
+            graspable=None,
+            washable=None,
+            microwavable=None,
+            cookable=None,
+            freezable=None,
+            obj_registries=obj_registries,
+        )
+        registries = [
+            reg
+            for reg in obj_registries
+            if any([reg in OBJ_CATEGORIES[cat] for cat in valid_categories])
+        ]
+        for target_obj_name in target_obj_names:
+            for unique_attr in args.attrs:
+                if unique_attr not in obj_infos[target_obj_name]:
+                    continue
+                for reg in registries:
+                    for split in splits:
+                        key = get_distractor_key(
+                            target_obj_name,
+                            unique_attr,
+                            reg,
+                            split,
+                            obj_registries,
+                            valid_categories,
+                        )
+                        table.set(
+                            key,
+                            rank_distractors(
+                                target_obj_name,
+                                unique_attr,
+                                reg,
+                                split,
+                                obj_registries,
+                                valid_categories,
+                            ),
+                        )
+        print("group {}: {} entries".format(group, len(table)))
+
+    output = args.output or get_distractor_table_path()
+    table.save(output)
+    print(
+        colored(
+            "Saved {} distractor lists to {} in {:.1f}s".format(
+                len(table), output, time.time() - t_start
+            ),
+            "green",
+        )
+    )
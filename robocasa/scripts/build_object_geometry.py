@@ -0,0 +1,57 @@
+"""
+A script to build the object geometry table used for object size checks and bounding box math.
+Scans all model.xml files under the object assets folder once and saves the bottom, top and horizontal
+radius sites of every model, so that no object XML needs to be parsed while sampling objects.
+Re-run it after downloading or editing object assets.
+
+Example usage:
+
+    # write the table to the default location (assets/objects/geometry_table.npz)
+    python build_object_geometry.py
+
+    # write the table somewhere else (set macros.OBJECT_GEOMETRY_TABLE_PATH accordingly)
+    python build_object_geometry.py --output /tmp/geometry_table.npz
+"""
+
+import argparse
+import time
+
+from termcolor import colored
+
+from robocasa.models.objects.object_geometry import (
+    DEFAULT_TABLE_PATH,
+    OBJECTS_ROOT,
+    ObjectGeometryTable,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=OBJECTS_ROOT,
+        help="folder to scan for object models",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=DEFAULT_TABLE_PATH,
+        help="path to write the table to",
+    )
+    args = parser.parse_args()
+
+    t_start = time.time()
+    table = ObjectGeometryTable.build(root=args.root)
+    table.save(args.output)
+    print(
+        colored(
+            "Saved geometry of {} models ({} registries, {} categories) to {} in {:.1f}s".format(
+                len(table),
+                len(table.registry_names),
+                len(table.category_names),
+                args.output,
+                time.time() - t_start,
+            ),
+            "green",
+        )
+    )
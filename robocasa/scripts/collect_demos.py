@@ -9,6 +9,7 @@ script.
 import argparse
 import datetime
 import json
+import multiprocessing
 import os
 import time
 from glob import glob
@@ -26,6 +27,13 @@ from termcolor import colored
 import robocasa
 import robocasa.macros as macros
 from robocasa.models.fixtures import FixtureType
+from robocasa.utils.hdf5_utils import (
+    COMPRESSION_TYPES,
+    MODEL_FILE_ATTR,
+    MODEL_HASH_ATTR,
+    append_to_dataset,
+    write_model_file,
+)
 
 assert (
     mujoco.__version__ == "3.1.1"
@@ -205,7 +213,40 @@ def collect_human_trajectory(
     return ep_directory, discard_traj
 
 
-def gather_demonstrations_as_hdf5(directory, out_dir, env_info, excluded_episodes=None):
+def load_state_file(state_file):
+    """
+    Loads a chunk of an episode saved by the DataCollectionWrapper
+
+    Args:
+        state_file (str): path to the state_*.npz file of the chunk
+
+    Returns:
+        dict: env name, states, actions and absolute actions (None if not recorded) of the chunk
+    """
+    dic = np.load(state_file, allow_pickle=True)
+    actions = []
+    actions_abs = []
+    for ai in dic["action_infos"]:
+        actions.append(ai["actions"])
+        if "actions_abs" in ai:
+            actions_abs.append(ai["actions_abs"])
+    return dict(
+        env=str(dic["env"]),
+        states=np.array(dic["states"]),
+        actions=np.array(actions),
+        actions_abs=np.array(actions_abs) if len(actions_abs) > 0 else None,
+    )
+
+
+def gather_demonstrations_as_hdf5(
+    directory,
+    out_dir,
+    env_info,
+    excluded_episodes=None,
+    num_workers=1,
+    compression="gzip",
+    dedup_model_files=False,
+):
     """
     Gathers the demonstrations saved in @directory into a
     single hdf5 file.
@@ -221,13 +262,46 @@ def gather_demonstrations_as_hdf5(directory, out_dir, env_info, excluded_episode
             actions (dataset) - actions applied during demonstration
         demo2 (group)
         ...
+
+    With @dedup_model_files, demonstrations reference their model xml by hash instead of storing it:
+        demo1 (group)
+            model_hash (attribute) - hash of the model xml of the demonstration (key in models)
+    models (group)
+        <sha> (dataset) - compressed model xml, stored once for all demonstrations using it
+
+    Episodes are streamed chunk by chunk (one chunk per state_*.npz file) into resizable, chunked and
+    compressed datasets (see robocasa/utils/hdf5_utils.py), so that they are never held in memory as a whole.
+
     Args:
         directory (str): Path to the directory containing raw demonstrations.
         out_dir (str): Path to where to store the hdf5 file.
         env_info (str): JSON-encoded string containing environment information,
             including controller and robot info
+        excluded_episodes (list): names of episode directories to skip
+        num_workers (int): number of processes loading the raw chunks in parallel
+        compression (str): compression of the datasets (None, "gzip" or "lz4")
+        dedup_model_files (bool): if True, store each distinct model xml once in the models group instead
+            of in the model_file attribute of every demonstration. Readers need to support this layout
+            (see get_model_file in robocasa/utils/hdf5_utils.py)
     """
 
+    ep_directories = [
+        ep_directory
+        for ep_directory in os.listdir(directory)
+        if (excluded_episodes is None) or (ep_directory not in excluded_episodes)
+    ]
+    jobs = []
+    for ep_directory in ep_directories:
+        state_paths = os.path.join(directory, ep_directory, "state_*.npz")
+        jobs += [(ep_directory, state_file) for state_file in sorted(glob(state_paths))]
+
+    # raw chunks are loaded in parallel and written in order by this process
+    pool = None
+    chunks = map(load_state_file, [state_file for (_, state_file) in jobs])
+    if num_workers > 1 and len(jobs) > 1:
+        pool = multiprocessing.Pool(num_workers)
+        chunks = pool.imap(load_state_file, [state_file for (_, state_file) in jobs])
+
     hdf5_path = os.path.join(out_dir, "demo.hdf5")
     print("Saving hdf5 to", hdf5_path)
     f = h5py.File(hdf5_path, "w")
@@ -238,68 +312,60 @@ def gather_demonstrations_as_hdf5(directory, out_dir, env_info, excluded_episode
     num_eps = 0
     env_name = None  # will get populated at some point
 
-    for ep_directory in os.listdir(directory):
-        # print("Processing {} ...".format(ep_directory))
-        if (excluded_episodes is not None) and (ep_directory in excluded_episodes):
-            # print("\tExcluding this episode!")
-            continue
-
-        state_paths = os.path.join(directory, ep_directory, "state_*.npz")
-        states = []
-        actions = []
-        actions_abs = []
-        # success = False
-
-        for state_file in sorted(glob(state_paths)):
-            dic = np.load(state_file, allow_pickle=True)
-            env_name = str(dic["env"])
-
-            states.extend(dic["states"])
-            for ai in dic["action_infos"]:
-                actions.append(ai["actions"])
-                if "actions_abs" in ai:
-                    actions_abs.append(ai["actions_abs"])
-            # success = success or dic["successful"]
-
-        if len(states) == 0:
-            continue
-
-        # # Add only the successful demonstration to dataset
-        # if success:
-
-        # print("Demonstration is successful and has been saved")
+    def finish_episode(ep_directory, ep_data_grp):
         # Delete the last state. This is because when the DataCollector wrapper
         # recorded the states and actions, the states were recorded AFTER playing that action,
         # so we end up with an extra state at the end.
-        del states[-1]
-        assert len(states) == len(actions)
+        states = ep_data_grp["states"]
+        states.resize(states.shape[0] - 1, axis=0)
+        num_actions = ep_data_grp["actions"].shape[0] if "actions" in ep_data_grp else 0
+        assert states.shape[0] == num_actions
 
-        num_eps += 1
-        ep_data_grp = grp.create_group("demo_{}".format(num_eps))
-
-        # store model xml as an attribute
+        # store model xml, either in the demonstration or once in the model table referenced by its hash
         xml_path = os.path.join(directory, ep_directory, "model.xml")
-        with open(xml_path, "r") as f:
-            xml_str = f.read()
-        ep_data_grp.attrs["model_file"] = xml_str
+        with open(xml_path, "r") as xml_f:
+            xml_str = xml_f.read()
+        if dedup_model_files:
+            ep_data_grp.attrs[MODEL_HASH_ATTR] = write_model_file(
+                f, xml_str, compression=compression
+            )
+        else:
+            ep_data_grp.attrs[MODEL_FILE_ATTR] = xml_str
 
         # store ep meta as an attribute
         ep_meta_path = os.path.join(directory, ep_directory, "ep_meta.json")
         if os.path.exists(ep_meta_path):
-            with open(ep_meta_path, "r") as f:
-                ep_meta = f.read()
+            with open(ep_meta_path, "r") as ep_meta_f:
+                ep_meta = ep_meta_f.read()
             ep_data_grp.attrs["ep_meta"] = ep_meta
 
-        # write datasets for states and actions
-        ep_data_grp.create_dataset("states", data=np.array(states))
-        ep_data_grp.create_dataset("actions", data=np.array(actions))
-        if len(actions_abs) > 0:
-            print(np.array(actions_abs).shape)
-            ep_data_grp.create_dataset("actions_abs", data=np.array(actions_abs))
-
-        # else:
-        #     pass
-        #     # print("Demonstration is unsuccessful and has NOT been saved")
+    try:
+        curr_ep_directory = None
+        ep_data_grp = None
+        for ((ep_directory, _), chunk) in zip(jobs, chunks):
+            if ep_directory != curr_ep_directory:
+                if ep_data_grp is not None:
+                    finish_episode(curr_ep_directory, ep_data_grp)
+                curr_ep_directory = ep_directory
+                ep_data_grp = None
+
+            env_name = chunk["env"]
+            if len(chunk["states"]) == 0:
+                continue
+            if ep_data_grp is None:
+                num_eps += 1
+                ep_data_grp = grp.create_group("demo_{}".format(num_eps))
+
+            # write datasets for states and actions
+            for k in ["states", "actions", "actions_abs"]:
+                if chunk[k] is not None and len(chunk[k]) > 0:
+                    append_to_dataset(ep_data_grp, k, chunk[k], compression=compression)
+        if ep_data_grp is not None:
+            finish_episode(curr_ep_directory, ep_data_grp)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     print("{} successful demos so far".format(num_eps))
 
@@ -398,6 +464,25 @@ if __name__ == "__main__":
         "--style", type=int, nargs="+", default=[0, 1, 2, 3, 4, 5, 6, 7, 8, 11]
     )
     parser.add_argument("--generative_textures", action="store_true")
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="number of processes loading raw demonstrations when gathering them into the hdf5",
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default="gzip",
+        choices=[c for c in COMPRESSION_TYPES if c is not None],
+        help="compression of the hdf5 datasets (lz4 requires hdf5plugin, also to read the dataset)",
+    )
+    parser.add_argument(
+        "--dedup_model_files",
+        action="store_true",
+        help="store each distinct model xml once in a models group instead of in every demo's model_file "
+        "attribute. Tools that read model_file directly do not support this layout",
+    )
     args = parser.parse_args()
 
     # Get controller config
@@ -524,5 +609,11 @@ if __name__ == "__main__":
             if discard_traj and ep_directory is not None:
                 excluded_eps.append(ep_directory.split("/")[-1])
             gather_demonstrations_as_hdf5(
-                tmp_directory, new_dir, env_info, excluded_episodes=excluded_eps
+                tmp_directory,
+                new_dir,
+                env_info,
+                excluded_episodes=excluded_eps,
+                num_workers=args.num_workers,
+                compression=args.compression,
+                dedup_model_files=args.dedup_model_files,
             )
@@ -0,0 +1,55 @@
+"""
+A script to convert a torch rank_info.pt file into the torch-free format read by
+robocasa/models/objects/object_attributes.py: obj_name_list.json and a memory-mappable ori_rank.npy.
+This is the only place torch is needed.
+
+Example usage:
+
+    # convert into the configured attributes folder (also copy all_infos.json there)
+    python convert_rank_info.py --rank_info /path/to/rank_info.pt
+
+    # convert into a specific folder
+    python convert_rank_info.py --rank_info /path/to/rank_info.pt --output_dir /path/to/attributes
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+from termcolor import colored
+
+from robocasa.models.objects.object_attributes import get_attributes_dir
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rank_info", type=str, required=True)
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        default=None,
+        help="(optional) folder to write to. Defaults to the configured attributes folder",
+    )
+    args = parser.parse_args()
+
+    import torch
+
+    output_dir = args.output_dir or get_attributes_dir()
+    os.makedirs(output_dir, exist_ok=True)
+
+    rank_info = torch.load(args.rank_info, map_location="cpu")
+    obj_name_list = list(rank_info["obj_name_list"])
+    ori_rank = rank_info["ori_rank"].numpy()
+
+    with open(os.path.join(output_dir, "obj_name_list.json"), "w") as f:
+        json.dump(obj_name_list, f)
+    np.save(os.path.join(output_dir, "ori_rank.npy"), ori_rank)
+
+    print(
+        colored(
+            "Wrote ranks of {} objects {} to {}".format(
+                len(obj_name_list), ori_rank.shape, output_dir
+            ),
+            "green",
+        )
+    )
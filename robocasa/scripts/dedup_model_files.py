@@ -0,0 +1,139 @@
+"""
+A script to migrate RoboCasa hdf5 datasets that store the model xml of each demo in its model_file attribute
+to the deduplicated layout, where unique model xmls are stored once, compressed, in a top-level models/<sha>
+table and demos reference theirs through a model_hash attribute (see robocasa/utils/hdf5_utils.py). All
+other groups, datasets and attributes are copied unchanged. Pass --inline to convert a deduplicated dataset
+back to per-demo model_file attributes, e.g. for tools that read them directly.
+
+Example usage:
+
+    # write a deduplicated copy of a dataset (to /path/to/demo_dedup.hdf5)
+    python dedup_model_files.py --dataset /path/to/demo.hdf5
+
+    # convert back to per-demo model_file attributes
+    python dedup_model_files.py --dataset /path/to/demo_dedup.hdf5 --inline --output /path/to/demo.hdf5
+"""
+
+import argparse
+import os
+
+import h5py
+from termcolor import colored
+from tqdm import tqdm
+
+from robocasa.utils.hdf5_utils import (
+    COMPRESSION_TYPES,
+    MODEL_FILE_ATTR,
+    MODEL_HASH_ATTR,
+    MODELS_GROUP,
+    get_model_file,
+    write_model_file,
+)
+
+
+def migrate_dataset(dataset, output, inline=False, compression="gzip"):
+    """
+    Copies a dataset, storing the model xmls of its demos deduplicated (or inline, if @inline)
+
+    Args:
+        dataset (str): path to the dataset to migrate
+
+        output (str): path to write the migrated dataset to
+
+        inline (bool): if True, store the model xml of each demo in its model_file attribute instead
+
+        compression (str): compression of the stored xmls (None, "gzip" or "lz4")
+
+    Returns:
+        2-tuple:
+            num_demos (int): number of demos
+            num_models (int): number of unique model xmls
+    """
+    model_hashes = set()
+    with h5py.File(dataset, "r") as src, h5py.File(output, "w") as dst:
+        for k, v in src.attrs.items():
+            dst.attrs[k] = v
+        for name in src.keys():
+            if name not in ("data", MODELS_GROUP):
+                src.copy(src[name], dst, name=name)
+
+        src_data = src["data"]
+        dst_data = dst.create_group("data")
+        for k, v in src_data.attrs.items():
+            dst_data.attrs[k] = v
+
+        demos = list(src_data.keys())
+        for ep in tqdm(demos):
+            # model xmls (often hundreds of KB) are not copied with the other attributes of the demo
+            dst_ep_grp = dst_data.create_group(ep)
+            for name in src_data[ep].keys():
+                src.copy(src_data[ep][name], dst_ep_grp, name=name)
+            for k, v in src_data[ep].attrs.items():
+                if k not in (MODEL_FILE_ATTR, MODEL_HASH_ATTR):
+                    dst_ep_grp.attrs[k] = v
+
+            xml = get_model_file(src, src_data[ep])
+            if inline:
+                dst_ep_grp.attrs[MODEL_FILE_ATTR] = xml
+            else:
+                model_hash = write_model_file(dst, xml, compression=compression)
+                dst_ep_grp.attrs[MODEL_HASH_ATTR] = model_hash
+                model_hashes.add(model_hash)
+
+    return len(demos), len(model_hashes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dataset", type=str, required=True, help="path to hdf5 dataset"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="(optional) path of the migrated dataset. Defaults to <dataset>_dedup.hdf5 (<dataset>_inline.hdf5 with --inline)",
+    )
+    parser.add_argument(
+        "--inline",
+        action="store_true",
+        help="convert a deduplicated dataset back to per-demo model_file attributes",
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default="gzip",
+        choices=[c for c in COMPRESSION_TYPES if c is not None],
+        help="compression of the stored model xmls (lz4 requires hdf5plugin, also to read the dataset)",
+    )
+    args = parser.parse_args()
+
+    output = args.output
+    if output is None:
+        output = "{}_{}.hdf5".format(
+            args.dataset.split(".hdf5")[0], "inline" if args.inline else "dedup"
+        )
+    assert os.path.abspath(output) != os.path.abspath(
+        args.dataset
+    ), "the migrated dataset must be written to a new file"
+
+    num_demos, num_models = migrate_dataset(
+        args.dataset, output, inline=args.inline, compression=args.compression
+    )
+
+    size_before = os.path.getsize(args.dataset) / 1e6
+    size_after = os.path.getsize(output) / 1e6
+    if args.inline:
+        summary = "Inlined model xmls of {} demos".format(num_demos)
+    else:
+        summary = "Stored {} unique model xmls for {} demos".format(
+            num_models, num_demos
+        )
+    print(
+        colored(
+            "{}: {:.1f} MB -> {:.1f} MB, saved to {}".format(
+                summary, size_before, size_after, output
+            ),
+            "green",
+        )
+    )
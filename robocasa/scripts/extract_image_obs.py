@@ -0,0 +1,433 @@
+"""
+A script to extract image observations from the simulation states of a dataset (e.g. to regenerate
+demo_gentex_im128_randcams.hdf5-style datasets from human_raw datasets after changing cameras or resolutions).
+
+Episodes are rendered by a pool of worker processes, each with its own environment. Per episode, a worker
+loads the model once, then sets the recorded states in a tight loop and renders all requested cameras of
+each state with the sim's reused offscreen render context. Frames are handed to a background thread that
+appends them to chunked, compressed datasets of a per-episode shard file, so that rendering is not blocked
+by compression and disk writes. Finished shards act as checkpoints: an interrupted job rerun with --resume
+only renders the remaining episodes. Once all episodes are rendered, the shards are merged into a copy of
+the source dataset, as obs/<camera>_image datasets of each demo.
+
+Example usage:
+
+    # render 128x128 images of three cameras with 8 workers
+    python extract_image_obs.py --dataset /path/to/demo.hdf5 --output /path/to/demo_im128.hdf5 \\
+        --camera_names robot0_agentview_left robot0_agentview_right robot0_eye_in_hand \\
+        --camera_height 128 --camera_width 128 --num_workers 8
+
+    # resume an interrupted job
+    python extract_image_obs.py --dataset /path/to/demo.hdf5 --output /path/to/demo_im128.hdf5 \\
+        --camera_names robot0_agentview_left robot0_agentview_right robot0_eye_in_hand \\
+        --camera_height 128 --camera_width 128 --num_workers 8 --resume
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+import traceback
+
+import h5py
+import numpy as np
+import robosuite.macros as suite_macros
+from robosuite.utils.mjcf_utils import IMAGE_CONVENTION_MAPPING
+from termcolor import colored
+
+from robocasa.scripts.playback_dataset import create_playback_env, reset_to
+from robocasa.utils.hdf5_utils import (
+    COMPRESSION_TYPES,
+    append_to_dataset,
+    get_model_file,
+)
+
+# attribute marking a shard as complete
+SHARD_COMPLETE_ATTR = "complete"
+
+
+class BackgroundDatasetWriter:
+    """
+    Appends arrays to datasets of an hdf5 file from a background thread. Rows are buffered per dataset and
+    written in chunks of @chunk_len rows.
+
+    Args:
+        path (str): path of the hdf5 file to write
+
+        chunk_len (int): number of rows per chunk
+
+        compression (str): compression of the datasets (None, "gzip" or "lz4")
+
+        max_queued (int): maximum number of queued rows before append blocks
+    """
+
+    def __init__(self, path, chunk_len=64, compression="gzip", max_queued=256):
+        self.f = h5py.File(path, "w")
+        self.chunk_len = chunk_len
+        self.compression = compression
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        buffers = dict()
+        done = False
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    done = True
+                    break
+                name, row = item
+                buffers.setdefault(name, []).append(row)
+                if len(buffers[name]) >= self.chunk_len:
+                    self._flush(name, buffers.pop(name))
+            for name, rows in buffers.items():
+                self._flush(name, rows)
+        except Exception:
+            self._error = traceback.format_exc()
+            # keep consuming until close, so that append never blocks on a dead writer
+            while not done:
+                done = self._queue.get() is None
+
+    def _flush(self, name, rows):
+        append_to_dataset(
+            self.f,
+            name,
+            np.stack(rows),
+            chunk_len=self.chunk_len,
+            compression=self.compression,
+        )
+
+    def append(self, name, row):
+        """
+        Queues @row to be appended to dataset @name
+        """
+        self._queue.put((name, row))
+
+    def close(self):
+        """
+        Writes all queued rows and closes the file. Raises an error if the background thread failed
+        """
+        self._queue.put(None)
+        self._thread.join()
+        path = self.f.filename
+        self.f.close()
+        if self._error is not None:
+            raise RuntimeError("writing {} failed:\n{}".format(path, self._error))
+
+
+def get_shard_path(shard_dir, ep):
+    return os.path.join(shard_dir, "{}.hdf5".format(ep))
+
+
+def is_shard_complete(shard_path):
+    """
+    Returns:
+        bool: whether the shard at @shard_path was completely written
+    """
+    if not os.path.exists(shard_path):
+        return False
+    try:
+        with h5py.File(shard_path, "r") as f:
+            return bool(f.attrs.get(SHARD_COMPLETE_ATTR, False))
+    except OSError:
+        return False
+
+
+# per-process state of extraction workers
+_WORKER_ARGS = None
+_WORKER_ENV = None
+_WORKER_FILE = None
+
+
+def _init_extraction_worker(args):
+    global _WORKER_ARGS, _WORKER_FILE
+    _WORKER_ARGS = args
+    _WORKER_FILE = h5py.File(args.dataset, "r")
+
+
+def extract_episode(env, f, ep, shard_path, args):
+    """
+    Renders the image observations of an episode into a shard file
+
+    Args:
+        env (MujocoEnv): environment to render with
+
+        f (h5py.File): source dataset
+
+        ep (str): name of the episode
+
+        shard_path (str): path of the shard file to write
+
+        args (argparse.Namespace): extraction arguments
+
+    Returns:
+        int: number of rendered frames
+    """
+    ep_grp = f["data/{}".format(ep)]
+    states = ep_grp["states"][()]
+    initial_state = dict(states=states[0])
+    initial_state["model"] = get_model_file(f, ep_grp)
+    initial_state["ep_meta"] = ep_grp.attrs.get("ep_meta", None)
+    reset_to(env, initial_state)
+
+    convention = IMAGE_CONVENTION_MAPPING[suite_macros.IMAGE_CONVENTION]
+    tmp_path = shard_path + ".tmp"
+    writer = BackgroundDatasetWriter(
+        tmp_path, chunk_len=args.chunk_len, compression=args.compression
+    )
+    try:
+        for state in states:
+            env.sim.set_state_from_flattened(state)
+            env.sim.forward()
+            for cam_name in args.camera_names:
+                im = env.sim.render(
+                    width=args.camera_width,
+                    height=args.camera_height,
+                    camera_name=cam_name,
+                )
+                writer.append("obs/{}_image".format(cam_name), im[::convention])
+    finally:
+        writer.close()
+    with h5py.File(tmp_path, "a") as shard:
+        shard.attrs[SHARD_COMPLETE_ATTR] = True
+    os.replace(tmp_path, shard_path)
+    return len(states) * len(args.camera_names)
+
+
+def _extract_episode_worker(job):
+    """
+    Renders one episode in a worker process, recreating the worker's environment and retrying on failure
+
+    Returns:
+        dict: result of the extraction (episode name, success, error, number of frames)
+    """
+    global _WORKER_ENV
+    ep, shard_path = job
+    args = _WORKER_ARGS
+    result = dict(ep=ep, success=False, error=None, num_frames=0)
+    for _ in range(args.num_retries + 1):
+        try:
+            if _WORKER_ENV is None:
+                _WORKER_ENV = create_playback_env(args.dataset)
+            result["num_frames"] = extract_episode(
+                _WORKER_ENV, _WORKER_FILE, ep, shard_path, args
+            )
+            result["success"] = True
+            result["error"] = None
+            return result
+        except Exception:
+            result["error"] = traceback.format_exc()
+            # the failure may have left the environment in a bad state, start from a fresh one
+            if _WORKER_ENV is not None:
+                try:
+                    _WORKER_ENV.close()
+                except Exception:
+                    pass
+                _WORKER_ENV = None
+    return result
+
+
+def merge_shards(args, demos, shard_dir):
+    """
+    Writes the output dataset: a copy of the source dataset with the rendered image observations of each
+    demo and the cameras recorded in the env metadata
+    """
+    tmp_path = args.output + ".tmp"
+    shutil.copyfile(args.dataset, tmp_path)
+    with h5py.File(tmp_path, "a") as f:
+        for ep in demos:
+            obs_grp = f["data/{}".format(ep)].require_group("obs")
+            with h5py.File(get_shard_path(shard_dir, ep), "r") as shard:
+                for name in shard["obs"].keys():
+                    if name in obs_grp:
+                        del obs_grp[name]
+                    shard.copy(shard["obs/{}".format(name)], obs_grp, name=name)
+
+        env_args = json.loads(f["data"].attrs["env_args"])
+        env_kwargs = env_args["env_kwargs"]
+        env_kwargs["camera_names"] = list(args.camera_names)
+        env_kwargs["camera_heights"] = args.camera_height
+        env_kwargs["camera_widths"] = args.camera_width
+        env_kwargs["use_camera_obs"] = True
+        f["data"].attrs["env_args"] = json.dumps(env_args, indent=4)
+    os.replace(tmp_path, args.output)
+
+
+def extract_image_obs(args):
+    shard_dir = args.shard_dir or args.output.split(".hdf5")[0] + "_shards"
+    if os.path.exists(shard_dir) and not args.resume:
+        shutil.rmtree(shard_dir)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    with h5py.File(args.dataset, "r") as f:
+        if args.filter_key is not None:
+            print("using filter key: {}".format(args.filter_key))
+            demos = [
+                elem.decode("utf-8")
+                for elem in np.array(f["mask/{}".format(args.filter_key)])
+            ]
+        else:
+            demos = list(f["data"].keys())
+    demos = sorted(demos, key=lambda x: int(x[5:]))
+    if args.n is not None:
+        random.seed(args.seed)
+        demos = sorted(random.sample(demos, min(args.n, len(demos))))
+
+    jobs = [
+        (ep, get_shard_path(shard_dir, ep))
+        for ep in demos
+        if not is_shard_complete(get_shard_path(shard_dir, ep))
+    ]
+    if len(jobs) < len(demos):
+        print(
+            colored(
+                "Resuming: {} of {} episodes already extracted".format(
+                    len(demos) - len(jobs), len(demos)
+                ),
+                "yellow",
+            )
+        )
+
+    failed_eps = []
+    num_frames = 0
+    t_start = time.time()
+    # spawn, so that each worker creates its own rendering context
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(
+        args.num_workers, initializer=_init_extraction_worker, initargs=(args,)
+    ) as pool:
+        for (i, result) in enumerate(
+            pool.imap_unordered(_extract_episode_worker, jobs)
+        ):
+            if not result["success"]:
+                failed_eps.append(result["ep"])
+                print(
+                    colored(
+                        "Episode {} failed:\n{}".format(result["ep"], result["error"]),
+                        "red",
+                    )
+                )
+                continue
+            num_frames += result["num_frames"]
+            elapsed = time.time() - t_start
+            print(
+                "Extracted episode {} ({}/{}): {:.2f} episodes/s, {:.1f} frames/s".format(
+                    result["ep"],
+                    i + 1,
+                    len(jobs),
+                    (i + 1) / elapsed,
+                    num_frames / elapsed,
+                )
+            )
+
+    if len(failed_eps) > 0:
+        print(
+            colored(
+                "{} episodes failed: {}. Rerun with --resume to retry them".format(
+                    len(failed_eps), failed_eps
+                ),
+                "red",
+            )
+        )
+        return
+
+    print(
+        colored(
+            "Merging {} episodes into {}...".format(len(demos), args.output), "yellow"
+        )
+    )
+    merge_shards(args, demos, shard_dir)
+    if not args.keep_shards:
+        shutil.rmtree(shard_dir)
+    print(
+        colored(
+            "Extracted {} frames in {:.1f}s, saved to {}".format(
+                num_frames, time.time() - t_start, args.output
+            ),
+            "green",
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dataset", type=str, required=True, help="path to hdf5 dataset"
+    )
+    parser.add_argument(
+        "--output", type=str, required=True, help="path of the output hdf5 dataset"
+    )
+    parser.add_argument(
+        "--filter_key",
+        type=str,
+        default=None,
+        help="(optional) filter key, to select a subset of trajectories in the file",
+    )
+    parser.add_argument(
+        "--n",
+        type=int,
+        default=None,
+        help="(optional) number of randomly selected trajectories to extract",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--camera_names",
+        type=str,
+        nargs="+",
+        default=[
+            "robot0_agentview_left",
+            "robot0_agentview_right",
+            "robot0_eye_in_hand",
+        ],
+        help="cameras to render",
+    )
+    parser.add_argument("--camera_height", type=int, default=128)
+    parser.add_argument("--camera_width", type=int, default=128)
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="number of worker processes, each with its own environment",
+    )
+    parser.add_argument(
+        "--num_retries",
+        type=int,
+        default=1,
+        help="number of times a failed episode is retried (with a fresh environment)",
+    )
+    parser.add_argument(
+        "--chunk_len", type=int, default=64, help="number of frames per hdf5 chunk"
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default="gzip",
+        choices=[c for c in COMPRESSION_TYPES if c is not None],
+        help="compression of the image datasets (lz4 requires hdf5plugin, also to read the dataset)",
+    )
+    parser.add_argument(
+        "--shard_dir",
+        type=str,
+        default=None,
+        help="(optional) folder of the per-episode shards. Defaults to <output>_shards",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="keep the shards of a previous run and only extract the remaining episodes",
+    )
+    parser.add_argument(
+        "--keep_shards",
+        action="store_true",
+        help="keep the per-episode shards after merging",
+    )
+    args = parser.parse_args()
+    extract_image_obs(args)
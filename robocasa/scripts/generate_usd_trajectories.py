@@ -15,6 +15,7 @@ import robomimic.utils.obs_utils as ObsUtils
 from robomimic.envs.env_base import EnvBase, EnvType
 from tqdm import tqdm
 
+from robocasa.utils.hdf5_utils import get_model_file
 from robocasa.utils.usd.exporter import USDExporter
 
 front_camera_pos = {
@@ -182,7 +183,7 @@ def playback_dataset(dataset, args):
         states = f["data/{}/states".format(ep)][()]
         initial_state = dict(states=states[0])
         if is_robosuite_env:
-            initial_state["model"] = f["data/{}".format(ep)].attrs["model_file"]
+            initial_state["model"] = get_model_file(f, f["data/{}".format(ep)])
             initial_state["ep_meta"] = f["data/{}".format(ep)].attrs.get(
                 "ep_meta", None
             )
@@ -1,8 +1,28 @@
+"""
+A script to playback demonstrations in a dataset, either on-screen, to a video or (with --use-obs) from
+the image observations stored in the dataset.
+
+Example usage:
+
+    # playback to a video
+    python playback_dataset.py --dataset /path/to/demo.hdf5
+
+    # playback to a video using 8 worker processes, each with its own environment
+    python playback_dataset.py --dataset /path/to/demo.hdf5 --num_workers 8
+
+    # playback to one video per episode, saved in a folder
+    python playback_dataset.py --dataset /path/to/demo.hdf5 --num_workers 8 --video_per_episode
+"""
+
 import argparse
 import json
+import multiprocessing
 import os
 import random
+import shutil
+import tempfile
 import time
+import traceback
 
 import h5py
 import imageio
@@ -11,6 +31,8 @@ import robosuite
 from termcolor import colored
 
 import robocasa
+from robocasa.utils.hdf5_utils import get_model_file
+from robocasa.utils.model_cache import COMPILED_MODEL_CACHE, get_xml_hash
 
 
 def playback_trajectory_with_env(
@@ -41,6 +63,9 @@ def playback_trajectory_with_env(
         camera_names (list): determines which camera(s) are used for rendering. Pass more than
             one to output a video with multiple camera views concatenated horizontally.
         first (bool): if True, only use the first frame of each episode.
+
+    Returns:
+        int: number of steps played back
     """
     write_video = video_writer is not None
     video_count = 0
@@ -126,6 +151,8 @@ def playback_trajectory_with_env(
         env.viewer.close()
         env.viewer = None
 
+    return i + 1
+
 
 def playback_trajectory_with_obs(
     traj_grp,
@@ -232,20 +259,39 @@ def reset_to(env, state):
             env.set_attrs_from_ep_meta(ep_meta)
         elif hasattr(env, "set_ep_meta"):  # newer versions
             env.set_ep_meta(ep_meta)
-        # this reset is necessary.
-        # while the call to env.reset_from_xml_string does call reset,
-        # that is only a "soft" reset that doesn't actually reload the model.
-        env.reset()
-        robosuite_version_id = int(robosuite.__version__.split(".")[1])
-        if robosuite_version_id <= 3:
-            from robosuite.utils.mjcf_utils import postprocess_model_xml
-
-            xml = postprocess_model_xml(state["model"])
-        else:
-            # v1.4 and above use the class-based edit_model_xml function
-            xml = env.edit_model_xml(state["model"])
 
-        env.reset_from_xml_string(xml)
+        # demos of the same scene often have identical model xmls. If the current sim was compiled from the
+        # xml this model and episode metadata were edited to last time, and the edit is deterministic (no
+        # random textures or cameras), the model does not need to be rebuilt: only reset the sim
+        reset_key = get_xml_hash(state["model"] + json.dumps(ep_meta, sort_keys=True))
+        last_reset_key, last_xml_hash = getattr(env, "_reset_to_key", (None, None))
+        if (
+            reset_key == last_reset_key
+            and last_xml_hash is not None
+            and getattr(env, "_model_xml_hash", None) == last_xml_hash
+            and not getattr(env, "generative_textures", None)
+            and not getattr(env, "randomize_cameras", False)
+        ):
+            env.deterministic_reset = True
+            env.reset()
+            env.deterministic_reset = False
+        else:
+            # this reset is necessary.
+            # while the call to env.reset_from_xml_string does call reset,
+            # that is only a "soft" reset that doesn't actually reload the model.
+            env.reset()
+            robosuite_version_id = int(robosuite.__version__.split(".")[1])
+            if robosuite_version_id <= 3:
+                from robosuite.utils.mjcf_utils import postprocess_model_xml
+
+                xml = postprocess_model_xml(state["model"])
+            else:
+                # v1.4 and above use the class-based edit_model_xml function
+                xml = env.edit_model_xml(state["model"])
+
+            # compiled models of identical xmls are reused (see robocasa/utils/model_cache.py)
+            env.reset_from_xml_string(xml)
+            env._reset_to_key = (reset_key, getattr(env, "_model_xml_hash", None))
         env.sim.reset()
         # hide teleop visualization after restoring from model
         # env.sim.model.site_rgba[env.eef_site_id] = np.array([0., 0., 0., 0.])
@@ -269,6 +315,313 @@ def reset_to(env, state):
     return None
 
 
+def create_playback_env(
+    dataset, use_abs_actions=False, write_video=True, verbose=False
+):
+    """
+    Creates the environment a dataset was collected in, set up for playback
+
+    Args:
+        dataset (str): path to hdf5 dataset
+
+        use_abs_actions (bool): if True, use an absolute action space
+
+        write_video (bool): if True, create an offscreen renderer
+
+        verbose (bool): log additional information
+
+    Returns:
+        MujocoEnv: environment
+    """
+    env_meta = get_env_metadata_from_dataset(dataset_path=dataset)
+    if use_abs_actions:
+        env_meta["env_kwargs"]["controller_configs"][
+            "control_delta"
+        ] = False  # absolute action space
+
+    env_kwargs = env_meta["env_kwargs"]
+    env_kwargs["env_name"] = env_meta["env_name"]
+    env_kwargs["has_renderer"] = False
+    env_kwargs["renderer"] = "mjviewer"
+    env_kwargs["has_offscreen_renderer"] = write_video
+    env_kwargs["use_camera_obs"] = False
+
+    if verbose:
+        print(
+            colored(
+                "Initializing environment for {}...".format(env_kwargs["env_name"]),
+                "yellow",
+            )
+        )
+
+    return robosuite.make(**env_kwargs)
+
+
+def load_episode(f, ep, args):
+    """
+    Reads the data needed to playback an episode of a dataset
+
+    Args:
+        f (h5py.File): dataset file
+
+        ep (str): name of the episode, e.g. demo_1
+
+        args (argparse.Namespace): playback arguments
+
+    Returns:
+        3-tuple:
+            initial_state (dict): initial simulation state to load
+            states (np.array): array of simulation states to load
+            actions (np.array or None): actions to play open-loop, if using action playback
+    """
+    # prepare initial state to reload from
+    states = f["data/{}/states".format(ep)][()]
+    initial_state = dict(states=states[0])
+    initial_state["model"] = get_model_file(f, f["data/{}".format(ep)])
+    initial_state["ep_meta"] = f["data/{}".format(ep)].attrs.get("ep_meta", None)
+
+    if args.extend_states:
+        states = np.concatenate((states, [states[-1]] * 50))
+
+    # supply actions if using open-loop action playback
+    actions = None
+    assert not (
+        args.use_actions and args.use_abs_actions
+    )  # cannot use both relative and absolute actions
+    if args.use_actions:
+        actions = f["data/{}/actions".format(ep)][()]
+    elif args.use_abs_actions:
+        actions = f["data/{}/actions_abs".format(ep)][()]  # absolute actions
+
+    return initial_state, states, actions
+
+
+class FrameFileWriter:
+    """
+    Minimal video writer that streams raw frames to a file, so that frames rendered by a worker process can
+    be appended losslessly and in order to the final video by the main process
+
+    Args:
+        path (str): path of the file to write
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.frame_shape = None
+        self.num_frames = 0
+        self._f = open(path, "wb")
+
+    def append_data(self, frame):
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if self.frame_shape is None:
+            self.frame_shape = frame.shape
+        assert frame.shape == self.frame_shape
+        self._f.write(frame.tobytes())
+        self.num_frames += 1
+
+    def close(self):
+        self._f.close()
+
+
+def read_frame_file(path, frame_shape, num_frames):
+    """
+    Returns:
+        np.memmap: (num_frames, H, W, 3) frames written by a FrameFileWriter
+    """
+    return np.memmap(
+        path, dtype=np.uint8, mode="r", shape=(num_frames,) + tuple(frame_shape)
+    )
+
+
+# per-process state of playback workers
+_WORKER_ARGS = None
+_WORKER_ENV = None
+_WORKER_FILE = None
+
+
+def _init_playback_worker(args):
+    global _WORKER_ARGS, _WORKER_FILE
+    _WORKER_ARGS = args
+    _WORKER_FILE = h5py.File(args.dataset, "r")
+
+
+def _playback_episode_worker(job):
+    """
+    Plays back one episode in a worker process, recreating the worker's environment and retrying on failure
+
+    Args:
+        job (tuple): index and name of the episode, folder to write frames / videos to
+
+    Returns:
+        dict: result of the playback (episode name, success, error, number of steps and frames, output file)
+    """
+    global _WORKER_ENV
+    ind, ep, out_dir = job
+    args = _WORKER_ARGS
+    result = dict(ind=ind, ep=ep, success=False, error=None, num_steps=0, num_frames=0)
+    for attempt in range(args.num_retries + 1):
+        video_writer = None
+        try:
+            if _WORKER_ENV is None:
+                _WORKER_ENV = create_playback_env(
+                    args.dataset, use_abs_actions=args.use_abs_actions
+                )
+            initial_state, states, actions = load_episode(_WORKER_FILE, ep, args)
+            if args.video_per_episode:
+                out_path = os.path.join(out_dir, "{}.mp4".format(ep))
+                video_writer = imageio.get_writer(out_path, fps=20)
+            else:
+                out_path = os.path.join(out_dir, "{}.frames".format(ep))
+                video_writer = FrameFileWriter(out_path)
+            result["num_steps"] = playback_trajectory_with_env(
+                env=_WORKER_ENV,
+                initial_state=initial_state,
+                states=states,
+                actions=actions,
+                video_writer=video_writer,
+                video_skip=args.video_skip,
+                camera_names=args.render_image_names,
+                first=args.first,
+            )
+            video_writer.close()
+            if isinstance(video_writer, FrameFileWriter):
+                result["num_frames"] = video_writer.num_frames
+                result["frame_shape"] = video_writer.frame_shape
+            else:
+                result["num_frames"] = len(
+                    range(0, result["num_steps"], args.video_skip)
+                )
+            result["path"] = out_path
+            result["success"] = True
+            result["error"] = None
+            return result
+        except Exception:
+            result["error"] = traceback.format_exc()
+            if video_writer is not None:
+                try:
+                    video_writer.close()
+                except Exception:
+                    pass
+            # the failure may have left the environment in a bad state, start from a fresh one
+            if _WORKER_ENV is not None:
+                try:
+                    _WORKER_ENV.close()
+                except Exception:
+                    pass
+                _WORKER_ENV = None
+            print(
+                colored(
+                    "Episode {} failed (attempt {} of {})".format(
+                        ep, attempt + 1, args.num_retries + 1
+                    ),
+                    "red",
+                )
+            )
+    return result
+
+
+def playback_dataset_parallel(args, demos):
+    """
+    Plays back demos to video(s) using a pool of worker processes, each with its own environment. Episodes
+    are written in order, either to a single video at @args.video_path or, if @args.video_per_episode, to
+    one video per episode in the folder @args.video_path. Failed episodes are retried @args.num_retries
+    times and then skipped.
+
+    Args:
+        args (argparse.Namespace): playback arguments
+
+        demos (list): names of the episodes to playback, in order
+    """
+    if args.video_per_episode:
+        out_dir = os.path.splitext(args.video_path)[0]
+        os.makedirs(out_dir, exist_ok=True)
+        video_writer = None
+    else:
+        out_dir = tempfile.mkdtemp(
+            prefix=".playback_", dir=os.path.dirname(os.path.abspath(args.video_path))
+        )
+        video_writer = imageio.get_writer(args.video_path, fps=20)
+
+    jobs = [(ind, ep, out_dir) for (ind, ep) in enumerate(demos)]
+    failed_eps = []
+    num_steps = 0
+    num_frames = 0
+    t_start = time.time()
+    # spawn, so that each worker creates its own rendering context
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ctx.Pool(
+            args.num_workers, initializer=_init_playback_worker, initargs=(args,)
+        ) as pool:
+            # results are returned in episode order, while workers already play back later episodes
+            for result in pool.imap(_playback_episode_worker, jobs):
+                if not result["success"]:
+                    failed_eps.append(result["ep"])
+                    print(
+                        colored(
+                            "Skipping episode {}:\n{}".format(
+                                result["ep"], result["error"]
+                            ),
+                            "red",
+                        )
+                    )
+                    continue
+
+                num_steps += result["num_steps"]
+                num_frames += result["num_frames"]
+                if video_writer is not None:
+                    if result["num_frames"] > 0:
+                        frames = read_frame_file(
+                            result["path"], result["frame_shape"], result["num_frames"]
+                        )
+                        for frame in frames:
+                            video_writer.append_data(np.array(frame))
+                        del frames
+                    os.remove(result["path"])
+
+                elapsed = time.time() - t_start
+                print(
+                    colored(
+                        "Played back episode {} ({}/{}): {:.2f} episodes/s, {:.1f} frames/s".format(
+                            result["ep"],
+                            result["ind"] + 1,
+                            len(demos),
+                            (result["ind"] + 1) / elapsed,
+                            num_frames / elapsed,
+                        ),
+                        "yellow",
+                    )
+                )
+    finally:
+        if video_writer is not None:
+            video_writer.close()
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    elapsed = time.time() - t_start
+    num_played = len(demos) - len(failed_eps)
+    print(
+        colored(
+            "Played back {} episodes ({} steps, {} frames) in {:.1f}s with {} workers: "
+            "{:.2f} episodes/s, {:.1f} frames/s".format(
+                num_played,
+                num_steps,
+                num_frames,
+                elapsed,
+                args.num_workers,
+                num_played / elapsed,
+                num_frames / elapsed,
+            ),
+            "green",
+        )
+    )
+    if len(failed_eps) > 0:
+        print(colored("Failed episodes: {}".format(failed_eps), "red"))
+    if args.video_per_episode:
+        print(colored(f"Saved videos to {out_dir}", "green"))
+    else:
+        print(colored(f"Saved video to {args.video_path}", "green"))
+
+
 def playback_dataset(args):
     # some arg checking
     write_video = args.render is not True
@@ -296,10 +649,19 @@ def playback_dataset(args):
             not args.use_actions and not args.use_abs_actions
         ), "playback with observations is offline and does not support action playback"
 
+    # older callers construct args without the parallel playback options
+    num_workers = getattr(args, "num_workers", 1)
+    args.video_per_episode = getattr(args, "video_per_episode", False)
+    args.num_retries = getattr(args, "num_retries", 1)
+    if num_workers > 1 or args.video_per_episode:
+        assert (
+            write_video and not args.use_obs
+        ), "parallel / per-episode playback only supports writing videos from the simulator"
+
     env = None
 
-    # create environment only if not playing back with observations
-    if not args.use_obs:
+    # create environment only if not playing back with observations (or if workers create their own)
+    if not args.use_obs and num_workers <= 1:
         # # need to make sure ObsUtils knows which observations are images, but it doesn't matter
         # # for playback since observations are unused. Pass a dummy spec here.
         # dummy_spec = dict(
@@ -310,28 +672,12 @@ def playback_dataset(args):
         # )
         # initialize_obs_utils_with_obs_specs(obs_modality_specs=dummy_spec)
 
-        env_meta = get_env_metadata_from_dataset(dataset_path=args.dataset)
-        if args.use_abs_actions:
-            env_meta["env_kwargs"]["controller_configs"][
-                "control_delta"
-            ] = False  # absolute action space
-
-        env_kwargs = env_meta["env_kwargs"]
-        env_kwargs["env_name"] = env_meta["env_name"]
-        env_kwargs["has_renderer"] = False
-        env_kwargs["renderer"] = "mjviewer"
-        env_kwargs["has_offscreen_renderer"] = write_video
-        env_kwargs["use_camera_obs"] = False
-
-        if args.verbose:
-            print(
-                colored(
-                    "Initializing environment for {}...".format(env_kwargs["env_name"]),
-                    "yellow",
-                )
-            )
-
-        env = robosuite.make(**env_kwargs)
+        env = create_playback_env(
+            args.dataset,
+            use_abs_actions=args.use_abs_actions,
+            write_video=write_video,
+            verbose=args.verbose,
+        )
 
     f = h5py.File(args.dataset, "r")
 
@@ -353,6 +699,12 @@ def playback_dataset(args):
         random.shuffle(demos)
         demos = demos[: args.n]
 
+    if num_workers > 1 or args.video_per_episode:
+        f.close()
+        args.num_workers = max(num_workers, 1)
+        playback_dataset_parallel(args, demos)
+        return
+
     # maybe dump video
     video_writer = None
     if write_video:
@@ -372,24 +724,7 @@ def playback_dataset(args):
             )
             continue
 
-        # prepare initial state to reload from
-        states = f["data/{}/states".format(ep)][()]
-        initial_state = dict(states=states[0])
-        initial_state["model"] = f["data/{}".format(ep)].attrs["model_file"]
-        initial_state["ep_meta"] = f["data/{}".format(ep)].attrs.get("ep_meta", None)
-
-        if args.extend_states:
-            states = np.concatenate((states, [states[-1]] * 50))
-
-        # supply actions if using open-loop action playback
-        actions = None
-        assert not (
-            args.use_actions and args.use_abs_actions
-        )  # cannot use both relative and absolute actions
-        if args.use_actions:
-            actions = f["data/{}/actions".format(ep)][()]
-        elif args.use_abs_actions:
-            actions = f["data/{}/actions_abs".format(ep)][()]  # absolute actions
+        initial_state, states, actions = load_episode(f, ep, args)
 
         playback_trajectory_with_env(
             env=env,
@@ -405,6 +740,12 @@ def playback_dataset(args):
         )
 
     f.close()
+    if args.verbose and not args.use_obs:
+        print(
+            colored(
+                "Compiled model cache: {}".format(COMPILED_MODEL_CACHE.stats), "yellow"
+            )
+        )
     if write_video:
         print(colored(f"Saved video to {args.video_path}", "green"))
         video_writer.close()
@@ -512,5 +853,26 @@ if __name__ == "__main__":
         help="log additional information",
     )
 
+    # Playback with a pool of worker processes, each with its own environment
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="number of worker processes used to playback episodes to video",
+    )
+
+    parser.add_argument(
+        "--video_per_episode",
+        action="store_true",
+        help="write one video per episode, to a folder named after --video_path",
+    )
+
+    parser.add_argument(
+        "--num_retries",
+        type=int,
+        default=1,
+        help="number of times a failed episode is retried (with a fresh environment) before it is skipped",
+    )
+
     args = parser.parse_args()
     playback_dataset(args)
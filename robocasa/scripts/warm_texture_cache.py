@@ -0,0 +1,86 @@
+"""
+A script to warm the decoded-texture cache (see robocasa/utils/texture_cache.py) for all textures
+referenced by the kitchen styles, so that parallel workers load decoded pixels instead of each decoding
+the same pngs. Builds the fixtures of every layout / style pair, decodes the textures they reference and,
+optionally, all generative textures. Set macros.USE_TEXTURE_CACHE to load models from the cache.
+
+Example usage:
+
+    # warm the cache for all layouts and styles, including generative textures
+    python warm_texture_cache.py --generative_textures
+
+    # warm the cache for a few styles only
+    python warm_texture_cache.py --layouts 0 --styles 0 1 2
+"""
+
+import argparse
+import os
+import time
+
+from termcolor import colored
+from tqdm import tqdm
+
+import robocasa.models.scenes.scene_registry as SceneRegistry
+from robocasa.models.scenes.scene_builder import create_fixtures
+from robocasa.utils.texture_cache import get_texture_cache
+from robocasa.utils.texture_swap import TEXTURES_DIR
+
+
+def get_fixture_textures(layout_id, style_id):
+    """
+    Returns:
+        set: paths of the png textures referenced by the fixtures of a kitchen
+    """
+    tex_paths = set()
+    for fixture in create_fixtures(layout_id=layout_id, style_id=style_id).values():
+        for tex in fixture.asset.findall("texture"):
+            tex_path = tex.get("file")
+            if tex_path is not None and tex_path.lower().endswith(".png"):
+                tex_paths.add(tex_path)
+    return tex_paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--layouts", type=int, nargs="+", default=None, help="layouts (default all)"
+    )
+    parser.add_argument(
+        "--styles", type=int, nargs="+", default=None, help="styles (default all)"
+    )
+    parser.add_argument(
+        "--generative_textures",
+        action="store_true",
+        help="also cache all generative textures",
+    )
+    args = parser.parse_args()
+
+    t_start = time.time()
+    tex_paths = set()
+    for layout_id in SceneRegistry.unpack_layout_ids(args.layouts):
+        for style_id in SceneRegistry.unpack_style_ids(args.styles):
+            tex_paths |= get_fixture_textures(layout_id, style_id)
+    if args.generative_textures:
+        for folder, _, files in os.walk(TEXTURES_DIR):
+            tex_paths |= {
+                os.path.join(folder, f) for f in files if f.lower().endswith(".png")
+            }
+
+    cache = get_texture_cache()
+    num_skipped = 0
+    for tex_path in tqdm(sorted(tex_paths)):
+        if not os.path.exists(tex_path) or cache.get_file(tex_path) is None:
+            num_skipped += 1
+
+    print(
+        colored(
+            "Cached {} textures in {} ({} newly decoded, {} skipped) in {:.1f}s".format(
+                len(tex_paths) - num_skipped,
+                cache.cache_dir,
+                cache.misses,
+                num_skipped,
+                time.time() - t_start,
+            ),
+            "green",
+        )
+    )
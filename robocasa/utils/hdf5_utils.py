@@ -0,0 +1,135 @@
+"""
+Utilities to write and read RoboCasa hdf5 datasets.
+
+Per-step arrays (states, actions, ...) are written as resizable, chunked and compressed datasets that
+are appended to chunk by chunk, so that an episode never has to be held in memory as a whole.
+
+Model xmls can be stored once per dataset, in a table of compressed xmls keyed by their hash, and demos
+reference the hash of their model instead of storing the xml:
+
+    models (group)
+        <sha> (dataset) - utf8 encoded, compressed model xml
+    data (group)
+        demo_1 (group)
+            model_hash (attribute) - hash of the model xml of the demo (key in models)
+
+By default (and in older datasets), the xml of each demo is stored in its model_file attribute, which is
+the layout tools outside of RoboCasa read. Use get_model_file to read the model xml of a demo from either
+layout.
+"""
+
+import numpy as np
+
+from robocasa.utils.model_cache import get_xml_hash
+
+MODELS_GROUP = "models"
+MODEL_HASH_ATTR = "model_hash"
+MODEL_FILE_ATTR = "model_file"
+
+# compression of per-step arrays and model xmls (lz4 requires the hdf5plugin package)
+COMPRESSION_TYPES = (None, "gzip", "lz4")
+
+
+def get_compression_kwargs(compression="gzip"):
+    """
+    Returns:
+        dict: keyword arguments of h5py's create_dataset for @compression (None, "gzip" or "lz4").
+            Datasets compressed with lz4 can only be read after importing hdf5plugin
+    """
+    assert compression in COMPRESSION_TYPES
+    if compression is None:
+        return dict()
+    if compression == "gzip":
+        return dict(compression="gzip", compression_opts=4)
+    try:
+        import hdf5plugin
+    except ImportError:
+        raise ImportError(
+            "lz4 compression requires hdf5plugin. Please run pip install hdf5plugin"
+        )
+    return dict(hdf5plugin.LZ4())
+
+
+def append_to_dataset(grp, name, data, chunk_len=256, compression="gzip"):
+    """
+    Appends @data along the first axis of dataset @name of @grp, creating a resizable, chunked and
+    compressed dataset on first use
+
+    Args:
+        grp (h5py.Group): group of the dataset
+
+        name (str): name of the dataset
+
+        data (np.array): array to append
+
+        chunk_len (int): number of rows per chunk
+
+        compression (str): compression of new datasets (None, "gzip" or "lz4")
+
+    Returns:
+        h5py.Dataset: the dataset
+    """
+    data = np.asarray(data)
+    if name not in grp:
+        return grp.create_dataset(
+            name,
+            data=data,
+            maxshape=(None,) + data.shape[1:],
+            chunks=(chunk_len,) + data.shape[1:],
+            **get_compression_kwargs(compression),
+        )
+    dset = grp[name]
+    n = dset.shape[0]
+    dset.resize(n + data.shape[0], axis=0)
+    dset[n:] = data
+    return dset
+
+
+def write_model_file(f, xml, compression="gzip"):
+    """
+    Stores a model xml in the model table of a dataset, unless an identical xml is already stored
+
+    Args:
+        f (h5py.File): dataset file
+
+        xml (str): model xml
+
+        compression (str): compression of the stored xml (None, "gzip" or "lz4")
+
+    Returns:
+        str: hash of the model xml, to reference it from demos
+    """
+    model_hash = get_xml_hash(xml)
+    models_grp = f.require_group(MODELS_GROUP)
+    if model_hash not in models_grp:
+        models_grp.create_dataset(
+            model_hash,
+            data=np.frombuffer(xml.encode("utf8"), dtype=np.uint8),
+            **get_compression_kwargs(compression),
+        )
+    return model_hash
+
+
+def read_model_file(f, model_hash):
+    """
+    Returns:
+        str: model xml stored in the model table of dataset @f under @model_hash
+    """
+    return f["{}/{}".format(MODELS_GROUP, model_hash)][()].tobytes().decode("utf8")
+
+
+def get_model_file(f, ep_grp):
+    """
+    Reads the model xml of a demo, stored either in the model table or as an attribute of the demo
+
+    Args:
+        f (h5py.File): dataset file
+
+        ep_grp (h5py.Group): group of the demo
+
+    Returns:
+        str: model xml of the demo
+    """
+    if MODEL_HASH_ATTR in ep_grp.attrs:
+        return read_model_file(f, ep_grp.attrs[MODEL_HASH_ATTR])
+    return ep_grp.attrs[MODEL_FILE_ATTR]
@@ -0,0 +1,111 @@
+"""
+Cache of compiled MuJoCo models keyed by the hash of their xml. Loading a model from an xml string
+(e.g. Kitchen.reset_from_xml_string during dataset playback) compiles the whole scene, although demos of
+the same scene often have byte-identical model xmls. Compiled models are kept in a small per-process
+LRU and copied on reuse, since environments modify their model (e.g. texture swaps).
+"""
+
+import copy
+import hashlib
+from collections import OrderedDict
+
+import mujoco
+
+import robocasa.macros as macros
+
+
+def get_xml_hash(xml):
+    """
+    Returns:
+        str: hash identifying the model xml string @xml
+    """
+    return hashlib.sha1(xml.encode("utf8")).hexdigest()
+
+
+class CompiledModelCache:
+    """
+    LRU cache of compiled models. Cached models are never handed out, only copies of them.
+
+    Args:
+        max_entries (int): maximum number of models to keep. None keeps every model
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self._models = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns:
+            mujoco.MjModel or None: copy of the model cached for @key, or None if not cached
+        """
+        model = self._models.get(key, None)
+        if model is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._models.move_to_end(key)
+        return copy.copy(model)
+
+    def add(self, key, model):
+        """
+        Caches a copy of @model under @key, evicting the least recently used models if needed
+        """
+        self._models[key] = copy.copy(model)
+        self._models.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all models and resets the counters
+        """
+        self._models.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict: number of models, hits, misses, hit rate and approximate memory use in bytes
+        """
+        num_queries = self.hits + self.misses
+        return dict(
+            entries=len(self._models),
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / num_queries if num_queries > 0 else 0.0,
+            nbytes=sum([m.nbuffer for m in self._models.values()]),
+        )
+
+
+COMPILED_MODEL_CACHE = CompiledModelCache(max_entries=macros.COMPILED_MODEL_CACHE_SIZE)
+
+
+def compile_model(xml, xml_hash=None):
+    """
+    Compiles a model xml string, reusing the compiled model of an identical xml if it is cached
+
+    Args:
+        xml (str): model xml string
+
+        xml_hash (str): hash of @xml, if already computed
+
+    Returns:
+        2-tuple:
+            model (mujoco.MjModel): compiled model, owned by the caller
+            xml_hash (str): hash of @xml
+    """
+    if xml_hash is None:
+        xml_hash = get_xml_hash(xml)
+    if not macros.CACHE_COMPILED_MODELS:
+        return mujoco.MjModel.from_xml_string(xml), xml_hash
+    model = COMPILED_MODEL_CACHE.get(xml_hash)
+    if model is None:
+        model = mujoco.MjModel.from_xml_string(xml)
+        COMPILED_MODEL_CACHE.add(xml_hash, model)
+    return model, xml_hash
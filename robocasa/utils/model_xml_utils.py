@@ -0,0 +1,103 @@
+"""
+Utilities to postprocess model xmls saved with demonstrations, so that they can be loaded on the current
+machine. Asset paths recorded on the collection machine are relocated to the local robosuite and robocasa
+installs. Relocations are memoized per asset folder, since a scene references thousands of meshes and
+textures spread over comparatively few folders.
+"""
+
+import os
+from functools import lru_cache
+
+import robosuite
+
+import robocasa
+
+ROBOSUITE_PATH_SPLIT = os.path.split(robosuite.__file__)[0].split("/")
+ROBOCASA_PATH_SPLIT = os.path.split(robocasa.__file__)[0].split("/")
+
+# robocasa asset folders that are relocated to the local robocasa install
+ROBOCASA_ASSET_DIRS = (
+    "models/assets/fixtures",
+    "models/assets/textures",
+    "models/assets/objects/objaverse",
+)
+
+
+def _relocate_path_split(path_split, is_robocasa_asset):
+    # same rules as robosuite's and Kitchen's edit_model_xml, applied in that order:
+    # 1. paths with a robosuite folder are moved under the local robosuite install
+    check_lst = [loc for loc, val in enumerate(path_split) if val == "robosuite"]
+    if len(check_lst) > 0:
+        path_split = ROBOSUITE_PATH_SPLIT + path_split[max(check_lst) + 1 :]
+
+    # 2. robocasa assets are moved under the local robocasa install
+    if is_robocasa_asset:
+        path = "/".join(path_split)
+        if "/robosuite/" in path:
+            check_lst = [
+                loc for loc, val in enumerate(path_split) if val == "robosuite"
+            ]
+        elif "/robocasa/" in path:
+            check_lst = [loc for loc, val in enumerate(path_split) if val == "robocasa"]
+        else:
+            raise ValueError("Cannot relocate asset path: {}".format(path))
+        path_split = ROBOCASA_PATH_SPLIT + path_split[max(check_lst) + 1 :]
+
+    return path_split
+
+
+@lru_cache(maxsize=None)
+def _relocate_asset_dir(asset_dir, is_robocasa_asset):
+    return "/".join(_relocate_path_split(asset_dir.split("/"), is_robocasa_asset))
+
+
+def relocate_asset_path(path):
+    """
+    Relocates an asset path recorded in a model xml to the local robosuite / robocasa install
+
+    Args:
+        path (str): recorded asset path
+
+    Returns:
+        str: relocated path (unchanged if it does not point into robosuite or robocasa)
+    """
+    is_robocasa_asset = any([d in path for d in ROBOCASA_ASSET_DIRS])
+    asset_dir, sep, fname = path.rpartition("/")
+    if fname in ("robosuite", "robocasa"):
+        # the file name itself takes part in the relocation, so it can't be shared with its folder
+        return "/".join(_relocate_path_split(path.split("/"), is_robocasa_asset))
+    return _relocate_asset_dir(asset_dir, is_robocasa_asset) + sep + fname
+
+
+def relocate_asset_paths(root):
+    """
+    Relocates the file paths of all meshes and textures of a parsed model xml in place
+
+    Args:
+        root (ET.Element): root of the model xml
+
+    Returns:
+        int: number of elements whose path changed
+    """
+    num_relocated = 0
+    asset = root.find("asset")
+    if asset is None:
+        return num_relocated
+    for elem in asset:
+        if elem.tag not in ("mesh", "texture"):
+            continue
+        old_path = elem.get("file")
+        if old_path is None:
+            continue
+        new_path = relocate_asset_path(old_path)
+        if new_path != old_path:
+            elem.set("file", new_path)
+            num_relocated += 1
+    return num_relocated
+
+
+def clear_relocation_cache():
+    """
+    Clears the memoized relocations, e.g. after assets were moved
+    """
+    _relocate_asset_dir.cache_clear()
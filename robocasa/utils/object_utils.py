@@ -13,51 +13,88 @@ def obj_inside_of(env, obj_name, fixture_id, partial_check=False):
     """
     whether an object (another mujoco object) is inside of fixture. applies for most fixtures
     """
+    return bool(
+        objs_inside_of(env, [obj_name], fixture_id, partial_check=partial_check)[0]
+    )
+
+
+def objs_inside_of(env, obj_names, fixture_id, partial_check=False):
+    """
+    batched version of obj_inside_of: whether each object is inside of the fixture
+
+    Args:
+        env (Kitchen): environment
+
+        obj_names (list): names of the objects to check
+
+        fixture_id (str, Fixture, FixtureType): fixture to check against
+
+        partial_check (bool): if True, only checks the object centers
+
+    Returns:
+        np.array: (N,) boolean array
+    """
     from robocasa.models.fixtures import Fixture
 
-    obj = env.objects[obj_name]
     fixture = env.get_fixture(fixture_id)
-    assert isinstance(obj, MJCFObject)
     assert isinstance(fixture, Fixture)
-
-    # step 1: calculate fxiture points
-    fixtr_p0, fixtr_px, fixtr_py, fixtr_pz = fixture.get_int_sites(relative=False)
-    u = fixtr_px - fixtr_p0
-    v = fixtr_py - fixtr_p0
-    w = fixtr_pz - fixtr_p0
-
-    # get the position and quaternion of object
-    obj_pos = np.array(env.sim.data.body_xpos[env.obj_body_id[obj.name]])
-    obj_quat = T.convert_quat(
-        env.sim.data.body_xquat[env.obj_body_id[obj.name]], to="xyzw"
-    )
+    for name in obj_names:
+        assert isinstance(env.objects[name], MJCFObject)
 
     if partial_check:
-        obj_points_to_check = [obj_pos]
+        obj_pos, _ = get_objs_pose(env, obj_names)
+        points = obj_pos[:, None, :]
         th = 0.0
     else:
         # calculate 8 boundary points of object
-        obj_points_to_check = obj.get_bbox_points(trans=obj_pos, rot=obj_quat)
+        points = get_objs_bbox_points(env, obj_names)
         # threshold to mitigate false negatives: even if the bounding box point is out of bounds,
         th = 0.05
 
-    inside_of = True
-    for obj_p in obj_points_to_check:
-        check1 = (
-            np.dot(u, fixtr_p0) - th <= np.dot(u, obj_p) <= np.dot(u, fixtr_px) + th
-        )
-        check2 = (
-            np.dot(v, fixtr_p0) - th <= np.dot(v, obj_p) <= np.dot(v, fixtr_py) + th
-        )
-        check3 = (
-            np.dot(w, fixtr_p0) - th <= np.dot(w, obj_p) <= np.dot(w, fixtr_pz) + th
-        )
+    # check the points against the (cached) interior bounding box of the fixture
+    inside = fixture.points_in_bounds(points.reshape(-1, 3), kind="int", th=th)
+    return np.all(inside.reshape(len(obj_names), -1), axis=1)
 
-        if not (check1 and check2 and check3):
-            inside_of = False
-            break
 
-    return inside_of
+def get_objs_pose(env, obj_names):
+    """
+    reads the world frame poses of objects from the simulation with a single read per quantity
+
+    Args:
+        env (Kitchen): environment
+
+        obj_names (list): names of the objects
+
+    Returns:
+        2-tuple:
+            - (np.array) (N, 3) positions
+            - (np.array) (N, 4) quaternions in (x,y,z,w) form
+    """
+    body_ids = [env.obj_body_id[env.objects[name].name] for name in obj_names]
+    obj_pos = np.array(env.sim.data.body_xpos[body_ids]).reshape(-1, 3)
+    obj_quat = np.array(env.sim.data.body_xquat[body_ids]).reshape(-1, 4)
+    # (w,x,y,z) -> (x,y,z,w)
+    return obj_pos, obj_quat[:, [1, 2, 3, 0]]
+
+
+def get_objs_bbox_points(env, obj_names):
+    """
+    computes the world frame bounding box points of objects, transforming all of them at once
+
+    Args:
+        env (Kitchen): environment
+
+        obj_names (list): names of the objects
+
+    Returns:
+        np.array: (N, 8, 3) bounding box points, in the same order as MJCFObject.get_bbox_points
+    """
+    obj_pos, obj_quat = get_objs_pose(env, obj_names)
+    offsets = np.array(
+        [get_bbox_offsets(env.objects[name]) for name in obj_names]
+    ).reshape(-1, 8, 3)
+    mats = quat2mat_batch(obj_quat)
+    return obj_pos[:, None, :] + np.einsum("nij,nkj->nki", mats, offsets)
 
 
 # used for cabinets, cabinet panels, counters, etc.
@@ -167,19 +204,9 @@ def point_in_fixture(point, fixture, only_2d=False):
 
         only_2d (bool): whether to check only in 2D
     """
-    p0, px, py, pz = fixture.get_ext_sites(relative=False)
-    th = 0.00
-    u = px - p0
-    v = py - p0
-    w = pz - p0
-    check1 = np.dot(u, p0) - th <= np.dot(u, point) <= np.dot(u, px) + th
-    check2 = np.dot(v, p0) - th <= np.dot(v, point) <= np.dot(v, py) + th
-    check3 = np.dot(w, p0) - th <= np.dot(w, point) <= np.dot(w, pz) + th
-
-    if only_2d:
-        return check1 and check2
-    else:
-        return check1 and check2 and check3
+    return bool(
+        fixture.points_in_bounds([point], kind="ext", th=0.0, only_2d=only_2d)[0]
+    )
 
 
 def obj_in_region(
@@ -200,43 +227,61 @@ def obj_in_region(
     if isinstance(obj, MJCFObject) or isinstance(obj, Fixture):
         obj_points = obj.get_bbox_points(trans=obj_pos, rot=obj_quat)
     else:
-        radius = obj.horizontal_radius
-        obj_points = obj_pos + np.array(
-            [
-                [radius, 0, 0],
-                [-radius, 0, 0],
-                [0, radius, 0],
-                [0, -radius, 0],
-            ]
-        )
+        obj_points = _get_radius_points(obj, obj_pos)
+    return bool(bboxes_in_region(np.array(obj_points)[None], p0, px, py, pz)[0])
 
-    u = px - p0
-    v = py - p0
-    w = pz - p0 if pz is not None else None
 
-    for point in obj_points:
-        check1 = np.dot(u, p0) <= np.dot(u, point) <= np.dot(u, px)
-        check2 = np.dot(v, p0) <= np.dot(v, point) <= np.dot(v, py)
+def objs_in_region(env, obj_names, p0, px, py, pz=None):
+    """
+    batched version of obj_in_region for objects in the environment, at their current poses
+
+    Args:
+        env (Kitchen): environment
 
-        if not check1 or not check2:
-            return False
+        obj_names (list): names of the objects to check
 
-        if w is not None:
-            check3 = np.dot(w, p0) <= np.dot(w, point) <= np.dot(w, pz)
-            if not check3:
-                return False
+        p0, px, py, pz (np.array): points defining the region. pz is optional
 
-    return True
+    Returns:
+        np.array: (N,) boolean array
+    """
+    has_bbox = [get_bbox_offsets(env.objects[name]) is not None for name in obj_names]
+    if all(has_bbox):
+        points = get_objs_bbox_points(env, obj_names)
+    else:
+        obj_pos, obj_quat = get_objs_pose(env, obj_names)
+        points = []
+        for (name, pos, quat, bbox) in zip(obj_names, obj_pos, obj_quat, has_bbox):
+            if bbox:
+                obj_points = env.objects[name].get_bbox_points(trans=pos, rot=quat)
+            else:
+                obj_points = _get_radius_points(env.objects[name], pos)
+            # pad to 8 points, duplicates do not change the result
+            points.append(np.resize(np.array(obj_points), (8, 3)))
+        points = np.array(points).reshape(-1, 8, 3)
+    return bboxes_in_region(points, p0, px, py, pz)
+
+
+def _get_radius_points(obj, obj_pos):
+    radius = obj.horizontal_radius
+    return obj_pos + np.array(
+        [
+            [radius, 0, 0],
+            [-radius, 0, 0],
+            [0, radius, 0],
+            [0, -radius, 0],
+        ]
+    )
 
 
 def fixture_pairwise_dist(f1, f2):
     """
     Gets the distance between two fixtures by finding the minimum distance between their exterior bounding box points
     """
-    f1_points = f1.get_ext_sites(all_points=True, relative=False)
-    f2_points = f2.get_ext_sites(all_points=True, relative=False)
+    f1_points = np.array(f1.get_ext_sites(all_points=True, relative=False))
+    f2_points = np.array(f2.get_ext_sites(all_points=True, relative=False))
 
-    all_dists = [np.linalg.norm(p1 - p2) for p1 in f1_points for p2 in f2_points]
+    all_dists = np.linalg.norm(f1_points[:, None, :] - f2_points[None, :, :], axis=-1)
     return np.min(all_dists)
 
 
@@ -313,6 +358,168 @@ def objs_intersect(
     return intersect
 
 
+def get_bbox_offsets(obj):
+    """
+    get the 8 bounding box points of an object or fixture relative to its own frame
+
+    Returns:
+        np.array: (8, 3) array of points, or None if the object has no bounding box
+    """
+    from robocasa.models.fixtures import Fixture
+
+    if isinstance(obj, MJCFObject):
+        return np.array(obj.get_bbox_points(trans=None, rot=None))
+    elif isinstance(obj, Fixture):
+        return np.array(obj.get_ext_sites(all_points=True, relative=True))
+    return None
+
+
+def quat2mat_batch(quats):
+    """
+    vectorized version of T.quat2mat
+
+    Args:
+        quats (np.array): (N, 4) array of quaternions in (x,y,z,w) form
+
+    Returns:
+        np.array: (N, 3, 3) array of rotation matrices
+    """
+    quats = np.asarray(quats, dtype=np.float64)
+    n = np.sum(quats * quats, axis=-1, keepdims=True)
+    quats = quats * np.sqrt(2.0 / np.maximum(n, 1e-12))
+    x, y, z, w = quats[..., 0], quats[..., 1], quats[..., 2], quats[..., 3]
+    mats = np.stack(
+        [
+            1.0 - y * y - z * z,
+            x * y - z * w,
+            x * z + y * w,
+            x * y + z * w,
+            1.0 - x * x - z * z,
+            y * z - x * w,
+            x * z - y * w,
+            y * z + x * w,
+            1.0 - x * x - y * y,
+        ],
+        axis=-1,
+    ).reshape(quats.shape[:-1] + (3, 3))
+    # degenerate quaternions map to the identity, as in T.quat2mat
+    mats[n[..., 0] < 1e-12] = np.eye(3)
+    return mats
+
+
+def mat2quat_batch(mats):
+    """
+    vectorized version of T.mat2quat, using the same eigen-decomposition (and precision)
+
+    Args:
+        mats (np.array): (N, 3, 3) array of rotation matrices
+
+    Returns:
+        np.array: (N, 4) array of quaternions in (x,y,z,w) form
+    """
+    M = np.asarray(mats).astype(np.float32)[..., :3, :3]
+    m00, m01, m02 = M[..., 0, 0], M[..., 0, 1], M[..., 0, 2]
+    m10, m11, m12 = M[..., 1, 0], M[..., 1, 1], M[..., 1, 2]
+    m20, m21, m22 = M[..., 2, 0], M[..., 2, 1], M[..., 2, 2]
+    zeros = np.zeros_like(m00)
+    K = np.stack(
+        [
+            m00 - m11 - m22,
+            zeros,
+            zeros,
+            zeros,
+            m01 + m10,
+            m11 - m00 - m22,
+            zeros,
+            zeros,
+            m02 + m20,
+            m12 + m21,
+            m22 - m00 - m11,
+            zeros,
+            m21 - m12,
+            m02 - m20,
+            m10 - m01,
+            m00 + m11 + m22,
+        ],
+        axis=-1,
+    ).reshape(M.shape[:-2] + (4, 4))
+    K /= 3.0
+    # quaternion is eigenvector of K that corresponds to largest eigenvalue
+    w, V = np.linalg.eigh(K)
+    q1 = np.take_along_axis(V, np.argmax(w, axis=-1)[..., None, None], axis=-1)[..., 0]
+    q1 = q1[..., [3, 0, 1, 2]]
+    q1 = np.where(q1[..., :1] < 0.0, -q1, q1)
+    return q1[..., [1, 2, 3, 0]]
+
+
+def bboxes_in_region(points, p0, px, py, pz=None, tol=0.0):
+    """
+    check if batches of points lie in the region defined by the points.
+    Batched counterpart of the test in obj_in_region
+
+    Args:
+        points (np.array): (N, K, 3) array, K points for each of N candidates
+
+        p0, px, py, pz (np.array): points defining the region. pz is optional
+
+        tol (float): slack (in distance units) by which points may leave the region
+
+    Returns:
+        np.array: (N,) boolean array, True if all K points of a candidate are in the region
+    """
+    in_region = np.ones(points.shape[0], dtype=bool)
+    for p in (px, py, pz):
+        if p is None:
+            continue
+        axis = p - p0
+        slack = tol * np.linalg.norm(axis)
+        projs = points @ axis
+        in_region &= np.all(projs >= np.dot(axis, p0) - slack, axis=1)
+        in_region &= np.all(projs <= np.dot(axis, p) + slack, axis=1)
+    return in_region
+
+
+def bboxes_intersect(points, other_points, tol=0.0):
+    """
+    check if batches of bounding boxes intersect, using the same separating axis test as objs_intersect
+
+    Args:
+        points (np.array): (N, 8, 3) bounding box points of N candidates
+
+        other_points (np.array): (M, 8, 3) bounding box points of M other objects
+
+        tol (float): boxes are only considered separate if the gap along some axis exceeds tol
+
+    Returns:
+        np.array: (N, M) boolean array, True if candidate n intersects other object m
+    """
+    N, M = points.shape[0], other_points.shape[0]
+    if N == 0 or M == 0:
+        return np.zeros((N, M), dtype=bool)
+
+    normals = points[:, 1:4] - points[:, 0:1]  # (N, 3, 3)
+    other_normals = other_points[:, 1:4] - other_points[:, 0:1]  # (M, 3, 3)
+    axes = np.concatenate(
+        [
+            np.broadcast_to(normals[:, None], (N, M, 3, 3)),
+            np.broadcast_to(other_normals[None], (N, M, 3, 3)),
+        ],
+        axis=2,
+    )  # (N, M, 6, 3)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        axes = axes / np.linalg.norm(axes, axis=-1, keepdims=True)
+
+    projs = np.einsum("nkd,nmad->nmak", points, axes)
+    other_projs = np.einsum("mkd,nmad->nmak", other_points, axes)
+
+    # degenerate axes produce nan projections, which never separate, as in objs_intersect
+    with np.errstate(invalid="ignore"):
+        gap = (other_projs.min(axis=-1) - projs.max(axis=-1) > tol) | (
+            projs.min(axis=-1) - other_projs.max(axis=-1) > tol
+        )
+    return ~np.any(gap, axis=-1)
+
+
 def normalize_joint_value(raw, joint_min, joint_max):
     """
     normalize raw value to be between 0 and 1
@@ -356,10 +563,27 @@ def gripper_obj_far(env, obj_name="obj", th=0.25):
     """
     check if gripper is far from object based on distance defined by threshold
     """
-    obj_pos = env.sim.data.body_xpos[env.obj_body_id[obj_name]]
+    return gripper_objs_far(env, [obj_name], th=th)[0]
+
+
+def gripper_objs_far(env, obj_names, th=0.25):
+    """
+    batched version of gripper_obj_far: whether the gripper is far from each object
+
+    Args:
+        env (Kitchen): environment
+
+        obj_names (list): names of the objects to check
+
+        th (float): distance threshold
+
+    Returns:
+        np.array: (N,) boolean array
+    """
+    body_ids = [env.obj_body_id[name] for name in obj_names]
+    obj_pos = np.array(env.sim.data.body_xpos[body_ids]).reshape(-1, 3)
     gripper_site_pos = env.sim.data.site_xpos[env.robots[0].eef_site_id["right"]]
-    gripper_obj_far = np.linalg.norm(gripper_site_pos - obj_pos) > th
-    return gripper_obj_far
+    return np.linalg.norm(obj_pos - gripper_site_pos, axis=1) > th
 
 
 def obj_cos(env, obj_name="obj", ref=(0, 0, 1)):
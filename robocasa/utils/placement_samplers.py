@@ -13,7 +13,22 @@ from robosuite.utils.transform_utils import (
     rotate_2d_point,
 )
 
-from robocasa.utils.object_utils import obj_in_region, objs_intersect
+import robocasa.macros as macros
+from robocasa.utils.object_utils import (
+    bboxes_in_region,
+    bboxes_intersect,
+    get_bbox_offsets,
+    obj_in_region,
+    objs_intersect,
+    quat2mat_batch,
+)
+
+# number of candidate placements tried per object before giving up
+MAX_PLACEMENT_TRIES = 5000
+
+# slack used when batch-scoring candidates. Candidates rejected with this slack are guaranteed to be
+# rejected by the exact (per-candidate) checks, which absorbs float32 round-off in robosuite's transforms
+BATCH_CHECK_TOL = 1e-4
 
 
 class ObjectPositionSampler:
@@ -67,6 +82,24 @@ class ObjectPositionSampler:
         self.reference_pos = reference_pos
         self.reference_rot = reference_rot
         self.z_offset = z_offset
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Resets the sampling statistics of this sampler
+        """
+        self.stats = collections.Counter()
+
+    def get_stats(self):
+        """
+        Returns sampling statistics accumulated since the last reset_stats() call: number of candidate
+        placements drawn, candidates rejected for leaving the region or overlapping other objects,
+        objects placed and failed, and placed objects checked / skipped thanks to the placement index.
+
+        Returns:
+            dict: maps sampler name to its statistics
+        """
+        return {self.name: dict(self.stats)}
 
     def add_objects(self, mujoco_objects):
         """
@@ -92,7 +125,7 @@ class ObjectPositionSampler:
         """
         self.mujoco_objects = []
 
-    def sample(self, fixtures=None, reference=None, on_top=True):
+    def sample(self, fixtures=None, reference=None, on_top=True, placement_index=None):
         """
         Uniformly sample on a surface (not necessarily table surface).
 
@@ -107,6 +140,9 @@ class ObjectPositionSampler:
 
             on_top (bool): if True, sample placement on top of the reference object.
 
+            placement_index (None or PlacementIndex): if provided, spatial index over @fixtures used to
+                only check placements against nearby objects
+
         Return:
             dict: dictionary of all object placements, mapping object_names to (pos, quat, obj), including the
                 placements specified in @fixtures. Note quat is in (w,x,y,z) form
@@ -231,43 +267,405 @@ class UniformRandomSampler(ObjectPositionSampler):
         minimum, maximum = self.y_range
         return self.rng.uniform(high=maximum, low=minimum)
 
-    def _sample_quat(self):
+    def _sample_rot_angle(self):
         """
-        Samples the orientation for a given object
+        Samples the rotation angle for a given object
 
         Returns:
-            np.array: sampled object quaternion in (w,x,y,z) form
-
-        Raises:
-            ValueError: [Invalid rotation axis]
+            float: sampled rotation angle (in radians)
         """
         if self.rotation is None:
-            rot_angle = self.rng.uniform(high=2 * np.pi, low=0)
+            return self.rng.uniform(high=2 * np.pi, low=0)
         elif isinstance(self.rotation, collections.abc.Iterable):
             if isinstance(self.rotation[0], collections.abc.Iterable):
                 rotation = self.rng.choice(self.rotation)
             else:
                 rotation = self.rotation
-            rot_angle = self.rng.uniform(high=max(rotation), low=min(rotation))
-        else:
-            rot_angle = self.rotation
-
-        # Return angle based on axis requested
-        if self.rotation_axis == "x":
-            return np.array([np.cos(rot_angle / 2), np.sin(rot_angle / 2), 0, 0])
-        elif self.rotation_axis == "y":
-            return np.array([np.cos(rot_angle / 2), 0, np.sin(rot_angle / 2), 0])
-        elif self.rotation_axis == "z":
-            return np.array([np.cos(rot_angle / 2), 0, 0, np.sin(rot_angle / 2)])
+            return self.rng.uniform(high=max(rotation), low=min(rotation))
         else:
+            return self.rotation
+
+    def _get_rot_quat(self, rot_angle):
+        """
+        Converts a rotation angle about this sampler's rotation axis into a quaternion
+
+        Args:
+            rot_angle (float or np.array): rotation angle(s) in radians
+
+        Returns:
+            np.array: quaternion(s) in (w,x,y,z) form. Has shape (..., 4) if @rot_angle is an array
+
+        Raises:
+            ValueError: [Invalid rotation axis]
+        """
+        axis_idx = {"x": 1, "y": 2, "z": 3}.get(self.rotation_axis, None)
+        if axis_idx is None:
             # Invalid axis specified, raise error
             raise ValueError(
                 "Invalid rotation axis specified. Must be 'x', 'y', or 'z'. Got: {}".format(
                     self.rotation_axis
                 )
             )
+        rot_angle = np.asarray(rot_angle)
+        quat = np.zeros(rot_angle.shape + (4,))
+        quat[..., 0] = np.cos(rot_angle / 2)
+        quat[..., axis_idx] = np.sin(rot_angle / 2)
+        return quat
+
+    def _sample_quat(self):
+        """
+        Samples the orientation for a given object
+
+        Returns:
+            np.array: sampled object quaternion in (w,x,y,z) form
+
+        Raises:
+            ValueError: [Invalid rotation axis]
+        """
+        return self._get_rot_quat(self._sample_rot_angle())
+
+    def _get_placement(
+        self, obj, relative_x, relative_y, rot_angle, base_offset, ref_quat, on_top
+    ):
+        """
+        Computes the world placement of an object from sampled relative coordinates and rotation angle
+
+        Returns:
+            2-tuple:
+                - (tuple) object (x,y,z) position
+                - (np.array) object quaternion in (w,x,y,z) form
+        """
+        # apply rotation
+        object_x, object_y = rotate_2d_point(
+            [relative_x, relative_y], rot=self.reference_rot
+        )
+
+        object_x = object_x + base_offset[0]
+        object_y = object_y + base_offset[1]
+        object_z = self.z_offset + base_offset[2]
+        if on_top:
+            object_z -= obj.bottom_offset[-1]
+
+        # random rotation
+        quat = self._get_rot_quat(rot_angle)
+        # multiply this quat by the object's initial rotation if it has the attribute specified
+        if hasattr(obj, "init_quat"):
+            quat = quat_multiply(obj.init_quat, quat)
+        quat = convert_quat(
+            quat_multiply(
+                convert_quat(ref_quat, to="xyzw"),
+                convert_quat(quat, to="xyzw"),
+            ),
+            to="wxyz",
+        )
+        return (object_x, object_y, object_z), quat
+
+    def _get_rejection_reason(self, obj, pos, quat, region_points, placed_objects):
+        """
+        Checks whether an object placement is inside the sampling region and does not overlap placed objects
+
+        Returns:
+            None or str: None if the placement is valid, otherwise "region" or "overlap"
+        """
+        # ensure object placed fully in region
+        if self.ensure_object_boundary_in_range and not obj_in_region(
+            obj,
+            obj_pos=pos,
+            obj_quat=convert_quat(quat, to="xyzw"),
+            p0=region_points[0],
+            px=region_points[1],
+            py=region_points[2],
+        ):
+            return "region"
+
+        # objects cannot overlap
+        if self.ensure_valid_placement:
+            for (x, y, z), other_quat, other_obj in placed_objects.values():
+                if objs_intersect(
+                    obj=obj,
+                    obj_pos=pos,
+                    obj_quat=convert_quat(quat, to="xyzw"),
+                    other_obj=other_obj,
+                    other_obj_pos=[x, y, z],
+                    other_obj_quat=convert_quat(other_quat, to="xyzw"),
+                ):
+                    return "overlap"
+
+        return None
+
+    def _num_draws_per_candidate(self):
+        """
+        Returns:
+            int or None: number of uniform draws consumed per candidate placement, or None if candidates
+                cannot be generated in batches (non-uniform draws are needed to pick a rotation range)
+        """
+        if self.rotation is None:
+            return 3
+        elif isinstance(self.rotation, collections.abc.Iterable):
+            if isinstance(self.rotation[0], collections.abc.Iterable):
+                return None
+            return 3
+        return 2
+
+    def _draws_to_samples(self, draws):
+        """
+        Maps a batch of uniform [0, 1) draws to relative x, y coordinates and rotation angles. Each value
+        is computed exactly like the corresponding rng.uniform call of the sequential sampler would.
+
+        Args:
+            draws (np.array): (N, D) array of draws, with D given by _num_draws_per_candidate
+
+        Returns:
+            3-tuple: (N,) arrays of relative x coordinates, relative y coordinates and rotation angles
+        """
+        x_min, x_max = self.x_range
+        y_min, y_max = self.y_range
+        relative_x = x_min + (x_max - x_min) * draws[:, 0]
+        relative_y = y_min + (y_max - y_min) * draws[:, 1]
+        if self.rotation is None:
+            rot_angle = 2 * np.pi * draws[:, 2]
+        elif isinstance(self.rotation, collections.abc.Iterable):
+            rot_min, rot_max = min(self.rotation), max(self.rotation)
+            rot_angle = rot_min + (rot_max - rot_min) * draws[:, 2]
+        else:
+            rot_angle = np.full(len(draws), self.rotation, dtype=np.float64)
+        return relative_x, relative_y, rot_angle
+
+    def _get_plausible_placements(
+        self,
+        obj,
+        relative_x,
+        relative_y,
+        rot_angle,
+        base_offset,
+        ref_quat,
+        on_top,
+        region_points,
+        placed_objects,
+    ):
+        """
+        Scores a batch of candidate placements at once. Uses the same region and overlap tests as
+        _is_valid_placement, but with BATCH_CHECK_TOL slack, so that every rejected candidate is
+        guaranteed to be invalid while accepted candidates still need to be verified exactly.
+
+        Returns:
+            2-tuple:
+                - (np.array) (N,) boolean array, False for candidates that are certainly outside the region
+                - (np.array) (N,) boolean array, False for candidates in the region that certainly
+                    overlap a placed object
+        """
+        cos, sin = np.cos(self.reference_rot), np.sin(self.reference_rot)
+        pos = np.stack(
+            [
+                relative_x * cos - relative_y * sin + base_offset[0],
+                relative_x * sin + relative_y * cos + base_offset[1],
+                np.full(len(relative_x), self.z_offset + base_offset[2]),
+            ],
+            axis=1,
+        )
+        if on_top:
+            pos[:, 2] -= obj.bottom_offset[-1]
+
+        quat = self._get_rot_quat(rot_angle)
+        if hasattr(obj, "init_quat"):
+            quat = _quat_multiply_batch(obj.init_quat, quat)
+        quat = _quat_multiply_batch(
+            convert_quat(ref_quat, to="xyzw"), quat[:, [1, 2, 3, 0]]
+        )
+
+        in_region = np.ones(len(pos), dtype=bool)
+        no_overlap = np.ones(len(pos), dtype=bool)
+        offsets = get_bbox_offsets(obj)
+        if offsets is not None:
+            points = np.einsum("nij,kj->nki", quat2mat_batch(quat), offsets)
+            points += pos[:, None]
+        else:
+            radius = obj.horizontal_radius
+            points = pos[:, None] + np.array(
+                [
+                    [radius, 0, 0],
+                    [-radius, 0, 0],
+                    [0, radius, 0],
+                    [0, -radius, 0],
+                ]
+            )
+
+        if self.ensure_object_boundary_in_range:
+            in_region = bboxes_in_region(
+                points,
+                p0=region_points[0],
+                px=region_points[1],
+                py=region_points[2],
+                tol=BATCH_CHECK_TOL,
+            )
+
+        if self.ensure_valid_placement and offsets is not None:
+            # objects without bounding boxes are left to the exact check
+            other_points = [
+                other_obj.get_bbox_points(
+                    trans=other_pos, rot=convert_quat(other_quat, to="xyzw")
+                )
+                for other_pos, other_quat, other_obj in placed_objects.values()
+                if get_bbox_offsets(other_obj) is not None
+            ]
+            if len(other_points) > 0:
+                intersect = bboxes_intersect(
+                    points[in_region], np.array(other_points), tol=BATCH_CHECK_TOL
+                )
+                no_overlap[in_region] = ~np.any(intersect, axis=1)
+
+        return in_region, no_overlap
+
+    def _sample_placement_sequential(
+        self, obj, base_offset, ref_quat, on_top, region_points, placed_objects
+    ):
+        """
+        Samples and checks one candidate placement at a time
+
+        Returns:
+            2-tuple or None: (pos, quat) of the first valid placement, or None if none was found
+        """
+        for i in range(MAX_PLACEMENT_TRIES):
+            # sample object coordinates
+            relative_x = self._sample_x()
+            relative_y = self._sample_y()
+            rot_angle = self._sample_rot_angle()
+
+            pos, quat = self._get_placement(
+                obj, relative_x, relative_y, rot_angle, base_offset, ref_quat, on_top
+            )
+            self.stats["candidates"] += 1
+            reason = self._get_rejection_reason(
+                obj, pos, quat, region_points, placed_objects
+            )
+            if reason is None:
+                return pos, quat
+            self.stats["rejected_" + reason] += 1
+
+        return None
+
+    def _sample_placement_batched(
+        self, obj, base_offset, ref_quat, on_top, region_points, placed_objects
+    ):
+        """
+        Samples candidate placements in batches of macros.PLACEMENT_BATCH_SIZE, discards the ones that
+        are certainly invalid with vectorized checks, and verifies the rest in order with the exact
+        checks. The accepted placement and the final rng state match _sample_placement_sequential.
+
+        Returns:
+            2-tuple or None: (pos, quat) of the first valid placement, or None if none was found
+        """
+        num_draws = self._num_draws_per_candidate()
+        num_tried = 0
+        while num_tried < MAX_PLACEMENT_TRIES:
+            batch_size = min(
+                macros.PLACEMENT_BATCH_SIZE, MAX_PLACEMENT_TRIES - num_tried
+            )
+            rng_state = self.rng.bit_generator.state
+            # rng.uniform(low, high) consumes one double per call, so a (batch, draws) block reproduces
+            # the same values the sequential sampler would have drawn for these candidates
+            draws = self.rng.random((batch_size, num_draws))
+            relative_x, relative_y, rot_angle = self._draws_to_samples(draws)
+
+            in_region, no_overlap = self._get_plausible_placements(
+                obj,
+                relative_x,
+                relative_y,
+                rot_angle,
+                base_offset,
+                ref_quat,
+                on_top,
+                region_points,
+                placed_objects,
+            )
+            placement = None
+            for i in np.flatnonzero(in_region & no_overlap):
+                pos, quat = self._get_placement(
+                    obj,
+                    relative_x[i],
+                    relative_y[i],
+                    rot_angle[i],
+                    base_offset,
+                    ref_quat,
+                    on_top,
+                )
+                reason = self._get_rejection_reason(
+                    obj, pos, quat, region_points, placed_objects
+                )
+                if reason is None:
+                    placement = (pos, quat)
+                    # rewind the rng to where it would be after drawing only the candidates up to this one
+                    self.rng.bit_generator.state = rng_state
+                    self.rng.random((i + 1) * num_draws)
+                    batch_size = i + 1
+                    break
+                self.stats["rejected_" + reason] += 1
+
+            # only count the candidates the sequential sampler would have drawn
+            self.stats["candidates"] += batch_size
+            self.stats["rejected_region"] += int(np.sum(~in_region[:batch_size]))
+            self.stats["rejected_overlap"] += int(
+                np.sum(in_region[:batch_size] & ~no_overlap[:batch_size])
+            )
+            if placement is not None:
+                return placement
 
-    def sample(self, placed_objects=None, reference=None, on_top=True):
+            num_tried += batch_size
+
+        return None
+
+    def _get_neighbors(self, obj, base_offset, placed_objects, placement_index):
+        """
+        Looks up the placed objects that candidate placements of @obj can possibly overlap. Candidate
+        centers always lie in the (rotated) x_range / y_range rectangle, so only objects whose footprint
+        overlaps that rectangle grown by the object's horizontal reach need to be checked.
+
+        Returns:
+            dict: subset of @placed_objects to check candidate placements against
+        """
+        offsets = get_bbox_offsets(obj)
+        if (
+            placement_index is None
+            or offsets is None
+            or not self.ensure_valid_placement
+        ):
+            return placed_objects
+
+        cos, sin = np.cos(self.reference_rot), np.sin(self.reference_rot)
+        corners = np.array(
+            [[x, y] for x in self.x_range for y in self.y_range], dtype=np.float64
+        )
+        corners = corners @ np.array([[cos, sin], [-sin, cos]]) + np.array(
+            base_offset[:2], dtype=np.float64
+        )
+        # candidates are rotated by the object's init_quat and the sampled rotation (about any axis), so
+        # the full 3d extent can end up in the footprint
+        reach = np.max(np.linalg.norm(offsets, axis=1))
+        names = placement_index.query(
+            corners.min(axis=0) - reach, corners.max(axis=0) + reach
+        )
+
+        # objects missing from the index (e.g. without bounding boxes) are always checked
+        neighbors = {
+            name: placement
+            for (name, placement) in placed_objects.items()
+            if name in names or name not in placement_index
+        }
+        self.stats["neighbors_checked"] += len(neighbors)
+        self.stats["neighbors_skipped"] += len(placed_objects) - len(neighbors)
+        return neighbors
+
+    def _can_sample_batched(self):
+        return (
+            macros.VECTORIZE_PLACEMENT_SAMPLING
+            and isinstance(self.rng, np.random.Generator)
+            and (self.ensure_object_boundary_in_range or self.ensure_valid_placement)
+            and self._num_draws_per_candidate() is not None
+        )
+
+    def sample(
+        self, placed_objects=None, reference=None, on_top=True, placement_index=None
+    ):
         """
         Uniformly sample relative to this sampler's reference_pos or @reference (if specified).
 
@@ -284,6 +682,9 @@ class UniformRandomSampler(ObjectPositionSampler):
                 z-offset of the current sampled object's bottom_offset + the reference object's top_offset
                 (if specified)
 
+            placement_index (None or PlacementIndex): if provided, spatial index over @placed_objects used to
+                only check candidates against nearby objects. Newly placed objects are added to it
+
         Return:
             dict: dictionary of all object placements, mapping object_names to (pos, quat, obj), including the
                 placements specified in @fixtures. Note quat is in (w,x,y,z) form
@@ -343,76 +744,153 @@ class UniformRandomSampler(ObjectPositionSampler):
                 )
             region_points += base_offset
 
-            for i in range(5000):  # 5000 retries
-                # sample object coordinates
-                relative_x = self._sample_x()
-                relative_y = self._sample_y()
-
-                # apply rotation
-                object_x, object_y = rotate_2d_point(
-                    [relative_x, relative_y], rot=self.reference_rot
+            neighbors = self._get_neighbors(
+                obj, base_offset, placed_objects, placement_index
+            )
+            if self._can_sample_batched():
+                placement = self._sample_placement_batched(
+                    obj, base_offset, ref_quat, on_top, region_points, neighbors
                 )
-
-                object_x = object_x + base_offset[0]
-                object_y = object_y + base_offset[1]
-                object_z = self.z_offset + base_offset[2]
-                if on_top:
-                    object_z -= obj.bottom_offset[-1]
-
-                # random rotation
-                quat = self._sample_quat()
-                # multiply this quat by the object's initial rotation if it has the attribute specified
-                if hasattr(obj, "init_quat"):
-                    quat = quat_multiply(obj.init_quat, quat)
-                quat = convert_quat(
-                    quat_multiply(
-                        convert_quat(ref_quat, to="xyzw"),
-                        convert_quat(quat, to="xyzw"),
-                    ),
-                    to="wxyz",
+            else:
+                placement = self._sample_placement_sequential(
+                    obj, base_offset, ref_quat, on_top, region_points, neighbors
                 )
 
-                location_valid = True
-
-                # ensure object placed fully in region
-                if self.ensure_object_boundary_in_range and not obj_in_region(
-                    obj,
-                    obj_pos=[object_x, object_y, object_z],
-                    obj_quat=convert_quat(quat, to="xyzw"),
-                    p0=region_points[0],
-                    px=region_points[1],
-                    py=region_points[2],
-                ):
-                    location_valid = False
-                    continue
-
-                # objects cannot overlap
-                if self.ensure_valid_placement:
-                    for (x, y, z), other_quat, other_obj in placed_objects.values():
-                        if objs_intersect(
-                            obj=obj,
-                            obj_pos=[object_x, object_y, object_z],
-                            obj_quat=convert_quat(quat, to="xyzw"),
-                            other_obj=other_obj,
-                            other_obj_pos=[x, y, z],
-                            other_obj_quat=convert_quat(other_quat, to="xyzw"),
-                        ):
-                            location_valid = False
-                            break
-
-                if location_valid:
-                    # location is valid, put the object down
-                    pos = (object_x, object_y, object_z)
-                    placed_objects[obj.name] = (pos, quat, obj)
-                    success = True
-                    break
+            if placement is not None:
+                # location is valid, put the object down
+                pos, quat = placement
+                placed_objects[obj.name] = (pos, quat, obj)
+                if placement_index is not None:
+                    placement_index.add(obj.name, placed_objects[obj.name])
+                self.stats["placed"] += 1
+                success = True
 
             if not success:
+                self.stats["failed"] += 1
                 raise RandomizationError("Cannot place all objects ):")
 
         return placed_objects
 
 
+class PlacementIndex:
+    """
+    Uniform 2D grid over the xy footprints (axis-aligned bounds of the bounding box points) of placed
+    objects. Lets samplers look up the placed objects near a sampling region instead of checking
+    candidates against every fixture in the scene. Objects without bounding boxes are not indexed.
+
+    Args:
+        cell_size (float): side length of the grid cells, in meters
+    """
+
+    def __init__(self, cell_size=0.5):
+        self.cell_size = cell_size
+        self._cells = collections.defaultdict(set)
+        self._footprints = dict()
+
+    def __contains__(self, name):
+        return name in self._footprints
+
+    def __len__(self):
+        return len(self._footprints)
+
+    def _get_cells(self, lo, hi):
+        lo = np.floor(np.asarray(lo) / self.cell_size).astype(int)
+        hi = np.floor(np.asarray(hi) / self.cell_size).astype(int)
+        return [
+            (i, j) for i in range(lo[0], hi[0] + 1) for j in range(lo[1], hi[1] + 1)
+        ]
+
+    def add(self, name, placement):
+        """
+        Adds (or moves) a placed object
+
+        Args:
+            name (str): name of the placed object
+
+            placement (tuple): (pos, quat, obj) placement, with quat in (w,x,y,z) form
+        """
+        self.remove(name)
+        pos, quat, obj = placement
+        offsets = get_bbox_offsets(obj)
+        if offsets is None:
+            return
+        rot = quat2mat_batch(convert_quat(np.array(quat), to="xyzw")[None])[0]
+        points = (offsets @ rot.T + np.array(pos))[:, :2]
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        if not (np.all(np.isfinite(lo)) and np.all(np.isfinite(hi))):
+            return
+        self._footprints[name] = (lo, hi)
+        for cell in self._get_cells(lo, hi):
+            self._cells[cell].add(name)
+
+    def update(self, placed_objects):
+        """
+        Adds all placements that are not indexed yet
+
+        Args:
+            placed_objects (dict): maps object names to (pos, quat, obj) placements
+        """
+        for name, placement in placed_objects.items():
+            if name not in self._footprints:
+                self.add(name, placement)
+
+    def remove(self, name):
+        """
+        Removes a placed object from the index, if present
+        """
+        footprint = self._footprints.pop(name, None)
+        if footprint is None:
+            return
+        for cell in self._get_cells(*footprint):
+            self._cells[cell].discard(name)
+
+    def query(self, lo, hi):
+        """
+        Finds the indexed objects whose footprint overlaps an axis-aligned box
+
+        Args:
+            lo (2-array): minimum (x,y) corner of the box
+
+            hi (2-array): maximum (x,y) corner of the box
+
+        Returns:
+            set: names of the overlapping objects
+        """
+        cells = self._get_cells(lo, hi)
+        if len(cells) > len(self._cells):
+            names = set(self._footprints.keys())
+        else:
+            names = set()
+            for cell in cells:
+                names.update(self._cells.get(cell, ()))
+        return set(
+            name
+            for name in names
+            if np.all(self._footprints[name][0] <= hi)
+            and np.all(lo <= self._footprints[name][1])
+        )
+
+
+def _quat_multiply_batch(quaternion1, quaternion0):
+    """
+    Vectorized version of robosuite's quat_multiply. Both arguments are (..., 4) arrays interpreted
+    in (x,y,z,w) form and are broadcast against each other.
+    """
+    quaternion1 = np.asarray(quaternion1, dtype=np.float64)
+    quaternion0 = np.asarray(quaternion0, dtype=np.float64)
+    x0, y0, z0, w0 = np.moveaxis(quaternion0, -1, 0)
+    x1, y1, z1, w1 = np.moveaxis(quaternion1, -1, 0)
+    return np.stack(
+        [
+            x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+            -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+            x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+            -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+        ],
+        axis=-1,
+    )
+
+
 class SequentialCompositeSampler(ObjectPositionSampler):
     """
     Samples position for each object sequentially. Allows chaining
@@ -451,6 +929,24 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         self.samplers[sampler.name] = sampler
         self.sample_args[sampler.name] = sample_args
 
+    def reset_stats(self):
+        """
+        Resets the sampling statistics of this sampler and all sub-samplers
+        """
+        super().reset_stats()
+        for sampler in self.samplers.values():
+            sampler.reset_stats()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: maps the name of each sub-sampler to its sampling statistics
+        """
+        stats = dict()
+        for sampler in self.samplers.values():
+            stats.update(sampler.get_stats())
+        return stats
+
     def hide(self, mujoco_objects):
         """
         Helper method to remove an object from the workspace.
@@ -515,7 +1011,9 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         for sampler in self.samplers.values():
             sampler.reset()
 
-    def sample(self, placed_objects=None, reference=None, on_top=True):
+    def sample(
+        self, placed_objects=None, reference=None, on_top=True, placement_index=None
+    ):
         """
         Sample from each placement initializer sequentially, in the order
         that they were appended.
@@ -535,6 +1033,9 @@ class SequentialCompositeSampler(ObjectPositionSampler):
                 z-offset of the current sampled object's bottom_offset + the reference object's top_offset
                 (if specified)
 
+            placement_index (None or PlacementIndex): spatial index over @placed_objects shared by all
+                sub-samplers. If None, a new one is built (unless macros.PLACEMENT_INDEX_CELL_SIZE is None)
+
         Return:
             dict: dictionary of all object placements, mapping object_names to (pos, quat, obj), including the
                 placements specified in @fixtures. Note quat is in (w,x,y,z) form
@@ -546,6 +1047,11 @@ class SequentialCompositeSampler(ObjectPositionSampler):
         placed_objects = {} if placed_objects is None else copy(placed_objects)
         placed_names = set(placed_objects.keys())
 
+        if placement_index is None and macros.PLACEMENT_INDEX_CELL_SIZE is not None:
+            placement_index = PlacementIndex(cell_size=macros.PLACEMENT_INDEX_CELL_SIZE)
+        if placement_index is not None:
+            placement_index.update(placed_objects)
+
         # Iterate through all samplers to sample
         for sampler, s_args in zip(self.samplers.values(), self.sample_args.values()):
             # Pre-process sampler args
@@ -557,9 +1063,13 @@ class SequentialCompositeSampler(ObjectPositionSampler):
                 if arg_name not in s_args:
                     s_args[arg_name] = arg
             # Run sampler
-            new_placements = sampler.sample(placed_objects=placed_objects, **s_args)
+            new_placements = sampler.sample(
+                placed_objects=placed_objects, placement_index=placement_index, **s_args
+            )
             # Update placements
             placed_objects.update(new_placements)
+            if placement_index is not None:
+                placement_index.update(new_placements)
 
         # only return placements for newly placed objects
         sampled_obj_names = [
@@ -594,6 +1104,8 @@ class MultiRegionSampler(ObjectPositionSampler):
                 "Invalid value for side, must be one of:", self.valid_sides
             )
 
+        self.name = name
+
         # initialize sides and regions
         if side in self.sides_combinations:
             self.sides = self.sides_combinations[side]
@@ -620,7 +1132,28 @@ class MultiRegionSampler(ObjectPositionSampler):
             )
             self.samplers.append(sampler)
 
-    def sample(self, fixtures=None, reference=None, on_top=True):
+    def reset_stats(self):
+        for sampler in self.samplers:
+            sampler.reset_stats()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: maps the name of this sampler to the statistics merged over its per-region samplers
+        """
+        stats = collections.Counter()
+        for sampler in self.samplers:
+            stats.update(sampler.stats)
+        return {self.name: dict(stats)}
+
+    def sample(
+        self, placed_objects=None, reference=None, on_top=True, placement_index=None
+    ):
         # randomly picks a sampler and calls its sample function
         sampler = self.rng.choice(self.samplers)
-        return sampler.sample(fixtures=fixtures, reference=reference, on_top=on_top)
+        return sampler.sample(
+            placed_objects=placed_objects,
+            reference=reference,
+            on_top=on_top,
+            placement_index=placement_index,
+        )
@@ -0,0 +1,236 @@
+"""
+Cache of decoded textures shared across processes. Each png texture is decoded once into a raw RGB file
+in MuJoCo's custom texture format (int32 width, int32 height, then width * height * 3 bytes), keyed by
+the path and modification time of the png. Model xmls can point their textures to the cached files
+(use_cached_textures), so that compiling a model copies pixels instead of decoding pngs. The cached files
+can also be memory-mapped (DecodedTextureCache.get), so that all processes on a machine share one copy
+of the pixels through the page cache.
+
+Cached paths mirror the absolute path of the original png under the cache folder, with the modification
+time and a .rgb extension appended:
+
+    <cache_dir>/<abs path of png>.<mtime_ns>.rgb
+
+so that model xmls saved with cached textures can be mapped back to the pngs (restore_texture_paths).
+"""
+
+import os
+import re
+
+import numpy as np
+
+import robocasa.macros as macros
+
+TEXTURE_CACHE_EXT = ".rgb"
+
+# number of bytes of the (width, height) header of cached files
+HEADER_SIZE = 8
+
+# png modes that decode to the same pixels MuJoCo would load (RGB, alpha dropped)
+SUPPORTED_MODES = ("RGB", "RGBA", "L", "LA", "P")
+
+_CACHED_PATH_RE = re.compile(r"\.\d+" + re.escape(TEXTURE_CACHE_EXT) + "$")
+
+
+def get_texture_cache_dir():
+    """
+    Returns:
+        str: folder of the decoded-texture cache
+    """
+    return macros.TEXTURE_CACHE_DIR or os.path.join(
+        os.path.expanduser("~"), ".cache", "robocasa", "textures"
+    )
+
+
+def decode_texture(tex_path):
+    """
+    Decodes a png texture the way MuJoCo loads it
+
+    Args:
+        tex_path (str): path to the png
+
+    Returns:
+        np.array or None: (H, W, 3) uint8 pixels, or None if the png can't be cached (e.g. 16-bit)
+    """
+    from PIL import Image
+
+    with Image.open(tex_path) as img:
+        if img.mode not in SUPPORTED_MODES:
+            return None
+        return np.asarray(img.convert("RGB"), dtype=np.uint8)
+
+
+def write_texture(path, pixels):
+    """
+    Writes pixels in MuJoCo's custom texture format
+
+    Args:
+        path (str): path to write to
+
+        pixels (np.array): (H, W, 3) uint8 pixels
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(np.array([pixels.shape[1], pixels.shape[0]], dtype=np.int32).tobytes())
+        f.write(np.ascontiguousarray(pixels, dtype=np.uint8).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_texture(path):
+    """
+    Memory-maps a texture written with write_texture
+
+    Args:
+        path (str): path of the cached texture
+
+    Returns:
+        np.memmap: read-only (H, W, 3) uint8 pixels
+    """
+    width, height = np.fromfile(path, dtype=np.int32, count=2)
+    return np.memmap(
+        path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=(height, width, 3)
+    )
+
+
+class DecodedTextureCache:
+    """
+    Decoded-texture cache in a folder shared by all processes on a machine. Textures are decoded on first
+    use; cached files are written atomically, so concurrent workers may decode the same texture but never
+    read a partial file.
+
+    Args:
+        cache_dir (str): folder of the cache. None for get_texture_cache_dir()
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or get_texture_cache_dir()
+        # maps png paths to (mtime, cached path or None if not cacheable)
+        self._cached_paths = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_cache_path(self, tex_path, mtime_ns=None):
+        """
+        Returns:
+            str: path of the cached texture for png @tex_path
+        """
+        tex_path = os.path.abspath(tex_path)
+        if mtime_ns is None:
+            mtime_ns = os.stat(tex_path).st_mtime_ns
+        return os.path.join(self.cache_dir, tex_path.lstrip(os.sep)) + ".{}{}".format(
+            mtime_ns, TEXTURE_CACHE_EXT
+        )
+
+    def get_file(self, tex_path):
+        """
+        Looks up the cached texture for a png, decoding it if it is not cached yet
+
+        Args:
+            tex_path (str): path to the png
+
+        Returns:
+            str or None: path of the cached texture, or None if the png can't be cached
+        """
+        mtime_ns = os.stat(tex_path).st_mtime_ns
+        cached = self._cached_paths.get(tex_path, None)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        cache_path = self.get_cache_path(tex_path, mtime_ns=mtime_ns)
+        if os.path.exists(cache_path):
+            self.hits += 1
+        else:
+            self.misses += 1
+            pixels = decode_texture(tex_path)
+            if pixels is None:
+                cache_path = None
+            else:
+                write_texture(cache_path, pixels)
+        self._cached_paths[tex_path] = (mtime_ns, cache_path)
+        return cache_path
+
+    def get(self, tex_path):
+        """
+        Returns:
+            np.memmap or None: read-only (H, W, 3) decoded pixels of png @tex_path, or None if the png
+                can't be cached
+        """
+        cache_path = self.get_file(tex_path)
+        if cache_path is None:
+            return None
+        return read_texture(cache_path)
+
+
+_TEXTURE_CACHE = None
+
+
+def get_texture_cache():
+    """
+    Returns:
+        DecodedTextureCache: the process-wide decoded-texture cache
+    """
+    global _TEXTURE_CACHE
+    if _TEXTURE_CACHE is None or _TEXTURE_CACHE.cache_dir != get_texture_cache_dir():
+        _TEXTURE_CACHE = DecodedTextureCache()
+    return _TEXTURE_CACHE
+
+
+def use_cached_textures(root, cache=None):
+    """
+    Points the png textures of a parsed model xml to their cached decoded files, decoding them if needed
+
+    Args:
+        root (ET.Element): root of the model xml
+
+        cache (DecodedTextureCache): cache to use. None for the process-wide cache
+
+    Returns:
+        int: number of textures pointed to the cache
+    """
+    cache = cache or get_texture_cache()
+    num_cached = 0
+    asset = root.find("asset")
+    if asset is None:
+        return num_cached
+    for tex in asset.findall("texture"):
+        tex_path = tex.get("file")
+        if (
+            tex_path is None
+            or not tex_path.lower().endswith(".png")
+            or not os.path.exists(tex_path)
+        ):
+            continue
+        cache_path = cache.get_file(tex_path)
+        if cache_path is not None:
+            tex.set("file", cache_path)
+            num_cached += 1
+    return num_cached
+
+
+def restore_texture_paths(root):
+    """
+    Points textures of a parsed model xml that were loaded from the cache back to their pngs
+
+    Args:
+        root (ET.Element): root of the model xml
+
+    Returns:
+        int: number of restored textures
+    """
+    num_restored = 0
+    asset = root.find("asset")
+    if asset is None:
+        return num_restored
+    cache_dir = get_texture_cache_dir()
+    for tex in asset.findall("texture"):
+        tex_path = tex.get("file")
+        if tex_path is None or _CACHED_PATH_RE.search(tex_path) is None:
+            continue
+        tex_path = _CACHED_PATH_RE.sub("", tex_path)
+        # paths cached on other machines are relocated like any other asset path afterwards
+        if tex_path.startswith(cache_dir + os.sep):
+            tex_path = tex_path[len(cache_dir) :]
+        tex.set("file", tex_path)
+        num_restored += 1
+    return num_restored
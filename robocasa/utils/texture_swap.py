@@ -2,11 +2,12 @@ import inspect
 import os
 import random
 from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
 
+import mujoco
 import numpy as np
 from lxml import etree as ET
-from robosuite.utils.mjcf_utils import find_elements
 
 import robocasa
 
@@ -443,7 +444,29 @@ def get_random_textures(rng, frac=1.0):
 
     end_ind = int(frac * 100)
     ind = rng.integers(0, end_ind)
+    return _get_textures(ind)
 
+
+def get_texture_candidates(rng, num_candidates, frac=1.0):
+    """
+    Samples distinct sets of random textures, e.g. to compile into texture slots (see add_texture_slots)
+
+    Args:
+        rng (np.random.Generator): Random number generator used for texture selection
+
+        num_candidates (int): Number of texture sets to sample
+
+        frac (float): Fraction of textures to select from the list of available textures
+
+    Returns:
+        list: list of texture dicts, as returned by get_random_textures
+    """
+    end_ind = int(frac * 100)
+    inds = rng.choice(end_ind, size=min(num_candidates, end_ind), replace=False)
+    return [_get_textures(ind) for ind in inds]
+
+
+def _get_textures(ind):
     textures = dict(
         cab_tex=os.path.join(TEXTURES_DIR, "cabinet", CABINET_TEX_NAMES[ind]),
         counter_tex=os.path.join(TEXTURES_DIR, "counter", COUNTER_TOP_TEX_NAMES[ind]),
@@ -454,6 +477,338 @@ def get_random_textures(rng, frac=1.0):
     return textures
 
 
+# names of the textures the generative textures are loaded into
+CAB_TEX_NAME_2D = "cab_replacement_texture_2d"
+CAB_TEX_NAME_CUBE = "cab_replacement_texture_cube"
+CTOP_TEX_NAME = "counter_top_replacement_texture"
+FLOOR_TEX_NAME = "floor_replacement_texture"
+WALL_TEX_NAME = "wall_replacement_texture"
+
+
+@lru_cache(maxsize=None)
+def get_material_roles(name):
+    """
+    Matches a material name against the generative texture rules. Memoized, since the same material
+    names recur across scenes and resets.
+
+    Args:
+        name (str): material name
+
+    Returns:
+        dict: maps roles ("cab", "counter_top", "floor", "wall") to the replacement texture name the
+            material is pointed to
+    """
+    roles = dict()
+    if name is None:
+        return roles
+
+    # cabinets and counter bases
+    if "counter_base" in name:
+        roles["cab"] = CAB_TEX_NAME_CUBE
+    elif "housing" in name:
+        roles["cab"] = CAB_TEX_NAME_CUBE
+    elif (
+        "stack" in name
+        or "cab" in name
+        or "shelves" in name
+        or "bottom" in name
+        or ("top" in name and "counter" not in name and "stove" not in name)
+    ):
+        if "handle" in name or "transparent" in name:
+            pass
+        elif "door" in name:
+            roles["cab"] = CAB_TEX_NAME_2D
+        elif "shelves" in name:
+            roles["cab"] = CAB_TEX_NAME_2D
+        else:
+            roles["cab"] = CAB_TEX_NAME_CUBE
+
+    if "counter_top" in name:
+        roles["counter_top"] = CTOP_TEX_NAME
+    if "floor" in name and "backing" not in name:
+        roles["floor"] = FLOOR_TEX_NAME
+    if "wall" in name and "floor" not in name and "backing" not in name:
+        roles["wall"] = WALL_TEX_NAME
+    return roles
+
+
+def _get_texture_file(texture_file):
+    # texture files may be given relative to the generative textures folder
+    return str(os.path.join(TEXTURES_DIR, texture_file))
+
+
+def _set_cab_textures(asset, materials, textures_by_name, texture_file):
+    for (tex_name, tex_type) in ((CAB_TEX_NAME_2D, "2d"), (CAB_TEX_NAME_CUBE, "cube")):
+        if tex_name in textures_by_name:
+            textures_by_name[tex_name][0].set("file", texture_file)
+        else:
+            # create the element through the tree, so that it works for both lxml and xml.etree trees
+            tex = asset.makeelement(
+                "texture", dict(type=tex_type, name=tex_name, file=texture_file)
+            )
+            asset.append(tex)
+            textures_by_name[tex_name] = [tex]
+
+    for (mat, roles) in materials:
+        if "cab" in roles:
+            mat.set("texture", roles["cab"])
+
+
+def _set_role_texture(
+    materials, textures_by_name, role, texture_file, tex_type=None, texrepeat=None
+):
+    role_materials = [mat for (mat, roles) in materials if role in roles]
+
+    # step 1: find the name of texture that will be replaced
+    assert len(role_materials) > 0
+    old_tex_name = role_materials[0].get("texture")
+    assert old_tex_name is not None
+
+    # step 2: rename the texture element and load the new file into it
+    new_tex_name = get_material_roles(role_materials[0].get("name"))[role]
+    for tex in textures_by_name.pop(old_tex_name, []):
+        tex.set("name", new_tex_name)
+        tex.set("file", texture_file)
+        if tex_type is not None:
+            tex.set("type", tex_type)
+        textures_by_name.setdefault(new_tex_name, []).append(tex)
+
+    # step 3: reference new textures in materials
+    for mat in role_materials:
+        mat.set("texture", new_tex_name)
+        if texrepeat is not None:
+            mat.set("texrepeat", texrepeat)
+
+
+def set_generative_textures(asset, textures):
+    """
+    Replaces the cabinet, counter top, wall and floor textures of a parsed model xml in place. Materials
+    and textures are indexed in a single pass over the asset element, and all replacements are applied
+    on that index, with the same results as applying replace_cab_textures, replace_counter_top_texture,
+    replace_wall_texture and replace_floor_texture in that order.
+
+    Args:
+        asset (ET.Element): asset element of the model xml (lxml or xml.etree)
+
+        textures (dict): texture files, as returned by get_random_textures. Keys that are missing
+            (cab_tex, counter_tex, wall_tex, floor_tex) are left unchanged. Files may be given relative
+            to the generative textures folder
+    """
+    materials = []
+    textures_by_name = dict()
+    for elem in asset:
+        if elem.tag == "material":
+            materials.append((elem, get_material_roles(elem.get("name"))))
+        elif elem.tag == "texture":
+            textures_by_name.setdefault(elem.get("name"), []).append(elem)
+
+    if "cab_tex" in textures:
+        _set_cab_textures(
+            asset, materials, textures_by_name, _get_texture_file(textures["cab_tex"])
+        )
+    if "counter_tex" in textures:
+        _set_role_texture(
+            materials,
+            textures_by_name,
+            role="counter_top",
+            texture_file=_get_texture_file(textures["counter_tex"]),
+        )
+    if "wall_tex" in textures:
+        _set_role_texture(
+            materials,
+            textures_by_name,
+            role="wall",
+            texture_file=_get_texture_file(textures["wall_tex"]),
+            tex_type="2d",
+            texrepeat="3 3",
+        )
+    if "floor_tex" in textures:
+        _set_role_texture(
+            materials,
+            textures_by_name,
+            role="floor",
+            texture_file=_get_texture_file(textures["floor_tex"]),
+            tex_type="2d",
+            texrepeat="2 2",
+        )
+
+
+def apply_generative_textures(xml, textures, return_str=None):
+    """
+    Replaces the cabinet, counter top, wall and floor textures of a model xml in one pass
+    (see set_generative_textures).
+
+    Args:
+        xml (str or ET.Element): model xml string, or root of a parsed model xml (modified in place)
+
+        textures (dict): texture files, as returned by get_random_textures
+
+        return_str (bool): whether to return a string or the root element. Defaults to the type of @xml
+
+    Returns:
+        str or ET.Element: model xml with the new textures
+    """
+    if return_str is None:
+        return_str = isinstance(xml, str)
+    root = ET.fromstring(xml) if isinstance(xml, str) else xml
+    set_generative_textures(root.find("asset"), textures)
+    if return_str:
+        return ET.tostring(root).decode("utf-8")
+    return root
+
+
+# suffix of the spare textures compiled into a model for runtime texture swaps
+TEXTURE_SLOT_SUFFIX = "_slot"
+
+# key of the texture dict (see get_random_textures) each replacement texture is loaded from
+REPLACEMENT_TEX_KEYS = {
+    CAB_TEX_NAME_2D: "cab_tex",
+    CAB_TEX_NAME_CUBE: "cab_tex",
+    CTOP_TEX_NAME: "counter_tex",
+    FLOOR_TEX_NAME: "floor_tex",
+    WALL_TEX_NAME: "wall_tex",
+}
+
+
+def get_texture_slot_name(tex_name, slot):
+    """
+    Returns:
+        str: name of the texture holding replacement texture @tex_name in texture slot @slot
+    """
+    if slot == 0:
+        return tex_name
+    return "{}{}{}".format(tex_name, TEXTURE_SLOT_SUFFIX, slot)
+
+
+def add_texture_slots(asset, candidates):
+    """
+    Applies the first set of textures to a parsed model xml (see set_generative_textures) and adds the
+    other sets as spare textures, so that the compiled model can switch between them at runtime with
+    TextureSlotSwapper.
+
+    Args:
+        asset (ET.Element): asset element of the model xml (lxml or xml.etree)
+
+        candidates (list): texture dicts, as returned by get_texture_candidates. Slot i holds candidates[i]
+    """
+    set_generative_textures(asset, candidates[0])
+    replacement_textures = [
+        elem
+        for elem in asset
+        if elem.tag == "texture" and elem.get("name") in REPLACEMENT_TEX_KEYS
+    ]
+    for slot in range(1, len(candidates)):
+        for tex in replacement_textures:
+            attrib = dict(tex.attrib)
+            attrib["name"] = get_texture_slot_name(tex.get("name"), slot)
+            attrib["file"] = _get_texture_file(
+                candidates[slot][REPLACEMENT_TEX_KEYS[tex.get("name")]]
+            )
+            asset.append(asset.makeelement("texture", attrib))
+
+
+def remove_texture_slots(asset, active_textures=None):
+    """
+    Removes the spare textures added by add_texture_slots from a parsed model xml
+
+    Args:
+        asset (ET.Element): asset element of the model xml (lxml or xml.etree)
+
+        active_textures (dict): (optional) texture dict of the slot that was active, to apply to the
+            remaining replacement textures. If None, the textures of the first slot are kept
+
+    Returns:
+        bool: True if the model had texture slots
+    """
+    slot_textures = [
+        elem
+        for elem in asset
+        if elem.tag == "texture" and TEXTURE_SLOT_SUFFIX in (elem.get("name") or "")
+    ]
+    for tex in slot_textures:
+        asset.remove(tex)
+    if len(slot_textures) > 0 and active_textures:
+        set_generative_textures(asset, active_textures)
+    return len(slot_textures) > 0
+
+
+class TextureSlotSwapper:
+    """
+    Switches between the texture slots added by add_texture_slots on a compiled model by re-pointing the
+    texture ids of the materials that use the replacement textures (mat_texid). The change shows at the next
+    render, without recompiling the model. All slots are uploaded to the renderer with the model, so this
+    trades texture memory for reset time.
+
+    Args:
+        model (mujoco.MjModel): compiled model
+
+        num_slots (int): number of texture slots compiled into the model
+    """
+
+    def __init__(self, model, num_slots):
+        self.model = model
+        self.num_slots = num_slots
+        self.slot = 0
+
+        # for each replacement texture: the mat_texid entries pointing to it, and its texture id in each slot
+        self._mat_texids = []
+        for tex_name in REPLACEMENT_TEX_KEYS:
+            tex_ids = np.array(
+                [
+                    mujoco.mj_name2id(
+                        model,
+                        mujoco.mjtObj.mjOBJ_TEXTURE,
+                        get_texture_slot_name(tex_name, slot),
+                    )
+                    for slot in range(num_slots)
+                ]
+            )
+            if tex_ids[0] < 0:
+                continue
+            assert np.all(tex_ids >= 0), "missing texture slots for {}".format(tex_name)
+            # mat_texid is (nmat,) in older mujoco versions and (nmat, mjNTEXROLE) in newer ones
+            locs = np.nonzero(np.asarray(model.mat_texid) == tex_ids[0])
+            self._mat_texids.append((locs, tex_ids))
+
+    def set_slot(self, slot):
+        """
+        Points the materials to the textures of slot @slot
+        """
+        assert 0 <= slot < self.num_slots
+        for (locs, tex_ids) in self._mat_texids:
+            self.model.mat_texid[locs] = tex_ids[slot]
+        self.slot = slot
+
+
+def set_counter_top_texture(asset, new_counter_top_texture_file):
+    """
+    Replaces the counter top texture of a parsed model xml in place (see set_generative_textures).
+    """
+    set_generative_textures(asset, dict(counter_tex=new_counter_top_texture_file))
+
+
+def set_cab_textures(asset, new_cab_texture_file):
+    """
+    Replaces the cabinet and counter base textures of a parsed model xml in place
+    (see set_generative_textures).
+    """
+    set_generative_textures(asset, dict(cab_tex=new_cab_texture_file))
+
+
+def set_floor_texture(asset, new_floor_texture_file):
+    """
+    Replaces the floor texture of a parsed model xml in place (see set_generative_textures).
+    """
+    set_generative_textures(asset, dict(floor_tex=new_floor_texture_file))
+
+
+def set_wall_texture(asset, new_wall_texture_file):
+    """
+    Replaces the wall texture of a parsed model xml in place (see set_generative_textures).
+    """
+    set_generative_textures(asset, dict(wall_tex=new_wall_texture_file))
+
+
 def replace_counter_top_texture(
     rng, initial_state: str, new_counter_top_texture_file: str = None
 ):
@@ -468,41 +823,11 @@ def replace_counter_top_texture(
         new_counter_top_texture_file (str): New texture file for counter top: i.e "marble/dark_marble.png"
             If None (default), will replace with a random texture from marble directory
     """
-
-    root = ET.fromstring(initial_state)
-    asset = root.find("asset")
-
     if new_counter_top_texture_file is None:
         new_counter_top_texture_file = get_random_textures(rng)["counter_tex"]
-    else:
-        new_counter_top_texture_file = os.path.join(
-            TEXTURES_DIR, new_counter_top_texture_file
-        )
-
-    # step 1: find the name of texture that will be replaced
-    counter_tex_name = None
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "counter_top" in name:
-            counter_tex_name = mat.get("texture")
-            break
-    assert counter_tex_name is not None
-
-    # step 2: find and replace texture element
-    CTOP_TEX_NAME = "counter_top_replacement_texture"
-    for tex in asset.findall("texture"):
-        name = tex.get("name")
-        if name == counter_tex_name:
-            tex.set("name", CTOP_TEX_NAME)
-            tex.set("file", str(new_counter_top_texture_file))
-
-    # step 3: reference new textures in materials
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "counter_top" in name:
-            mat.set("texture", CTOP_TEX_NAME)
-
-    return ET.tostring(root).decode("utf-8")
+    return apply_generative_textures(
+        initial_state, dict(counter_tex=new_counter_top_texture_file)
+    )
 
 
 def replace_cab_textures(rng, initial_state: str, new_cab_texture_file: str = None):
@@ -517,65 +842,9 @@ def replace_cab_textures(rng, initial_state: str, new_cab_texture_file: str = No
         new_cab_texture_file (str): New texture file for counter base and cabinets: i.e "cabinet/..."
             If None (default), will replace with a random texture from flat or wood directories
     """
-
-    root = ET.fromstring(initial_state)
-    asset = root.find("asset")
-
     if new_cab_texture_file is None:
         new_cab_texture_file = get_random_textures(rng)["cab_tex"]
-    else:
-        new_cab_texture_file = os.path.join(TEXTURES_DIR, new_cab_texture_file)
-
-    CAB_TEX_NAME_2D = "cab_replacement_texture_2d"
-    tex_2d = find_elements(
-        asset, tags="texture", attribs={"name": CAB_TEX_NAME_2D}, return_first=True
-    )
-    if tex_2d is not None:
-        tex_2d.set("file", str(new_cab_texture_file))
-    else:
-        tex_2d = ET.Element(
-            "texture", type="2d", name=CAB_TEX_NAME_2D, file=str(new_cab_texture_file)
-        )
-        asset.append(tex_2d)
-
-    CAB_TEX_NAME_CUBE = "cab_replacement_texture_cube"
-    tex_cube = find_elements(
-        asset, tags="texture", attribs={"name": CAB_TEX_NAME_CUBE}, return_first=True
-    )
-    if tex_cube is not None:
-        tex_cube.set("file", str(new_cab_texture_file))
-    else:
-        tex_cube = ET.Element(
-            "texture",
-            type="cube",
-            name=CAB_TEX_NAME_CUBE,
-            file=str(new_cab_texture_file),
-        )
-        asset.append(tex_cube)
-
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "counter_base" in name:
-            mat.set("texture", CAB_TEX_NAME_CUBE)
-        elif "housing" in name:
-            mat.set("texture", CAB_TEX_NAME_CUBE)
-        elif (
-            "stack" in name
-            or "cab" in name
-            or "shelves" in name
-            or "bottom" in name
-            or ("top" in name and "counter" not in name and "stove" not in name)
-        ):
-            if "handle" in name or "transparent" in name:
-                continue
-            elif "door" in name:
-                mat.set("texture", CAB_TEX_NAME_2D)
-            elif "shelves" in name:
-                mat.set("texture", CAB_TEX_NAME_2D)
-            else:
-                mat.set("texture", CAB_TEX_NAME_CUBE)
-
-    return ET.tostring(root).decode("utf-8")
+    return apply_generative_textures(initial_state, dict(cab_tex=new_cab_texture_file))
 
 
 def replace_floor_texture(rng, initial_state: str, new_floor_texture_file: str = None):
@@ -590,41 +859,11 @@ def replace_floor_texture(rng, initial_state: str, new_floor_texture_file: str =
         new_floor_texture_file (str): New texture file for counter top: i.e "wood/dark_wood_planks_2.png"
             If None (default), will replace with a random texture from wood directory
     """
-
-    root = ET.fromstring(initial_state)
-    asset = root.find("asset")
-
     if new_floor_texture_file is None:
         new_floor_texture_file = get_random_textures(rng)["floor_tex"]
-    else:
-        new_floor_texture_file = os.path.join(TEXTURES_DIR, new_floor_texture_file)
-
-    # step 1: find the name of texture that will be replaced
-    floor_tex_name = None
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "floor" in name and "backing" not in name:
-            floor_tex_name = mat.get("texture")
-            break
-    assert floor_tex_name is not None
-
-    # step 2: find and replace texture element
-    FLOOR_TEX_NAME = "floor_replacement_texture"
-    for tex in asset.findall("texture"):
-        name = tex.get("name")
-        if name == floor_tex_name:
-            tex.set("name", FLOOR_TEX_NAME)
-            tex.set("file", str(new_floor_texture_file))
-            tex.set("type", "2d")
-
-    # step 3: reference new textures in materials
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "floor" in name and "backing" not in name:
-            mat.set("texture", FLOOR_TEX_NAME)
-            mat.set("texrepeat", "2 2")
-
-    return ET.tostring(root).decode("utf-8")
+    return apply_generative_textures(
+        initial_state, dict(floor_tex=new_floor_texture_file)
+    )
 
 
 def replace_wall_texture(rng, initial_state: str, new_wall_texture_file: str = None):
@@ -639,38 +878,8 @@ def replace_wall_texture(rng, initial_state: str, new_wall_texture_file: str = N
         new_wall_texture_file (str): New texture file for counter top: i.e "wood/dark_wood_planks_2.png"
             If None (default), will replace with a random texture from wood directory
     """
-
-    root = ET.fromstring(initial_state)
-    asset = root.find("asset")
-
     if new_wall_texture_file is None:
         new_wall_texture_file = get_random_textures(rng)["wall_tex"]
-    else:
-        new_wall_texture_file = os.path.join(TEXTURES_DIR, new_wall_texture_file)
-
-    # step 1: find the name of texture that will be replaced
-    wall_tex_name = None
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "wall" in name and "floor" not in name and "backing" not in name:
-            wall_tex_name = mat.get("texture")
-            break
-    assert wall_tex_name is not None
-
-    # step 2: add new texture element
-    WALL_TEX_NAME = "wall_replacement_texture"
-    for tex in asset.findall("texture"):
-        name = tex.get("name")
-        if name == wall_tex_name:
-            tex.set("name", WALL_TEX_NAME)
-            tex.set("file", str(new_wall_texture_file))
-            tex.set("type", "2d")
-
-    # step 3: reference new textures in materials
-    for mat in asset.findall("material"):
-        name = mat.get("name")
-        if "wall" in name and "floor" not in name and "backing" not in name:
-            mat.set("texture", WALL_TEX_NAME)
-            mat.set("texrepeat", "3 3")
-
-    return ET.tostring(root).decode("utf-8")
+    return apply_generative_textures(
+        initial_state, dict(wall_tex=new_wall_texture_file)
+    )
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+
+from robocasa.utils.hdf5_utils import (
+    MODEL_FILE_ATTR,
+    MODEL_HASH_ATTR,
+    MODELS_GROUP,
+    append_to_dataset,
+    get_model_file,
+    read_model_file,
+    write_model_file,
+)
+
+DEFAULT_SEED = 3
+
+MODEL_XML = '<mujoco model="test"><worldbody><body name="bödy"/></worldbody></mujoco>'
+OTHER_MODEL_XML = '<mujoco model="other"><worldbody/></mujoco>'
+
+
+class TestHdf5Utils(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "demo.hdf5")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_append_to_dataset(self):
+        """
+        Tests that appending chunks of uneven length reads back as their concatenation
+        """
+        rng = np.random.default_rng(DEFAULT_SEED)
+        chunks = [rng.normal(size=(n, 3, 2)) for n in [1, 7, 256, 300]]
+        for compression in [None, "gzip"]:
+            with h5py.File(self.path, "w") as f:
+                grp = f.create_group("data/demo_1")
+                for chunk in chunks:
+                    dset = append_to_dataset(
+                        grp, "states", chunk, chunk_len=16, compression=compression
+                    )
+                    self.assertEqual(dset.maxshape, (None, 3, 2))
+                self.assertEqual(dset.compression, compression)
+
+            with h5py.File(self.path, "r") as f:
+                np.testing.assert_array_equal(
+                    f["data/demo_1/states"][()], np.concatenate(chunks)
+                )
+
+    def test_write_model_file(self):
+        """
+        Tests that model xmls are stored once per distinct xml and read back unchanged
+        """
+        with h5py.File(self.path, "w") as f:
+            hash_1 = write_model_file(f, MODEL_XML)
+            hash_2 = write_model_file(f, MODEL_XML, compression=None)
+            hash_3 = write_model_file(f, OTHER_MODEL_XML)
+            self.assertEqual(hash_1, hash_2)
+            self.assertNotEqual(hash_1, hash_3)
+            self.assertEqual(len(f[MODELS_GROUP]), 2)
+
+        with h5py.File(self.path, "r") as f:
+            self.assertEqual(read_model_file(f, hash_1), MODEL_XML)
+            self.assertEqual(read_model_file(f, hash_3), OTHER_MODEL_XML)
+
+    def test_get_model_file(self):
+        """
+        Tests reading the model xml of demos that reference the model table and of demos in the older
+        layout, which store the xml in an attribute
+        """
+        with h5py.File(self.path, "w") as f:
+            new_grp = f.create_group("data/demo_1")
+            new_grp.attrs[MODEL_HASH_ATTR] = write_model_file(f, MODEL_XML)
+            old_grp = f.create_group("data/demo_2")
+            old_grp.attrs[MODEL_FILE_ATTR] = OTHER_MODEL_XML
+
+        with h5py.File(self.path, "r") as f:
+            self.assertEqual(get_model_file(f, f["data/demo_1"]), MODEL_XML)
+            self.assertEqual(get_model_file(f, f["data/demo_2"]), OTHER_MODEL_XML)
+
+
+if __name__ == "__main__":
+    unittest.main()
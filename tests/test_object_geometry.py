@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from robocasa.models.objects.object_geometry import ObjectGeometryTable
+
+MODEL_XML = """
+<mujoco model="{name}">
+    <worldbody>
+        <body name="object">
+            <site name="bottom_site" pos="0 0 {bottom}"/>
+            <site name="top_site" pos="0 0 {top}"/>
+            <site name="horizontal_radius_site" pos="{radius} {radius} 0"/>
+        </body>
+    </worldbody>
+</mujoco>
+"""
+
+
+class TestObjectGeometry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_model(self, category, name, bottom=-0.1, top=0.1, radius=0.05):
+        folder = os.path.join(self.root, "objaverse", category, name)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, "model.xml")
+        with open(path, "w") as f:
+            f.write(MODEL_XML.format(name=name, bottom=bottom, top=top, radius=radius))
+        return path
+
+    def test_build_and_load(self):
+        """
+        Tests that a saved table loads with the same rows, and that lazily added rows are appended
+        """
+        paths = [
+            self.write_model("apple", "apple_{}".format(i), top=0.1 + i)
+            for i in range(100)
+        ]
+        table = ObjectGeometryTable.build(root=self.root)
+        self.assertEqual(len(table), len(paths))
+        np.testing.assert_allclose(
+            table.get_sizes(table.get_ids(paths))[:, 2], 0.2 + np.arange(100)
+        )
+
+        table_path = os.path.join(self.root, "geometry_table.npz")
+        table.save(table_path)
+        loaded = ObjectGeometryTable.load(table_path)
+        self.assertEqual(loaded.paths, table.paths)
+        np.testing.assert_array_equal(loaded.sites, table.sites)
+        np.testing.assert_array_equal(loaded.category_ids, table.category_ids)
+
+        new_path = self.write_model("banana", "banana_0", radius=0.2)
+        new_id = loaded.get_ids(new_path)
+        self.assertEqual(new_id, len(paths))
+        self.assertEqual(len(loaded), len(paths) + 1)
+        np.testing.assert_allclose(loaded.get_sizes(new_id)[:2], [0.4, 0.4])
+        self.assertEqual(loaded.category_names[loaded.category_ids[new_id]], "banana")
+
+    def test_load_modified_model(self):
+        """
+        Tests that models modified after the table was saved are read again when it is loaded
+        """
+        path = self.write_model("apple", "apple_0", top=0.1)
+        table = ObjectGeometryTable.build(root=self.root)
+        table_path = os.path.join(self.root, "geometry_table.npz")
+        table.save(table_path)
+
+        self.write_model("apple", "apple_0", top=0.3)
+        mtime = os.path.getmtime(path) + 10
+        os.utime(path, (mtime, mtime))
+        loaded = ObjectGeometryTable.load(table_path)
+        np.testing.assert_allclose(loaded.get_sizes(loaded.get_ids(path))[2], 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
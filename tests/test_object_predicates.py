@@ -0,0 +1,236 @@
+import unittest
+
+import numpy as np
+import robosuite.utils.transform_utils as T
+
+import robocasa
+import robocasa.utils.object_utils as OU
+import robosuite
+from robosuite import load_controller_config
+
+DEFAULT_SEED = 3
+
+
+def point_in_box(point, p0, px, py, pz, th=0.0, only_2d=False):
+    """
+    Previous per-point check of a bounding box given by its p0, px, py and pz points
+    """
+    u = px - p0
+    v = py - p0
+    w = pz - p0
+    check1 = np.dot(u, p0) - th <= np.dot(u, point) <= np.dot(u, px) + th
+    check2 = np.dot(v, p0) - th <= np.dot(v, point) <= np.dot(v, py) + th
+    check3 = np.dot(w, p0) - th <= np.dot(w, point) <= np.dot(w, pz) + th
+    if only_2d:
+        return check1 and check2
+    return check1 and check2 and check3
+
+
+def obj_inside_of_scalar(env, obj_name, fixture, partial_check=False):
+    """
+    Previous per-object implementation of OU.obj_inside_of
+    """
+    obj = env.objects[obj_name]
+    p0, px, py, pz = fixture.get_int_sites(relative=False)
+    obj_pos = np.array(env.sim.data.body_xpos[env.obj_body_id[obj.name]])
+    obj_quat = T.convert_quat(
+        env.sim.data.body_xquat[env.obj_body_id[obj.name]], to="xyzw"
+    )
+    if partial_check:
+        points, th = [obj_pos], 0.0
+    else:
+        points, th = obj.get_bbox_points(trans=obj_pos, rot=obj_quat), 0.05
+    return all([point_in_box(p, p0, px, py, pz, th=th) for p in points])
+
+
+def obj_in_region_scalar(env, obj_name, p0, px, py):
+    """
+    Previous per-object implementation of OU.obj_in_region, for an object at its current pose
+    """
+    obj = env.objects[obj_name]
+    obj_pos = np.array(env.sim.data.body_xpos[env.obj_body_id[obj.name]])
+    obj_quat = T.convert_quat(
+        env.sim.data.body_xquat[env.obj_body_id[obj.name]], to="xyzw"
+    )
+    u = px - p0
+    v = py - p0
+    for point in obj.get_bbox_points(trans=obj_pos, rot=obj_quat):
+        check1 = np.dot(u, p0) <= np.dot(u, point) <= np.dot(u, px)
+        check2 = np.dot(v, p0) <= np.dot(v, point) <= np.dot(v, py)
+        if not check1 or not check2:
+            return False
+    return True
+
+
+def gripper_obj_far_scalar(env, obj_name, th=0.25):
+    """
+    Previous per-object implementation of OU.gripper_obj_far
+    """
+    obj_pos = env.sim.data.body_xpos[env.obj_body_id[obj_name]]
+    gripper_site_pos = env.sim.data.site_xpos[env.robots[0].eef_site_id["right"]]
+    return np.linalg.norm(gripper_site_pos - obj_pos) > th
+
+
+class TestObjectPredicates(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+        }
+        cls.env = robosuite.make(**config)
+        cls.env.reset()
+        cls.obj_names = list(cls.env.objects.keys())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.close()
+
+    def move_objects(self, positions):
+        """
+        Moves the objects to @positions (one per object), keeping their orientation
+        """
+        env = self.env
+        for (name, pos) in zip(self.obj_names, positions):
+            obj = env.objects[name]
+            qpos = np.array(env.sim.data.get_joint_qpos(obj.joints[0]))
+            qpos[:3] = pos
+            env.sim.data.set_joint_qpos(obj.joints[0], qpos)
+        env.sim.forward()
+
+    def sample_positions(self, fixture, rng):
+        """
+        Samples object positions inside of, around and far from the interior of @fixture
+        """
+        int_points = np.array(fixture.get_int_sites(all_points=True, relative=False))
+        center = np.mean(int_points, axis=0)
+        half_size = (np.max(int_points, axis=0) - np.min(int_points, axis=0)) / 2
+        return [
+            center,
+            center + rng.uniform(-1.5, 1.5, size=3) * half_size,
+            center + np.array([5.0, 5.0, 0.0]),
+        ]
+
+    def test_points_in_bounds(self):
+        """
+        Tests Fixture.points_in_bounds against per-point checks of the exterior and interior bounding boxes
+        """
+        rng = np.random.default_rng(DEFAULT_SEED)
+        for fixture in [self.env.cab, self.env.counter]:
+            for kind in ["ext", "int"]:
+                if kind == "int" and fixture is self.env.counter:
+                    continue
+                sites = (
+                    fixture.get_ext_sites(relative=False)
+                    if kind == "ext"
+                    else fixture.get_int_sites(relative=False)
+                )
+                all_sites = np.array(sites)
+                center = np.mean(all_sites, axis=0)
+                extent = np.max(np.abs(all_sites - center), axis=0) * 2 + 0.01
+                points = center + rng.uniform(-1, 1, size=(500, 3)) * extent
+                for th in [0.0, 0.05]:
+                    for only_2d in [False, True]:
+                        expected = [
+                            point_in_box(p, *sites, th=th, only_2d=only_2d)
+                            for p in points
+                        ]
+                        inside = fixture.points_in_bounds(
+                            points, kind=kind, th=th, only_2d=only_2d
+                        )
+                        self.assertGreater(np.sum(inside), 0)
+                        self.assertLess(np.sum(inside), len(points))
+                        np.testing.assert_array_equal(inside, expected)
+                if kind == "ext":
+                    for p in points[:50]:
+                        self.assertEqual(
+                            OU.point_in_fixture(p, fixture), point_in_box(p, *sites)
+                        )
+
+    def test_objs_inside_of(self):
+        """
+        Tests OU.objs_inside_of against per-object checks, with objects moved inside of and around the cabinet
+        """
+        rng = np.random.default_rng(DEFAULT_SEED)
+        fixture = self.env.cab
+        num_inside = 0
+        for _ in range(10):
+            candidates = self.sample_positions(fixture, rng)
+            positions = [
+                candidates[rng.integers(len(candidates))] for _ in self.obj_names
+            ]
+            self.move_objects(positions)
+            for partial_check in [False, True]:
+                expected = [
+                    obj_inside_of_scalar(self.env, name, fixture, partial_check)
+                    for name in self.obj_names
+                ]
+                inside = OU.objs_inside_of(
+                    self.env, self.obj_names, fixture, partial_check=partial_check
+                )
+                np.testing.assert_array_equal(inside, expected)
+                for (name, value) in zip(self.obj_names, expected):
+                    self.assertEqual(
+                        OU.obj_inside_of(self.env, name, fixture, partial_check),
+                        value,
+                    )
+                num_inside += int(np.sum(inside))
+        self.assertGreater(num_inside, 0)
+
+    def test_objs_in_region(self):
+        """
+        Tests OU.objs_in_region against per-object checks, for the region spanned by the cabinet interior
+        """
+        rng = np.random.default_rng(DEFAULT_SEED)
+        fixture = self.env.cab
+        p0, px, py, _ = fixture.get_int_sites(relative=False)
+        num_inside = 0
+        for _ in range(10):
+            candidates = self.sample_positions(fixture, rng)
+            positions = [
+                candidates[rng.integers(len(candidates))] for _ in self.obj_names
+            ]
+            self.move_objects(positions)
+            expected = [
+                obj_in_region_scalar(self.env, name, p0, px, py)
+                for name in self.obj_names
+            ]
+            in_region = OU.objs_in_region(self.env, self.obj_names, p0, px, py)
+            np.testing.assert_array_equal(in_region, expected)
+            num_inside += int(np.sum(in_region))
+        self.assertGreater(num_inside, 0)
+
+    def test_gripper_objs_far(self):
+        """
+        Tests OU.gripper_objs_far against per-object distance checks, for thresholds around the object distances
+        """
+        gripper_site_pos = self.env.sim.data.site_xpos[
+            self.env.robots[0].eef_site_id["right"]
+        ]
+        dists = [
+            np.linalg.norm(
+                self.env.sim.data.body_xpos[self.env.obj_body_id[name]]
+                - gripper_site_pos
+            )
+            for name in self.obj_names
+        ]
+        for th in [0.0, 0.25, np.median(dists) + 1e-6, np.max(dists) + 1.0]:
+            expected = [
+                gripper_obj_far_scalar(self.env, name, th=th) for name in self.obj_names
+            ]
+            far = OU.gripper_objs_far(self.env, self.obj_names, th=th)
+            np.testing.assert_array_equal(far, expected)
+            for (name, value) in zip(self.obj_names, expected):
+                self.assertEqual(OU.gripper_obj_far(self.env, name, th=th), value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+
+DEFAULT_SEED = 3
+
+
+class TestObjectSlots(unittest.TestCase):
+    def create_env(self, num_object_slots=3):
+        config = {
+            "env_name": "PnPCounterToCab",
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+            "hard_reset": False,
+            "num_object_slots": num_object_slots,
+        }
+        env = robosuite.make(**config)
+        env.reset()
+        return env
+
+    def check_slots(self, env):
+        """
+        Checks that active candidate objects are in the scene with gravity on, and that all other candidates
+        are parked outside of the scene with gravity compensation on.
+        """
+        # name-based references point to the body of the active candidate
+        for (name, model) in env.objects.items():
+            self.assertEqual(
+                env.obj_body_id[name], env.sim.model.body_name2id(model.root_body)
+            )
+
+        active_models = set(env.objects.values())
+        num_inactive = 0
+        for slots in env.object_slots.values():
+            for model, _ in slots:
+                body_id = env.sim.model.body_name2id(model.root_body)
+                obj_pos = env.sim.data.body_xpos[body_id]
+                gravcomp = env.sim.model.body_gravcomp[body_id]
+                if model in active_models:
+                    self.assertEqual(gravcomp, 0.0)
+                    self.assertGreater(obj_pos[0], -9.0)
+                else:
+                    num_inactive += 1
+                    self.assertEqual(gravcomp, 1.0)
+                    self.assertLess(obj_pos[0], -9.0)
+        return num_inactive
+
+    def test_slots_parked_after_load(self):
+        """
+        Tests that inactive candidates are parked on the first episode after the model is compiled,
+        which uses the placements sampled while loading the model instead of a soft reset.
+        """
+        env = self.create_env()
+        self.assertGreater(self.check_slots(env), 0)
+        env.close()
+
+    def test_slots_parked_after_soft_reset(self):
+        """
+        Tests that soft resets swap candidates without recompiling the model and park the inactive ones
+        """
+        env = self.create_env()
+        model = env.sim.model._model
+        # enough resets to switch back to the first candidate after another one was active
+        for _ in range(10):
+            env.reset()
+            self.assertIs(env.sim.model._model, model)
+            self.assertGreater(self.check_slots(env), 0)
+        env.close()
+
+    def test_replay_after_soft_reset(self):
+        """
+        Tests that replaying an episode in which a candidate other than the first one was active resolves
+        object names to the bodies of the candidates that were active
+        """
+        env = self.create_env()
+        for _ in range(10):
+            env.reset()
+            if any(
+                [
+                    cfg.get("model_name", cfg["name"]) != cfg["name"]
+                    for cfg in env.object_cfgs
+                ]
+            ):
+                break
+        ep_meta = env.get_ep_meta()
+        xml = env.sim.model.get_xml()
+        state = env.sim.get_state().flatten()
+        root_bodies = {name: model.root_body for (name, model) in env.objects.items()}
+        obj_pos = {
+            name: np.array(env.sim.data.body_xpos[env.obj_body_id[name]])
+            for name in env.objects
+        }
+        env.close()
+
+        replay_env = self.create_env(num_object_slots=1)
+        replay_env.set_ep_meta(ep_meta)
+        replay_env.reset()
+        replay_env.reset_from_xml_string(replay_env.edit_model_xml(xml))
+        replay_env.sim.set_state_from_flattened(state)
+        replay_env.sim.forward()
+        for (name, root_body) in root_bodies.items():
+            self.assertEqual(replay_env.objects[name].root_body, root_body)
+            np.testing.assert_allclose(
+                replay_env.sim.data.body_xpos[replay_env.obj_body_id[name]],
+                obj_pos[name],
+                atol=1e-6,
+            )
+        replay_env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
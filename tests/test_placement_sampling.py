@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import robocasa
+import robocasa.macros as macros
+import robosuite
+from robosuite import load_controller_config
+
+DEFAULT_SEED = 3
+
+
+class TestPlacementSampling(unittest.TestCase):
+
+    env_names = ["PnPCounterToCab", "PnPCounterToSink", "ArrangeVegetables"]
+
+    def create_env(self, env_name, vectorize):
+        config = {
+            "env_name": env_name,
+            "robots": "PandaMobile",
+            "controller_configs": load_controller_config(default_controller="OSC_POSE"),
+            "has_renderer": False,
+            "has_offscreen_renderer": False,
+            "ignore_done": True,
+            "use_camera_obs": False,
+            "control_freq": 20,
+            "seed": DEFAULT_SEED,
+            "randomize_cameras": False,
+        }
+        with mock.patch.object(macros, "VECTORIZE_PLACEMENT_SAMPLING", vectorize):
+            env = robosuite.make(**config)
+            env.reset()
+            placements = [(dict(env.object_placements), dict(env.fxtr_placements))]
+            # later episodes start from the rng state left behind by the earlier ones
+            for _ in range(2):
+                env.reset()
+                placements.append(
+                    (dict(env.object_placements), dict(env.fxtr_placements))
+                )
+        env.close()
+        return placements
+
+    def compare_placements(self, placements_1, placements_2):
+        self.assertEqual(placements_1.keys(), placements_2.keys())
+        for name in placements_1.keys():
+            pos_1, quat_1 = placements_1[name][:2]
+            pos_2, quat_2 = placements_2[name][:2]
+            np.testing.assert_allclose(pos_1, pos_2, atol=1e-7)
+            np.testing.assert_allclose(quat_1, quat_2, atol=1e-7)
+
+    def test_batched_matches_sequential(self):
+        """
+        Tests that batched placement sampling accepts the same placements as sequential sampling for the
+        same seed, and leaves the rng in the same state so that subsequent episodes match as well.
+        """
+        for env_name in self.env_names:
+            sequential = self.create_env(env_name, vectorize=False)
+            batched = self.create_env(env_name, vectorize=True)
+            self.assertEqual(len(sequential), len(batched))
+            for (obj_1, fxtr_1), (obj_2, fxtr_2) in zip(sequential, batched):
+                self.compare_placements(obj_1, obj_2)
+                self.compare_placements(fxtr_1, fxtr_2)
+
+
+if __name__ == "__main__":
+    unittest.main()
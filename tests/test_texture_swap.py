@@ -0,0 +1,206 @@
+import os
+import unittest
+
+import numpy as np
+from lxml import etree as ET
+
+import robocasa
+import robosuite
+from robosuite import load_controller_config
+from robocasa.utils.texture_swap import (
+    TEXTURES_DIR,
+    apply_generative_textures,
+    get_random_textures,
+    set_generative_textures,
+)
+
+DEFAULT_SEED = 3
+
+# asset with materials covering all texture roles, including names matching several rules and textures
+# shared between roles
+SYNTHETIC_ASSET_XML = """
+<mujoco>
+    <asset>
+        <texture name="cab_tex" type="cube" file="cab.png"/>
+        <texture name="counter_tex" type="2d" file="counter.png"/>
+        <texture name="floor_tex" type="cube" file="floor.png"/>
+        <texture name="wall_tex" type="cube" file="wall.png"/>
+        <texture name="shared_tex" type="2d" file="shared.png"/>
+        <material name="counter_base_mat" texture="cab_tex"/>
+        <material name="housing_mat" texture="cab_tex"/>
+        <material name="cab_door_mat" texture="cab_tex"/>
+        <material name="cab_handle_mat" texture="cab_tex"/>
+        <material name="shelves_mat" texture="cab_tex"/>
+        <material name="stack_top_mat" texture="cab_tex"/>
+        <material name="stove_top_mat" texture="cab_tex"/>
+        <material name="counter_top_mat" texture="counter_tex"/>
+        <material name="counter_top_2_mat" texture="counter_tex"/>
+        <material name="floor_mat" texture="floor_tex"/>
+        <material name="floor_backing_mat" texture="floor_tex"/>
+        <material name="wall_mat" texture="wall_tex"/>
+        <material name="wall_floor_mat" texture="wall_tex"/>
+        <material name="wall_backing_mat" texture="shared_tex"/>
+        <material name="cab_wall_mat" texture="shared_tex"/>
+        <material name="plain_mat" texture="shared_tex"/>
+    </asset>
+</mujoco>
+"""
+
+
+def set_cab_textures_multi_pass(asset, texture_file):
+    for (tex_name, tex_type) in (
+        ("cab_replacement_texture_2d", "2d"),
+        ("cab_replacement_texture_cube", "cube"),
+    ):
+        tex = asset.find("texture[@name='{}']".format(tex_name))
+        if tex is not None:
+            tex.set("file", texture_file)
+        else:
+            asset.append(
+                asset.makeelement(
+                    "texture", dict(type=tex_type, name=tex_name, file=texture_file)
+                )
+            )
+
+    for mat in asset.findall("material"):
+        name = mat.get("name")
+        if "counter_base" in name:
+            mat.set("texture", "cab_replacement_texture_cube")
+        elif "housing" in name:
+            mat.set("texture", "cab_replacement_texture_cube")
+        elif (
+            "stack" in name
+            or "cab" in name
+            or "shelves" in name
+            or "bottom" in name
+            or ("top" in name and "counter" not in name and "stove" not in name)
+        ):
+            if "handle" in name or "transparent" in name:
+                continue
+            elif "door" in name:
+                mat.set("texture", "cab_replacement_texture_2d")
+            elif "shelves" in name:
+                mat.set("texture", "cab_replacement_texture_2d")
+            else:
+                mat.set("texture", "cab_replacement_texture_cube")
+
+
+def set_role_texture_multi_pass(
+    asset, match, new_tex_name, texture_file, tex_type=None, texrepeat=None
+):
+    old_tex_name = None
+    for mat in asset.findall("material"):
+        if match(mat.get("name")):
+            old_tex_name = mat.get("texture")
+            break
+    assert old_tex_name is not None
+
+    for tex in asset.findall("texture"):
+        if tex.get("name") == old_tex_name:
+            tex.set("name", new_tex_name)
+            tex.set("file", texture_file)
+            if tex_type is not None:
+                tex.set("type", tex_type)
+
+    for mat in asset.findall("material"):
+        if match(mat.get("name")):
+            mat.set("texture", new_tex_name)
+            if texrepeat is not None:
+                mat.set("texrepeat", texrepeat)
+
+
+def apply_generative_textures_multi_pass(xml, textures):
+    """
+    Previous implementation: one parse / serialize and one scan of the asset element per texture
+    """
+    edits = [
+        lambda asset, f: set_cab_textures_multi_pass(asset, f),
+        lambda asset, f: set_role_texture_multi_pass(
+            asset,
+            lambda name: "counter_top" in name,
+            "counter_top_replacement_texture",
+            f,
+        ),
+        lambda asset, f: set_role_texture_multi_pass(
+            asset,
+            lambda name: "wall" in name
+            and "floor" not in name
+            and "backing" not in name,
+            "wall_replacement_texture",
+            f,
+            tex_type="2d",
+            texrepeat="3 3",
+        ),
+        lambda asset, f: set_role_texture_multi_pass(
+            asset,
+            lambda name: "floor" in name and "backing" not in name,
+            "floor_replacement_texture",
+            f,
+            tex_type="2d",
+            texrepeat="2 2",
+        ),
+    ]
+    keys = ["cab_tex", "counter_tex", "wall_tex", "floor_tex"]
+    for (key, edit) in zip(keys, edits):
+        root = ET.fromstring(xml)
+        edit(root.find("asset"), str(os.path.join(TEXTURES_DIR, textures[key])))
+        xml = ET.tostring(root).decode("utf-8")
+    return xml
+
+
+class TestTextureSwap(unittest.TestCase):
+    def check_textures(self, xml, num_samples=10):
+        rng = np.random.default_rng(DEFAULT_SEED)
+        for _ in range(num_samples):
+            textures = get_random_textures(rng)
+            expected = apply_generative_textures_multi_pass(xml, textures)
+
+            # from a string
+            self.assertEqual(apply_generative_textures(xml, textures), expected)
+
+            # in place on a parsed tree
+            root = ET.fromstring(xml)
+            set_generative_textures(root.find("asset"), textures)
+            self.assertEqual(ET.tostring(root).decode("utf-8"), expected)
+
+            # applying the replacements twice must also match, since texture slots re-apply textures
+            self.assertEqual(
+                apply_generative_textures(expected, textures),
+                apply_generative_textures_multi_pass(expected, textures),
+            )
+
+    def test_synthetic_asset(self):
+        """
+        Tests that the single-pass texture swap matches the four-pass chain on an asset with overlapping
+        material name rules and shared textures
+        """
+        self.check_textures(SYNTHETIC_ASSET_XML)
+
+    def test_kitchen_model(self):
+        """
+        Tests that the single-pass texture swap matches the four-pass chain on kitchen scene models
+        """
+        for layout_id in range(3):
+            config = {
+                "env_name": "PnPCounterToCab",
+                "robots": "PandaMobile",
+                "controller_configs": load_controller_config(
+                    default_controller="OSC_POSE"
+                ),
+                "has_renderer": False,
+                "has_offscreen_renderer": False,
+                "ignore_done": True,
+                "use_camera_obs": False,
+                "control_freq": 20,
+                "seed": DEFAULT_SEED,
+                "randomize_cameras": False,
+                "layout_ids": layout_id,
+            }
+            env = robosuite.make(**config)
+            env.reset()
+            self.check_textures(env.model.get_xml(), num_samples=3)
+            env.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import robosuite.utils.transform_utils as T
+
+import robocasa.utils.object_utils as OU
+
+DEFAULT_SEED = 3
+
+
+class TestTransformUtils(unittest.TestCase):
+    def sample_quats(self, rng, num_quats):
+        """
+        Samples random unit quaternions in (x,y,z,w) form, along with rotations by 0, 90 and 180 degrees
+        about each axis, where the largest eigenvalue of mat2quat's K matrix is degenerate or w is zero
+        """
+        quats = rng.normal(size=(num_quats, 4))
+        quats /= np.linalg.norm(quats, axis=1, keepdims=True)
+        special = [[0.0, 0.0, 0.0, 1.0]]
+        for axis in np.eye(3):
+            for angle in [np.pi / 2, np.pi]:
+                special.append(T.axisangle2quat(axis * angle))
+        return np.concatenate([quats, np.array(special)], axis=0)
+
+    def assert_quats_close(self, quats_1, quats_2, atol):
+        # q and -q are the same rotation, the sign is only fixed when w is not zero
+        for (q1, q2) in zip(quats_1, quats_2):
+            if np.abs(q1[3]) < atol:
+                self.assertTrue(
+                    np.allclose(q1, q2, atol=atol) or np.allclose(q1, -q2, atol=atol)
+                )
+            else:
+                np.testing.assert_allclose(q1, q2, atol=atol)
+
+    def test_quat2mat_batch(self):
+        """
+        Tests that quat2mat_batch matches T.quat2mat, including for degenerate quaternions
+        """
+        rng = np.random.default_rng(DEFAULT_SEED)
+        quats = self.sample_quats(rng, 1000)
+        quats = np.concatenate([quats, np.zeros((1, 4))], axis=0)
+        expected = np.array([T.quat2mat(q) for q in quats])
+        np.testing.assert_allclose(OU.quat2mat_batch(quats), expected, atol=1e-6)
+
+    def test_mat2quat_batch(self):
+        """
+        Tests that mat2quat_batch matches T.mat2quat for rotation matrices and homogeneous poses
+        """
+        rng = np.random.default_rng(DEFAULT_SEED)
+        mats = np.array([T.quat2mat(q) for q in self.sample_quats(rng, 1000)])
+        expected = np.array([T.mat2quat(mat) for mat in mats])
+        self.assert_quats_close(OU.mat2quat_batch(mats), expected, atol=1e-6)
+
+        # only the rotation block of poses is used
+        poses = np.tile(np.eye(4), (len(mats), 1, 1))
+        poses[:, :3, :3] = mats
+        poses[:, :3, 3] = rng.normal(size=(len(mats), 3))
+        self.assert_quats_close(OU.mat2quat_batch(poses), expected, atol=1e-6)
+
+        # round trip
+        self.assert_quats_close(
+            OU.mat2quat_batch(OU.quat2mat_batch(expected)), expected, atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()